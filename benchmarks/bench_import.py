@@ -0,0 +1,45 @@
+"""Cold-start import time of the numerical core (best of `--repeat` fresh
+interpreters), and the heavy optional dependencies it pulls in (none expected).
+
+    python -m benchmarks.bench_import --target 0.150
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+HEAVY_MODULES = ("rasterio", "skimage", "matplotlib", "pandas", "scipy")
+
+SNIPPET = """
+import sys, time, json
+t0 = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - t0
+heavy = sorted({{m.split(".")[0] for m in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def measure(statement: str = "from fbp.models import FBPModel", repeat: int = 5) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", SNIPPET.format(statement=statement, heavy=HEAVY_MODULES)],
+                             check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(out))
+    return {"seconds": min(r["seconds"] for r in runs), "heavy": runs[0]["heavy"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statement", default="from fbp.models import FBPModel")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--target", type=float, default=0.150, help="seconds")
+    args = parser.parse_args()
+
+    result = measure(args.statement, args.repeat)
+    print(f"{args.statement!r}: {result['seconds'] * 1000:.1f} ms, heavy imports: {result['heavy'] or 'none'}")
+    sys.exit(0 if result["seconds"] <= args.target and not result["heavy"] else 1)
+
+
+if __name__ == "__main__":
+    main()
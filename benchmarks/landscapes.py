@@ -0,0 +1,92 @@
+"""Synthetic landscapes for the benchmarks: patchy fuel maps with a realistic
+boreal mix, and smooth terrain and weather fields."""
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+
+# share of the landscape per fuel type (roughly a boreal FBP grid)
+FUEL_MIX = {
+    "C2": 0.25, "C3": 0.10, "C1": 0.03, "C4": 0.03, "C5": 0.02, "C6": 0.01, "C7": 0.02,
+    "D1": 0.12, "M1": 0.07, "M2": 0.05, "M3": 0.01, "M4": 0.01,
+    "S1": 0.02, "S2": 0.01, "S3": 0.01, "O1a": 0.05, "O1b": 0.04,
+    "Non-fuel": 0.15,
+}
+
+# vegetation classes for FuelMapBuilder and their fuel crosswalk
+VEGETATION_MIX = {1: 0.3, 2: 0.2, 3: 0.1, 4: 0.1, 5: 0.1, 9: 0.2}
+VEGETATION_MAPPING = {1: "C2", 2: "D1", 3: "C3", 4: "O1a", 5: {"C2": 0.6, "D1": 0.4}}
+
+
+def _patches(rng: np.random.Generator, size: int, values: list, p: list, patch: int) -> np.ndarray:
+    """Categorical map made of `patch`-sized blocks."""
+    n = -(-size // patch)
+    coarse = rng.choice(np.asarray(values), size=(n, n), p=np.asarray(p) / np.sum(p))
+    return np.repeat(np.repeat(coarse, patch, axis=0), patch, axis=1)[:size, :size]
+
+
+def _smooth(rng: np.random.Generator, size: int, low: float, high: float, scale: int = 64) -> np.ndarray:
+    """Smooth random field in [low, high] (bilinear upsampling of coarse noise)."""
+    n = size // scale + 2
+    coarse = rng.uniform(low, high, size=(n, n))
+    x = np.linspace(0, n - 1.001, size)
+    i = x.astype(int)
+    t = x - i
+    rows = coarse[i] * (1 - t)[:, None] + coarse[i + 1] * t[:, None]
+    return rows[:, i] * (1 - t) + rows[:, i + 1] * t
+
+
+def fuel_map(size: int, seed: int = 0, patch: int = 8) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    codes = [FBP_FUEL_MAP[f] for f in FUEL_MIX]
+    return _patches(rng, size, codes, list(FUEL_MIX.values()), patch).astype(np.uint8)
+
+
+def vegetation_map(size: int, seed: int = 0, patch: int = 4) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return _patches(rng, size, list(VEGETATION_MIX), list(VEGETATION_MIX.values()), patch).astype(np.uint8)
+
+
+# smooth fields: name -> (low, high)
+FIELDS = {
+    "percent_conifer": (20, 80),
+    "percent_dead_fir": (10, 60),
+    "slope_percent": (0, 60),
+    "slope_azimuth": (0, 360),
+    "ffmc": (75, 95),
+    "bui": (20, 140),
+    "dmc": (10, 80),
+    "dc": (100, 500),
+    "wind_speed": (0, 40),
+    "wind_azimuth": (0, 360),
+    "temperature": (10, 30),
+    "relative_humidity": (20, 80),
+    "precipitation": (-5, 5),
+}
+
+
+class Landscape:
+    """Fuel, vegetation, terrain and weather rasters of `size` x `size` cells,
+    generated on first access so that a benchmark only pays for what it uses."""
+
+    def __init__(self, size: int, seed: int = 0) -> None:
+        self.size = size
+        self.seed = seed
+        self._cache: dict[str, np.ndarray] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.size, self.size)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._cache:
+            if name == "fuel_map":
+                value = fuel_map(self.size, self.seed)
+            elif name == "vegetation_map":
+                value = vegetation_map(self.size, self.seed)
+            else:
+                rng = np.random.default_rng([self.seed, list(FIELDS).index(name)])
+                value = _smooth(rng, self.size, *FIELDS[name])
+                if name == "precipitation":
+                    value = np.maximum(value, 0)
+            self._cache[name] = value
+        return self._cache[name]
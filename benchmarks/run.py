@@ -0,0 +1,120 @@
+"""Run the benchmark suite: wall time (best of `--repeat`, `time.perf_counter`)
+and peak traced memory (`tracemalloc`, a separate run) per case and size,
+compared against stored baselines.
+
+    python -m benchmarks.run                           # 1000x1000, all cases
+    python -m benchmarks.run --sizes 1000 4000 -k FBPModel
+    python -m benchmarks.run --sizes 10000 --save      # opt-in: record, then compare
+    python -m benchmarks.run --save                    # record new baselines
+
+Exits with status 1 when a case is slower than `--threshold` times its
+baseline (or uses more than `--memory-threshold` times its peak memory).
+Baselines are machine specific: record them on the machine you compare on.
+The stored baselines cover 1000x1000 and 4000x4000. 10000x10000 peaks at about
+14 GB for the models and is not stored, so it is opt-in: record it with
+`--save` on a machine that has the memory before comparing. Cases without a
+baseline are listed and do not count as regressions.
+"""
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.landscapes import Landscape
+from benchmarks.suite import BENCHMARKS
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def measure(func, repeat: int) -> tuple[float, int]:
+    """Best wall time of `repeat` calls and the peak traced memory of one call."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def run(sizes: list[int], names: list[str], repeat: int) -> dict[str, dict]:
+    results = {}
+    for size in sizes:
+        land = Landscape(size)
+        for name in names:
+            with np.errstate(all="ignore"):
+                func = BENCHMARKS[name](land)
+                seconds, peak = measure(func, repeat)
+            key = f"{name}[{size}]"
+            results[key] = {"seconds": seconds, "peak_bytes": peak}
+            print(f"{key:<60} {seconds:9.4f} s {peak / 2**20:10.1f} MiB", flush=True)
+    return results
+
+
+def compare(results: dict, baselines: dict, threshold: float, memory_threshold: float) -> list[str]:
+    regressions = []
+    for key, result in results.items():
+        base = baselines.get(key)
+        if base is None:
+            continue
+        if result["seconds"] > threshold * base["seconds"]:
+            regressions.append(f"{key}: {result['seconds']:.4f} s vs. baseline {base['seconds']:.4f} s")
+        if result["peak_bytes"] > memory_threshold * base["peak_bytes"]:
+            regressions.append(f"{key}: {result['peak_bytes'] / 2**20:.1f} MiB "
+                               f"vs. baseline {base['peak_bytes'] / 2**20:.1f} MiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000])
+    parser.add_argument("-k", dest="pattern", default=None, help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--memory-threshold", type=float, default=1.10)
+    parser.add_argument("--save", action="store_true", help="merge the results into the baselines")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.pattern is None or args.pattern in name]
+    results = run(args.sizes, names, args.repeat)
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+
+    if args.save:
+        baselines["machine"] = {"platform": platform.platform(), "python": platform.python_version(),
+                                "numpy": np.__version__}
+        baselines.setdefault("results", {}).update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+        return
+
+    regressions = compare(results, baselines.get("results", {}), args.threshold, args.memory_threshold)
+    for key in results:
+        if key not in baselines.get("results", {}):
+            print(f"NO BASELINE {key}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
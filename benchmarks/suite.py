@@ -0,0 +1,358 @@
+"""Benchmark cases. Each case is registered with `@benchmark(name)` and takes a
+`Landscape`; it does its (untimed) setup and returns the callable to measure.
+"""
+import io
+import contextlib
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.landscapes import Landscape, VEGETATION_MAPPING
+
+BENCHMARKS = {}
+_FBP_INPUTS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _fbp_inputs(land: Landscape) -> dict:
+    """Intermediate FBP fields of the landscape, for the per-function cases."""
+    from fbp.core.weather import initial_spread_index
+    from fbp.core.ros import initial_rate_of_spread, buildup_effect, rate_of_spread
+    from fbp.core.consumption import surface_fuel_consumption
+    from fbp.core.crowning import crown_fraction_burned
+
+    key = (land.size, land.seed)
+    if key in _FBP_INPUTS:
+        return _FBP_INPUTS[key]
+    _FBP_INPUTS.clear()
+
+    fuel_map = land["fuel_map"]
+    isi = initial_spread_index(land["ffmc"], land["wind_speed"])
+    kwargs = dict(percent_grass_curing_map=np.full(land.shape, 80.),
+                  percent_conifer_map=land["percent_conifer"],
+                  percent_dead_fir_map=land["percent_dead_fir"])
+    rsi = initial_rate_of_spread(fuel_map, isi, **kwargs)
+    be = buildup_effect(fuel_map, land["bui"])
+    ros = rate_of_spread(rsi, be)
+    sfc = surface_fuel_consumption(fuel_map, land["bui"], land["ffmc"], land["percent_conifer"])
+    cfb = crown_fraction_burned(ros, np.full(land.shape, 100.), sfc, 7.)
+    _FBP_INPUTS[key] = dict(fuel_map=fuel_map, isi=isi, rsi=rsi, be=be, ros=ros, sfc=sfc, cfb=cfb, **kwargs)
+    return _FBP_INPUTS[key]
+
+
+# --- fbp.core.weather ---
+@benchmark("core.weather.fine_fuel_moisture_code")
+def _(land):
+    from fbp.core.weather import fine_fuel_moisture_code
+    args = (land["ffmc"], land["temperature"], land["relative_humidity"], land["wind_speed"], land["precipitation"])
+    return lambda: fine_fuel_moisture_code(*args)
+
+
+@benchmark("core.weather.duff_moisture_code")
+def _(land):
+    from fbp.core.weather import duff_moisture_code
+    lat = np.broadcast_to(np.linspace(60, 45, land.size)[:, None], land.shape)
+    args = (land["dmc"], land["temperature"], land["precipitation"], land["relative_humidity"], 7, lat)
+    return lambda: duff_moisture_code(*args)
+
+
+@benchmark("core.weather.drought_code")
+def _(land):
+    from fbp.core.weather import drought_code
+    lat = np.broadcast_to(np.linspace(60, 45, land.size)[:, None], land.shape)
+    args = (land["dc"], land["temperature"], land["precipitation"], 7, lat)
+    return lambda: drought_code(*args)
+
+
+@benchmark("core.weather.builtup_index")
+def _(land):
+    from fbp.core.weather import builtup_index
+    dmc, dc = land["dmc"], land["dc"]
+    return lambda: builtup_index(dmc, dc)
+
+
+@benchmark("core.weather.initial_spread_index")
+def _(land):
+    from fbp.core.weather import initial_spread_index
+    ffmc, ws = land["ffmc"], land["wind_speed"]
+    return lambda: initial_spread_index(ffmc, ws)
+
+
+@benchmark("core.weather.fire_weather_index")
+def _(land):
+    from fbp.core.weather import fire_weather_index
+    inputs = _fbp_inputs(land)
+    isi, bui = inputs["isi"], land["bui"]
+    return lambda: fire_weather_index(isi, bui)
+
+
+@benchmark("core.weather.foliar_moisture_content")
+def _(land):
+    from fbp.core.weather import foliar_moisture_content
+    lat = np.broadcast_to(np.linspace(60, 45, land.size)[:, None], land.shape)
+    lon = np.broadcast_to(np.linspace(-120, -100, land.size)[None, :], land.shape)
+    return lambda: foliar_moisture_content(lat, lon, 180)
+
+
+@benchmark("core.weather.daily_severity_rating")
+def _(land):
+    from fbp.core.weather import daily_severity_rating, fire_weather_index
+    fwi = fire_weather_index(_fbp_inputs(land)["isi"], land["bui"])
+    return lambda: daily_severity_rating(fwi)
+
+
+# --- fbp.core.ros ---
+@benchmark("core.ros.initial_rate_of_spread")
+def _(land):
+    from fbp.core.ros import initial_rate_of_spread
+    inputs = _fbp_inputs(land)
+    return lambda: initial_rate_of_spread(inputs["fuel_map"], inputs["isi"],
+                                          inputs["percent_grass_curing_map"],
+                                          inputs["percent_conifer_map"],
+                                          inputs["percent_dead_fir_map"])
+
+
+@benchmark("core.ros.buildup_effect")
+def _(land):
+    from fbp.core.ros import buildup_effect
+    fuel_map, bui = land["fuel_map"], land["bui"]
+    return lambda: buildup_effect(fuel_map, bui)
+
+
+@benchmark("core.ros.rate_of_spread")
+def _(land):
+    from fbp.core.ros import rate_of_spread
+    inputs = _fbp_inputs(land)
+    return lambda: rate_of_spread(inputs["rsi"], inputs["be"])
+
+
+@benchmark("core.ros.c6_rate_of_spread")
+def _(land):
+    from fbp.core.ros import c6_rate_of_spread
+    inputs = _fbp_inputs(land)
+    return lambda: c6_rate_of_spread(inputs["isi"], land["bui"], 100., inputs["sfc"], 7.)
+
+
+@benchmark("core.ros.c6_crown_rate_of_spread")
+def _(land):
+    from fbp.core.ros import c6_crown_rate_of_spread
+    isi, fmc = _fbp_inputs(land)["isi"], np.full(land.shape, 100.)
+    return lambda: c6_crown_rate_of_spread(isi, fmc)
+
+
+# --- fbp.core.slope ---
+@benchmark("core.slope.slope_adjusted_zero_wind_rate_of_spread")
+def _(land):
+    from fbp.core.slope import slope_adjusted_zero_wind_rate_of_spread
+    inputs = _fbp_inputs(land)
+    return lambda: slope_adjusted_zero_wind_rate_of_spread(inputs["fuel_map"], land["ffmc"], land["slope_percent"],
+                                                           inputs["percent_grass_curing_map"],
+                                                           inputs["percent_conifer_map"],
+                                                           inputs["percent_dead_fir_map"])
+
+
+@benchmark("core.slope.slope_adjusted_initial_spread_index")
+def _(land):
+    from fbp.core.slope import slope_adjusted_zero_wind_rate_of_spread, slope_adjusted_initial_spread_index
+    inputs = _fbp_inputs(land)
+    kwargs = dict(percent_grass_curing_map=inputs["percent_grass_curing_map"],
+                  percent_conifer_map=inputs["percent_conifer_map"],
+                  percent_dead_fir_map=inputs["percent_dead_fir_map"])
+    rsf = slope_adjusted_zero_wind_rate_of_spread(inputs["fuel_map"], land["ffmc"], land["slope_percent"], **kwargs)
+    return lambda: slope_adjusted_initial_spread_index(inputs["fuel_map"], rsf, **kwargs)
+
+
+@benchmark("core.slope.slope_equivalent_wind_speed")
+def _(land):
+    from fbp.core.slope import slope_equivalent_wind_speed
+    inputs = _fbp_inputs(land)
+    return lambda: slope_equivalent_wind_speed(inputs["fuel_map"], land["slope_percent"], land["ffmc"],
+                                               inputs["percent_conifer_map"], inputs["percent_dead_fir_map"],
+                                               inputs["percent_grass_curing_map"])
+
+
+@benchmark("core.slope.slope_adjusted_wind_vector")
+def _(land):
+    from fbp.core.slope import slope_adjusted_wind_vector
+    inputs = _fbp_inputs(land)
+    return lambda: slope_adjusted_wind_vector(inputs["fuel_map"], land["wind_speed"], land["wind_azimuth"],
+                                              land["slope_percent"], land["slope_azimuth"], land["ffmc"],
+                                              inputs["percent_conifer_map"], inputs["percent_dead_fir_map"],
+                                              inputs["percent_grass_curing_map"])
+
+
+# --- fbp.core.consumption & crowning ---
+@benchmark("core.consumption.surface_fuel_consumption")
+def _(land):
+    from fbp.core.consumption import surface_fuel_consumption
+    fuel_map, bui, ffmc, pc = land["fuel_map"], land["bui"], land["ffmc"], land["percent_conifer"]
+    return lambda: surface_fuel_consumption(fuel_map, bui, ffmc, pc)
+
+
+@benchmark("core.consumption.total_fuel_consumption")
+def _(land):
+    from fbp.core.consumption import total_fuel_consumption
+    inputs = _fbp_inputs(land)
+    return lambda: total_fuel_consumption(inputs["fuel_map"], inputs["sfc"], inputs["cfb"],
+                                          percent_conifer_map=inputs["percent_conifer_map"],
+                                          percent_dead_fir_map=inputs["percent_dead_fir_map"])
+
+
+@benchmark("core.consumption.crown_fuel_consumption")
+def _(land):
+    from fbp.core.consumption import crown_fuel_consumption
+    inputs = _fbp_inputs(land)
+    return lambda: crown_fuel_consumption(inputs["fuel_map"], inputs["cfb"],
+                                          percent_conifer_map=inputs["percent_conifer_map"],
+                                          percent_dead_fir_map=inputs["percent_dead_fir_map"])
+
+
+@benchmark("core.consumption.fire_intensity")
+def _(land):
+    from fbp.core.consumption import fire_intensity
+    inputs = _fbp_inputs(land)
+    return lambda: fire_intensity(inputs["sfc"], inputs["ros"])
+
+
+@benchmark("core.crowning.critical_surface_fire_intensity")
+def _(land):
+    from fbp.core.crowning import critical_surface_fire_intensity
+    fmc = np.full(land.shape, 100.)
+    return lambda: critical_surface_fire_intensity(fmc, 7.)
+
+
+@benchmark("core.crowning.critical_surface_fire_rate_of_spread")
+def _(land):
+    from fbp.core.crowning import critical_surface_fire_intensity, critical_surface_fire_rate_of_spread
+    csi = critical_surface_fire_intensity(np.full(land.shape, 100.), 7.)
+    sfc = _fbp_inputs(land)["sfc"]
+    return lambda: critical_surface_fire_rate_of_spread(csi, sfc)
+
+
+@benchmark("core.crowning.crown_fraction_burned")
+def _(land):
+    from fbp.core.crowning import crown_fraction_burned
+    inputs = _fbp_inputs(land)
+    fmc = np.full(land.shape, 100.)
+    return lambda: crown_fraction_burned(inputs["ros"], fmc, inputs["sfc"], 7.)
+
+
+@benchmark("core.crowning.classify_fire_type")
+def _(land):
+    from fbp.core.crowning import classify_fire_type
+    inputs = _fbp_inputs(land)
+    return lambda: classify_fire_type(inputs["fuel_map"], inputs["cfb"])
+
+
+@benchmark("core.utils.get_fuel_mask")
+def _(land):
+    from fbp.core.utils import get_fuel_mask
+    fuel_map = land["fuel_map"]
+    return lambda: get_fuel_mask(fuel_map, ["C2", "M1", "M2"])
+
+
+@benchmark("core.utils.to_fuel_codes")
+def _(land):
+    from fbp.core.utils import to_fuel_codes
+    fuel_map = land["fuel_map"].astype(np.int64)    # converted and range checked
+    return lambda: to_fuel_codes(fuel_map)
+
+
+@benchmark("core.utils.full_out")
+def _(land):
+    from fbp.core.utils import full_out
+    fuel_map, out = land["fuel_map"], np.empty(land.shape)
+    return lambda: full_out(fuel_map, 0., out=out)
+
+
+# --- models ---
+def _fbp_model(land, **kwargs):
+    from fbp.models import FBPModel
+
+    model = FBPModel(land["fuel_map"], percent_conifer=land["percent_conifer"],
+                     slope_percent=land["slope_percent"], slope_azimuth=land["slope_azimuth"], **kwargs)
+    run_kwargs = dict(fine_fuel_moisture_content=land["ffmc"], builtup_index=land["bui"],
+                      percent_grass_curing=80., percent_dead_fir=land["percent_dead_fir"],
+                      wind_speed=land["wind_speed"], wind_azimuth=land["wind_azimuth"],
+                      folier_moisture_content=100.)
+    return model, run_kwargs
+
+
+@benchmark("models.FBPModel.run")
+def _(land):
+    model, run_kwargs = _fbp_model(land)
+    return lambda: model.run(**run_kwargs)
+
+
+@benchmark("models.FBPModel.run[sparse]")
+def _(land):
+    model, run_kwargs = _fbp_model(land, sparse=True)
+    return lambda: model.run(**run_kwargs)
+
+
+@benchmark("models.FWIModel.run")
+def _(land):
+    from fbp.models import FWIModel
+
+    model = FWIModel(45, 60, -100, -120, land.shape)
+    kwargs = dict(date=datetime(2024, 7, 15),
+                  wind_speed=land["wind_speed"], temperature=land["temperature"],
+                  precipitation=land["precipitation"], relative_humidity=land["relative_humidity"],
+                  drought_code_yesterday=land["dc"], duff_moisture_code_yesterday=land["dmc"],
+                  fine_fuel_moisture_code_yesterday=land["ffmc"])
+    return lambda: model.run(**kwargs)
+
+
+# --- zonal statistics ---
+@benchmark("zonal.zonal_statistics")
+def _(land):
+    from fbp.zonal import zonal_statistics
+
+    model, run_kwargs = _fbp_model(land)
+    results = model.run(**run_kwargs)
+    block = max(land.size // 8, 1)
+    rows, cols = np.indices(land.shape) // block
+    zones = rows * 8 + cols     # 64 rectangular zones
+    return lambda: zonal_statistics(zones, results)
+
+
+# --- preprocessing ---
+@benchmark("preprocessing.FuelMapBuilder.build")
+def _(land):
+    from fbp.preprocessing.fbp_map_builder import FuelMapBuilder
+    vegetation = land["vegetation_map"]
+    return lambda: FuelMapBuilder(vegetation, kernel=10).build(VEGETATION_MAPPING)
+
+
+@benchmark("preprocessing.FuelMapBuilder._reduce_majority")
+def _(land):
+    from fbp.preprocessing.fbp_map_builder import FuelMapBuilder, CONIFER_FUEL_CODES
+    fuel_map = land["fuel_map"]
+    builder = FuelMapBuilder(fuel_map, kernel=10)
+    return lambda: builder._reduce_majority(fuel_map, CONIFER_FUEL_CODES)
+
+
+@benchmark("preprocessing.Layer.reproject")
+def _(land):
+    from rasterio.crs import CRS
+    from rasterio.coords import BoundingBox
+    from rasterio.transform import from_origin
+    from fbp.preprocessing.layers import Layer
+
+    data = land["fuel_map"][None]
+    cell = 30.
+    left, top = -1_000_000., 1_000_000.
+    meta = dict(driver="GTiff", dtype="uint8", count=1, height=land.size, width=land.size,
+                crs=CRS.from_epsg(3978), transform=from_origin(left, top, cell, cell),
+                bounds=BoundingBox(left, top - cell * land.size, left + cell * land.size, top))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            Layer(data, meta).reproject(CRS.from_epsg(3857), "nearest")
+    return run
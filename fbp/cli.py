@@ -0,0 +1,362 @@
+"""`fbp` command line: config-driven, tiled FWI/FBP batch runs.
+
+    fbp run job.json [--workers 4]
+    fbp status job.json
+    fbp landscape job.json          # memory-mapped landscape for `fbp serve`
+    fbp serve run/landscape --port 8080
+
+A job config (JSON) names the input rasters, the weather, the days to run and
+the outputs:
+
+    {
+      "fuel": "fuel.tif",                        # FBP fuel codes, or built from
+      "vegetation": {"path": "veg.tif",          # a vegetation raster with
+                     "mapping": {"1": "C2"},     # FuelMapBuilder (fuel.tif is
+                     "kernel": 10},              # then written to the output)
+      "dem": "dem.tif",                          # or "slope" / "azimuth" rasters
+      "percent_conifer": 50,                     # number or raster path
+      "percent_dead_fir": 0,
+      "percent_grass_curing": 60,
+      "crown_base_height": 2,
+      "weather": {"temperature": "wx/temp_{date}.tif",   # number or path
+                  "relative_humidity": 40,               # ({date} is YYYY-MM-DD),
+                  "wind_speed": "wx/ws_{date}.tif",      # aligned with the fuel
+                  "wind_azimuth": 270,                   # raster
+                  "precipitation": 0},
+      "time": {"start": "2024-07-01", "end": "2024-07-10"},  # daily, inclusive
+      "startup": {"ffmc": 85, "dmc": 6, "dc": 15},
+      "output": "run/",                          # run/fbp and run/fwi ResultStores
+      "variables": {"fbp": ["ros", "hfi", "cfb", "fd"], "fwi": ["fwi_today"]},
+      "tile_size": 512,
+      "workers": 1
+    }
+
+Relative paths are resolved against the config file. Every tile runs the whole
+time range (FWI day by day, then FBP with that day's FFMC/BUI/FMC) and writes
+its own store chunks; the next day's weather is read and the previous day's
+results written while a day computes (`fbp.pipeline`). A marker is written
+once a tile is complete, so an interrupted run resumes with the remaining
+tiles.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.models.fbp import FBPModel
+from fbp.models.fwi import FWIModel
+from fbp.pipeline import run_pipeline
+from fbp.utils import atomic_write
+
+WEATHER_VARIABLES = ("temperature", "relative_humidity", "wind_speed", "wind_azimuth", "precipitation")
+DONE_DIR = "_tiles"
+
+
+class JobConfig:
+    def __init__(self, config: dict, base_dir: str = ".") -> None:
+        self.config = config
+        self.base_dir = base_dir
+
+        for key in ("weather", "time", "output"):
+            if key not in config:
+                raise ValueError(f"Job config is missing '{key}'")
+        if "fuel" not in config and "vegetation" not in config:
+            raise ValueError("Job config needs 'fuel' or 'vegetation'")
+        missing = set(WEATHER_VARIABLES) - set(config["weather"])
+        if missing:
+            raise ValueError(f"Weather is missing {sorted(missing)}")
+
+        self.output = self.path(config["output"])
+        self.tile_size = int(config.get("tile_size", 512))
+        self.workers = int(config.get("workers", 1))
+        self.variables = config.get("variables", {"fbp": None})
+        self.startup = {"ffmc": 85., "dmc": 6., "dc": 15., **config.get("startup", {})}
+
+        start = date.fromisoformat(config["time"]["start"])
+        end = date.fromisoformat(config["time"].get("end", config["time"]["start"]))
+        if end < start:
+            raise ValueError(f"Time range ends ({end}) before it starts ({start})")
+        self.dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    @classmethod
+    def load(cls, path: str) -> "JobConfig":
+        with open(path) as f:
+            return cls(json.load(f), os.path.dirname(os.path.abspath(path)))
+
+    def path(self, path: str) -> str:
+        return path if os.path.isabs(path) else os.path.join(self.base_dir, path)
+
+    def source(self, name: str, default=None):
+        """A number, an absolute raster path or None."""
+        value = self.config.get(name, default)
+        return self.path(value) if isinstance(value, str) else value
+
+    def weather(self, variable: str, day: date):
+        value = self.config["weather"][variable]
+        return self.path(value.format(date=day.isoformat())) if isinstance(value, str) else value
+
+    @property
+    def fuel_path(self) -> str:
+        if "fuel" in self.config:
+            return self.path(self.config["fuel"])
+        return os.path.join(self.output, "fuel.tif")
+
+
+# --- preprocessing ---
+def prepare(job: JobConfig) -> None:
+    """Build the fuel and terrain rasters the job derives (skipped if they exist)."""
+    os.makedirs(job.output, exist_ok=True)
+
+    vegetation = job.config.get("vegetation")
+    if "fuel" not in job.config and not os.path.exists(job.fuel_path):
+        from fbp.preprocessing.fbp_map_builder import build_fuel_layer_tiled
+
+        mapping = {int(code): fuel for code, fuel in vegetation["mapping"].items()}
+        build_fuel_layer_tiled(job.path(vegetation["path"]), job.fuel_path, mapping,
+                               kernel=vegetation.get("kernel", 10), workers=job.workers,
+                               **vegetation.get("options", {}))
+
+    if "dem" in job.config and not ("slope" in job.config or "azimuth" in job.config):
+        from fbp.preprocessing.terrain import terrain_tiled
+
+        slope, azimuth = os.path.join(job.output, "slope.tif"), os.path.join(job.output, "azimuth.tif")
+        if not (os.path.exists(slope) and os.path.exists(azimuth)):
+            terrain_tiled(job.path(job.config["dem"]), slope, azimuth, workers=job.workers)
+
+
+def _terrain_sources(job: JobConfig) -> tuple:
+    if "dem" in job.config and not ("slope" in job.config or "azimuth" in job.config):
+        return os.path.join(job.output, "slope.tif"), os.path.join(job.output, "azimuth.tif")
+    return job.source("slope", 0.), job.source("azimuth", 0.)
+
+
+# --- tiles ---
+def tiles(shape: tuple[int, int], tile_size: int) -> list[tuple[int, int, int, int]]:
+    """(row_off, col_off, height, width) of the tiles covering `shape`."""
+    h, w = shape
+    return [(row, col, min(tile_size, h - row), min(tile_size, w - col))
+            for row in range(0, h, tile_size)
+            for col in range(0, w, tile_size)]
+
+
+def _done_marker(job: JobConfig, tile: tuple) -> str:
+    return os.path.join(job.output, DONE_DIR, "{}_{}".format(*tile[:2]))
+
+
+def _read(source, tile: tuple, shape: tuple[int, int], nodata_fill=None):
+    """The tile window of a raster aligned with the fuel raster (its nodata
+    cells set to `nodata_fill`, if given), or a constant filling the tile."""
+    row, col, h, w = tile
+    if isinstance(source, (int, float)):
+        return np.full((h, w), float(source))
+    import rasterio
+    from rasterio.windows import Window
+
+    with rasterio.open(source) as src:
+        if (src.height, src.width) != shape:
+            raise ValueError(f"{source} has shape {(src.height, src.width)}, expected {shape}")
+        values = src.read(1, window=Window(col, row, w, h)).astype(float)
+        if nodata_fill is not None and src.nodata is not None:
+            values[values == src.nodata] = nodata_fill
+        return values
+
+
+def _lat_lon(fuel_path: str, tile: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Latitude and longitude of the cell centres of a tile."""
+    import rasterio
+    from rasterio.warp import transform
+
+    row, col, h, w = tile
+    with rasterio.open(fuel_path) as src:
+        rows, cols = np.mgrid[row:row + h, col:col + w]
+        xs, ys = rasterio.transform.xy(src.transform, rows.ravel(), cols.ravel())
+        if src.crs is not None and not src.crs.is_geographic:
+            xs, ys = transform(src.crs, "EPSG:4326", xs, ys)
+    return np.reshape(ys, (h, w)), np.reshape(xs, (h, w))
+
+
+def _template(kind: str):
+    """One-cell results, for the store variable names and dtypes."""
+    if kind == "fbp":
+        return FBPModel(np.array([[FBP_FUEL_MAP["C2"]]])).run(np.array([[85.]]), np.array([[50.]]))
+    return FWIModel(45, 46, -75, -76, (1, 1)).run("2024-07-01", 10., 20., 0., 40., 100., 20., 85.)
+
+
+def _stores(job: JobConfig, shape: tuple[int, int], create: bool) -> dict:
+    from fbp.io import ResultStore
+
+    stores = {}
+    for kind, variables in job.variables.items():
+        path = os.path.join(job.output, kind)
+        if os.path.exists(os.path.join(path, "meta.json")):
+            stores[kind] = ResultStore(path)
+        elif create:
+            chunks = (min(len(job.dates), 24), job.tile_size, job.tile_size)
+            stores[kind] = ResultStore.create(path, _template(kind), chunks=chunks, shape=shape,
+                                              variables=variables)
+    return stores
+
+
+def run_tile(job: JobConfig, tile: tuple, shape: tuple[int, int]) -> tuple:
+    """Run the whole time range on one tile and write it to the stores."""
+    row, col, h, w = tile
+    stores = _stores(job, shape, create=False)
+
+    fuel_map = _read(job.fuel_path, tile, shape, nodata_fill=FBP_FUEL_MAP["Non-fuel"]).astype(np.uint8)
+    slope_source, azimuth_source = _terrain_sources(job)
+    model = FBPModel(fuel_map,
+                     percent_conifer=_read(job.source("percent_conifer", 50.), tile, shape),
+                     slope_percent=_read(slope_source, tile, shape),
+                     slope_azimuth=_read(azimuth_source, tile, shape),
+                     sparse=True)
+
+    fwi_model = FWIModel.from_lat_lon(*_lat_lon(job.fuel_path, tile))
+
+    state = {"ffmc": np.full((h, w), float(job.startup["ffmc"])),
+             "dmc": np.full((h, w), float(job.startup["dmc"])),
+             "dc": np.full((h, w), float(job.startup["dc"]))}
+    pdf = _read(job.source("percent_dead_fir", 0.), tile, shape)
+    curing = _read(job.source("percent_grass_curing", 60.), tile, shape)
+    cbh = _read(job.source("crown_base_height", 2.), tile, shape)
+
+    def read(step):
+        _, day = step
+        return {name: _read(job.weather(name, day), tile, shape) for name in WEATHER_VARIABLES}
+
+    def compute(step, weather):
+        _, day = step
+        fwi = fwi_model.run(datetime(day.year, day.month, day.day),
+                            wind_speed=weather["wind_speed"],
+                            temperature=weather["temperature"],
+                            precipitation=weather["precipitation"],
+                            relative_humidity=weather["relative_humidity"],
+                            drought_code_yesterday=state["dc"],
+                            duff_moisture_code_yesterday=state["dmc"],
+                            fine_fuel_moisture_code_yesterday=state["ffmc"])
+        state.update(ffmc=fwi.ffmc_today, dmc=fwi.dmc_today, dc=fwi.dc_today)
+
+        with np.errstate(all="ignore"):
+            fbp = model.unpack(model.run(fine_fuel_moisture_content=fwi.ffmc_today,
+                                         builtup_index=fwi.bui_today,
+                                         percent_grass_curing=curing,
+                                         percent_dead_fir=pdf,
+                                         crown_base_height=cbh,
+                                         wind_speed=weather["wind_speed"],
+                                         wind_azimuth=weather["wind_azimuth"],
+                                         folier_moisture_content=fwi.fmc))
+        return {"fbp": fbp, "fwi": fwi}
+
+    def write(step, results):
+        t, day = step
+        for kind, store in stores.items():
+            store.write(t, results[kind], window=(row, col), label=day.isoformat())
+
+    # the weather of the next day is read and the previous day written while a day computes
+    run_pipeline(list(enumerate(job.dates)), read, compute, write)
+
+    for store in stores.values():
+        store.close()
+    atomic_write(_done_marker(job, tile), lambda f: f.write(b""))
+    return tile
+
+
+def _shape(job: JobConfig) -> tuple[int, int]:
+    import rasterio
+
+    with rasterio.open(job.fuel_path) as src:
+        return src.height, src.width
+
+
+def run(job: JobConfig, workers: int | None = None, log=print) -> int:
+    """Run the pending tiles of `job`; returns the number of tiles run."""
+    workers = workers or job.workers
+    prepare(job)
+    shape = _shape(job)
+    _stores(job, shape, create=True)
+    os.makedirs(os.path.join(job.output, DONE_DIR), exist_ok=True)
+
+    pending = [tile for tile in tiles(shape, job.tile_size) if not os.path.exists(_done_marker(job, tile))]
+    log(f"{len(pending)} of {len(tiles(shape, job.tile_size))} tiles to run, {len(job.dates)} days")
+
+    t0 = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_tile, job, tile, shape) for tile in pending]
+            for i, future in enumerate(as_completed(futures), 1):
+                log(f"[{i}/{len(pending)}] tile {future.result()[:2]} done ({time.perf_counter() - t0:.1f} s)")
+    else:
+        for i, tile in enumerate(pending, 1):
+            run_tile(job, tile, shape)
+            log(f"[{i}/{len(pending)}] tile {tile[:2]} done ({time.perf_counter() - t0:.1f} s)")
+    return len(pending)
+
+
+def status(job: JobConfig) -> tuple[int, int]:
+    """(completed, total) tiles."""
+    all_tiles = tiles(_shape(job), job.tile_size)
+    done = sum(os.path.exists(_done_marker(job, tile)) for tile in all_tiles)
+    return done, len(all_tiles)
+
+
+def build_landscape(job: JobConfig, path: str | None = None):
+    """Write the job's fuel, terrain and crown layers as a memory-mapped
+    `fbp.landscape.Landscape` (default: <output>/landscape)."""
+    from fbp.landscape import Landscape
+
+    prepare(job)
+    slope, azimuth = _terrain_sources(job)
+    layers = {name: job.source(name) for name in ("percent_conifer", "percent_dead_fir",
+                                                  "percent_grass_curing", "crown_base_height")
+              if name in job.config}
+    return Landscape.from_rasters(path or os.path.join(job.output, "landscape"), job.fuel_path,
+                                  slope=slope, azimuth=azimuth, **layers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="fbp", description="Tiled FWI/FBP batch runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run (or resume) a job")
+    run_parser.add_argument("config")
+    run_parser.add_argument("--workers", type=int, default=None, help="override the config worker count")
+
+    status_parser = commands.add_parser("status", help="show the progress of a job")
+    status_parser.add_argument("config")
+
+    landscape_parser = commands.add_parser("landscape", help="write the memory-mapped landscape of a job")
+    landscape_parser.add_argument("config")
+    landscape_parser.add_argument("--path", default=None, help="default: <output>/landscape")
+
+    serve_parser = commands.add_parser("serve", help="answer FBP queries on a landscape over HTTP")
+    serve_parser.add_argument("landscape")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--max-wait", type=float, default=0.002, help="seconds to wait for a batch to fill")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from fbp.service import serve
+
+        serve(args.landscape, args.host, args.port, max_wait=args.max_wait)
+        return 0
+
+    job = JobConfig.load(args.config)
+    if args.command == "landscape":
+        landscape = build_landscape(job, args.path)
+        print(f"Wrote {landscape.path} {landscape.shape}")
+    elif args.command == "run":
+        run(job, args.workers)
+    elif args.command == "status":
+        done, total = status(job)
+        print(f"{done}/{total} tiles complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Per-cell fire weather climatology accumulated day by day, without keeping
+the (days x y x x) series.
+
+    acc = ClimatologyAccumulator(model.shape)
+    model.run_series(dates, weather, accumulators=[acc])
+    acc.save("1991-2000.npz")
+    ...
+    acc = ClimatologyAccumulator.load("1991-2000.npz").merge(ClimatologyAccumulator.load("2001-2010.npz"))
+    climatology = acc.result(percentiles=(50, 90, 97))
+
+Every variable keeps per-cell counts, sums, min, max and days above the
+thresholds; the DSR is accumulated for the seasonal severity rating. The
+`sketch` variables also keep a per-cell histogram on fixed bins (bounded
+memory: cells x bins counters) for approximate percentiles.
+"""
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from fbp.core.weather import daily_severity_rating
+from fbp.histogram import Bins, log_edges
+from fbp.models.fwi import FWIResults
+from fbp.utils import atomic_write
+
+# days above: the FWI high and extreme danger class limits, and ISI 10
+DEFAULT_THRESHOLDS = {"fwi_today": (19., 30.), "isi_today": (10.,)}
+
+# 0, then 16 log-spaced bins per decade from 0.1 to 200
+SKETCH_EDGES = log_edges(0.1, 200., 16)
+
+
+@dataclass
+class Climatology:
+    days: int
+    mean: dict[str, np.ndarray]
+    min: dict[str, np.ndarray]
+    max: dict[str, np.ndarray]
+    days_above: dict[str, dict[float, np.ndarray]]
+    dsr_sum: np.ndarray                 # cumulative daily severity rating
+    ssr: np.ndarray                     # seasonal severity rating: mean DSR
+    percentiles: dict[str, dict[float, np.ndarray]] = field(default_factory=dict)
+
+
+class ClimatologyAccumulator:
+    """Online per-cell statistics of daily `FWIResults`; `update` works in
+    place, accumulators of separate periods (or tiles of days) `merge`, and
+    `save`/`load` checkpoint them."""
+
+    def __init__(self,
+                 shape: tuple[int, int],
+                 variables: tuple[str, ...] = ("fwi_today", "isi_today", "bui_today", "ffmc_today"),
+                 thresholds: dict[str, tuple[float, ...]] = DEFAULT_THRESHOLDS,
+                 sketch: tuple[str, ...] = ("fwi_today",),
+                 edges: np.ndarray = SKETCH_EDGES,
+                 count_dtype=np.uint16) -> None:
+        """
+        thresholds: per variable, values above which days are counted
+        sketch: variables with a per-cell histogram for percentiles
+        count_dtype: dtype of the per-cell day counters (uint16: up to 65535 days)
+        """
+        self.shape = tuple(shape)
+        self.variables = tuple(variables)
+        self.thresholds = {name: tuple(float(t) for t in values) for name, values in thresholds.items()}
+        self.sketch = tuple(sketch)
+        self.bins = Bins(edges)
+        self.count_dtype = np.dtype(count_dtype)
+        for name in set(self.thresholds) | set(self.sketch):
+            if name not in self.variables:
+                raise ValueError(f"{name} is not one of the accumulated variables {self.variables}")
+
+        self.days = 0
+        self.arrays: dict[str, np.ndarray] = {}
+        for name in self.variables:
+            self.arrays[f"count__{name}"] = np.zeros(shape, dtype=self.count_dtype)
+            self.arrays[f"sum__{name}"] = np.zeros(shape)
+            self.arrays[f"min__{name}"] = np.full(shape, np.nan)
+            self.arrays[f"max__{name}"] = np.full(shape, np.nan)
+            for t in self.thresholds.get(name, ()):
+                self.arrays[f"above__{name}__{t:g}"] = np.zeros(shape, dtype=self.count_dtype)
+        for name in self.sketch:
+            self.arrays[f"sketch__{name}"] = np.zeros((int(np.prod(shape)), self.bins.size), dtype=self.count_dtype)
+        self.arrays["dsr_sum"] = np.zeros(shape)
+        self.arrays["dsr_count"] = np.zeros(shape, dtype=self.count_dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays.values())
+
+    def _config(self) -> dict:
+        return {"shape": list(self.shape), "variables": list(self.variables),
+                "thresholds": {k: list(v) for k, v in self.thresholds.items()}, "sketch": list(self.sketch),
+                "edges": self.bins.edges.tolist(), "count_dtype": self.count_dtype.str}
+
+    # --- accumulation ---
+    def update(self, results: FWIResults) -> None:
+        """Add one day."""
+        if self.days >= np.iinfo(self.count_dtype).max:
+            raise ValueError(f"More than {self.days} days overflow the {self.count_dtype} counters")
+        self.days += 1
+        a = self.arrays
+
+        for name in self.variables:
+            values = np.asarray(getattr(results, name), dtype=float)
+            if values.shape != self.shape:
+                raise ValueError(f"{name} has shape {values.shape}, expected {self.shape}")
+            finite = np.isfinite(values)
+            a[f"count__{name}"] += finite
+            a[f"sum__{name}"] += np.where(finite, values, 0.)
+            np.fmin(a[f"min__{name}"], values, out=a[f"min__{name}"])
+            np.fmax(a[f"max__{name}"], values, out=a[f"max__{name}"])
+            for t in self.thresholds.get(name, ()):
+                a[f"above__{name}__{t:g}"] += values > t
+
+            if name in self.sketch:
+                # one increment per cell: distinct flat indices, so fancy `+=` is exact
+                cells = np.flatnonzero(finite)
+                hist = a[f"sketch__{name}"].reshape(-1)
+                hist[cells * self.bins.size + self.bins.index(values.reshape(-1)[cells])] += 1
+
+        dsr = daily_severity_rating(np.asarray(results.fwi_today, dtype=float))
+        finite = np.isfinite(dsr)
+        a["dsr_sum"] += np.where(finite, dsr, 0.)
+        a["dsr_count"] += finite
+
+    def merge(self, other: "ClimatologyAccumulator") -> "ClimatologyAccumulator":
+        """Add the statistics of `other` (same configuration) in place."""
+        if other._config() != self._config():
+            raise ValueError("Only accumulators with the same shape, variables, thresholds and bins can be merged")
+        if self.days + other.days > np.iinfo(self.count_dtype).max:
+            raise ValueError(f"{self.days + other.days} days overflow the {self.count_dtype} counters")
+        self.days += other.days
+        for key, values in self.arrays.items():
+            if key.startswith("min__"):
+                np.fmin(values, other.arrays[key], out=values)
+            elif key.startswith("max__"):
+                np.fmax(values, other.arrays[key], out=values)
+            else:
+                values += other.arrays[key]
+        return self
+
+    # --- checkpoints ---
+    def save(self, path: str) -> None:
+        config = json.dumps({**self._config(), "days": self.days})
+        atomic_write(path, lambda f: np.savez(f, config=np.array(config), **self.arrays))
+
+    @classmethod
+    def load(cls, path: str) -> "ClimatologyAccumulator":
+        with np.load(path) as data:
+            config = json.loads(str(data["config"]))
+            acc = cls(config["shape"], tuple(config["variables"]), config["thresholds"], tuple(config["sketch"]),
+                      np.array(config["edges"]), np.dtype(config["count_dtype"]))
+            acc.days = config["days"]
+            for key in acc.arrays:
+                acc.arrays[key] = data[key]
+        return acc
+
+    # --- results ---
+    def percentile(self, name: str, q: float) -> np.ndarray:
+        a = self.arrays
+        return self.bins.percentile(a[f"sketch__{name}"], q, a[f"min__{name}"].reshape(-1),
+                                    a[f"max__{name}"].reshape(-1)).reshape(self.shape)
+
+    def result(self, percentiles: tuple[float, ...] = (50, 90, 97)) -> Climatology:
+        a = self.arrays
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = {name: a[f"sum__{name}"] / a[f"count__{name}"] for name in self.variables}
+            ssr = a["dsr_sum"] / a["dsr_count"]
+        return Climatology(
+            days=self.days,
+            mean=mean,
+            min={name: a[f"min__{name}"].copy() for name in self.variables},
+            max={name: a[f"max__{name}"].copy() for name in self.variables},
+            days_above={name: {t: a[f"above__{name}__{t:g}"].astype(np.int64) for t in ts}
+                        for name, ts in self.thresholds.items()},
+            dsr_sum=a["dsr_sum"].copy(),
+            ssr=ssr,
+            percentiles={name: {q: self.percentile(name, q) for q in percentiles} for name in self.sketch})
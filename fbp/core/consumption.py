@@ -1,7 +1,7 @@
 import numpy as np
 
 from fbp.constants import FBP_FUEL_MAP
-from fbp.core.utils import get_fuel_mask
+from fbp.core.utils import get_fuel_mask, full_out
 from fbp.core.crowning import crown_fraction_burned
 
 
@@ -45,6 +45,28 @@ def _sfc_d1_formula(bui: np.ndarray):
     """Eq 16, FCFDG 1992"""
     return  1.5 * (1 - np.exp(-0.0183 * bui))
 
+def _sfc_c1_formula(ffmc: np.ndarray):
+    """Eq. 9a & 9b, Wotton et al. 2009"""
+    return np.where(
+        ffmc > 84,
+        0.75 + 0.75 * (1 - np.exp(-0.23 * (ffmc - 84))) ** 0.5,
+        # NOTE in Wotton et al. 2009 the term is written with opposite sign,
+        # but the R implementation uses (84 - FFMC) for the FFMC ≤ 84 case
+        # which seems to be correct.
+        0.75 - 0.75 * (1 - np.exp(-0.23 * (84 - ffmc))) ** 0.5
+    )
+
+def _ffc_c7_formula(ffmc: np.ndarray):
+    """Eq. 13, FCFDG 1992: forest floor consumption (FFC)"""
+    return np.where(
+        ffmc > 70,
+        2 * (1 - np.exp(-0.104 * (ffmc - 70))),
+        0)
+
+def _wfc_c7_formula(bui: np.ndarray):
+    """Eq. 14, FCFDG 1992: woody fuel consumption (WFC)"""
+    return 1.5 * (1 - np.exp(-0.0201 * bui))
+
 def _build_cfl(fuel_map: np.ndarray) -> np.ndarray:
     cfl = np.full_like(fuel_map, np.nan, dtype=float)
     for fuel_type, load in CROWN_FUEL_LOAD.items():
@@ -57,24 +79,24 @@ def surface_fuel_consumption(
         bui: np.ndarray,
         ffmc: np.ndarray | None = None,
         percent_conifer_map: np.ndarray | None = None,
-        grass_fuel_load: float = 0.3):
+        grass_fuel_load: float = 0.3,
+        ffmc_table=None,
+        out: np.ndarray | None = None):
+    """
+    ffmc_table: optional `fbp.core.tables.FFMCTable` for the FFMC-only C1/C7 terms
+    """
 
-    sfc = np.zeros_like(bui, dtype=float)
+    sfc = full_out(bui, 0., out=out)
 
     # --- C1 ---
     mask = get_fuel_mask(fuel_map, ["C1"])
     if np.any(mask):
         if ffmc is None:
             raise ValueError(f"ffmc required for C7 (cells: {np.sum(mask)})")
-        """Eq. 9a & 9b, Wotton et al. 2009"""
-        sfc[mask] = np.where(
-            ffmc[mask] > 84,
-            0.75 + 0.75 * (1 - np.exp(-0.23 * (ffmc[mask] - 84))) ** 0.5,
-            # NOTE in Wotton et al. 2009 the term is written with opposite sign,
-            # but the R implementation uses (84 - FFMC) for the FFMC ≤ 84 case
-            # which seems to be correct.
-            0.75 - 0.75 * (1 - np.exp(-0.23 * (84 - ffmc[mask]))) ** 0.5 
-        )
+        if ffmc_table is None:
+            sfc[mask] = _sfc_c1_formula(ffmc[mask])
+        else:
+            sfc[mask] = ffmc_table.sfc_c1(ffmc[mask])
     
     # --- C2, M3 & M4 ---
     mask = get_fuel_mask(fuel_map, ["C2", "M3", "M4"])
@@ -99,13 +121,11 @@ def surface_fuel_consumption(
     if np.any(mask):
         if ffmc is None:
             raise ValueError(f"ffmc required for C7 (cells: {np.sum(mask)})")
-        """Eq. 13, FCFDG 1992: forest floor consumption (FFC)"""
-        ffc = np.where(
-            ffmc[mask] > 70,
-            2 * (1 - np.exp(-0.104 * (ffmc[mask] - 70))),
-            0)
-        """Eq. 14, FCFDG 1992: woody fuel consumption (WFC)"""
-        wfc = 1.5 * (1 - np.exp(-0.0201 * bui[mask]))
+        if ffmc_table is None:
+            ffc = _ffc_c7_formula(ffmc[mask])
+        else:
+            ffc = ffmc_table.ffc_c7(ffmc[mask])
+        wfc = _wfc_c7_formula(bui[mask])
         """Eq. 15, FCFDG 1992"""
         sfc[mask] = ffc + wfc
 
@@ -158,7 +178,7 @@ def surface_fuel_consumption(
         wfc = 20. * (1 - np.exp(-0.021 * bui[mask]))
         sfc[mask] = ffc + wfc
 
-    sfc = np.where(sfc <= 0, 1e-6, sfc)
+    sfc[sfc <= 0] = 1e-6
     return sfc
 
 def crown_fuel_consumption(
@@ -166,12 +186,13 @@ def crown_fuel_consumption(
         cfb: np.ndarray,
         cfl: np.ndarray | None = None,
         percent_conifer_map: np.ndarray | None = None,
-        percent_dead_fir_map: np.ndarray | None = None) -> np.ndarray:
+        percent_dead_fir_map: np.ndarray | None = None,
+        out: np.ndarray | None = None) -> np.ndarray:
     """
     cfb: crown fraction burned
     cfl: crown fuel load
     """
-    cfc = np.zeros_like(fuel_map, dtype=float)
+    cfc = full_out(fuel_map, 0., out=out)
     if cfl is None:
         cfl = _build_cfl(fuel_map)
     
@@ -208,26 +229,36 @@ def total_fuel_consumption(
         crown_fraction_burned: np.ndarray,
         crown_fuel_load: np.ndarray | None = None,
         percent_conifer_map: np.ndarray | None = None,
-        percent_dead_fir_map: np.ndarray | None = None
+        percent_dead_fir_map: np.ndarray | None = None,
+        out: np.ndarray | None = None
 ):
-    
-    tfc = surface_fuel_consumption
+    """
+    Returns a new array (or `out`), never `surface_fuel_consumption` itself.
+    """
     if np.any(get_fuel_mask(fuel_map, CROWNING_FUELS)):
+        # crown fuel consumption is built in the output buffer
         cfc = crown_fuel_consumption(fuel_map,
                                     crown_fraction_burned,
                                     crown_fuel_load,
                                     percent_conifer_map,
-                                    percent_dead_fir_map)
+                                    percent_dead_fir_map,
+                                    out=out)
         
         """Eq. 67, FCFDG 1992: total fuel consumption (TFC)"""
-        tfc += cfc
+        tfc = np.add(surface_fuel_consumption, cfc, out=cfc)
+    elif out is None:
+        tfc = np.array(surface_fuel_consumption, dtype=float)
+    else:
+        tfc = out
+        tfc[...] = surface_fuel_consumption
 
     return tfc
 
-def fire_intensity(fc: np.ndarray, ros: np.ndarray) -> np.ndarray:
+def fire_intensity(fc: np.ndarray, ros: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     """Eq. 69, , FCFDG 1992: fire intensity (FI) (kW/m)
     fc: fuel consumption (surface or total) (kg/m^2)
     ros: rate of spread
     """
-    fi = 300 * fc * ros
-    return fi
\ No newline at end of file
+    fi = np.multiply(fc, ros, out=out)
+    fi *= 300
+    return fi
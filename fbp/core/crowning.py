@@ -1,6 +1,6 @@
 import numpy as np
 
-from fbp.core.utils import get_fuel_mask
+from fbp.core.utils import get_fuel_mask, full_out
 
 
 def critical_surface_fire_intensity(fmc, cbh):
@@ -21,7 +21,8 @@ def critical_surface_fire_rate_of_spread(csi, sfc):
 def crown_fraction_burned(rate_of_spread: np.ndarray,
                           folier_moisture_content: np.ndarray,
                           surface_fuel_consumption: np.ndarray,
-                          crown_base_height: np.ndarray | float) -> np.ndarray:
+                          crown_base_height: np.ndarray | float,
+                          out: np.ndarray | None = None) -> np.ndarray:
 
     csi = critical_surface_fire_intensity(folier_moisture_content, crown_base_height)
     rso = critical_surface_fire_rate_of_spread(csi, sfc=surface_fuel_consumption)
@@ -30,10 +31,13 @@ def crown_fraction_burned(rate_of_spread: np.ndarray,
     ros: rate of spread
     rso: critical surface fire spread rate"""
     ros = rate_of_spread
-    cfb = 1 - np.exp(-0.23 * (ros - rso))
+    cfb = np.subtract(ros, rso, out=out)
+    cfb = np.multiply(cfb, -0.23, out=out)
+    cfb = np.exp(cfb, out=out)
+    cfb = np.subtract(1, cfb, out=out)
     return cfb
 
-def classify_fire_type(fuel_map: np.ndarray, cfb:np.ndarray | None) -> np.ndarray:
+def classify_fire_type(fuel_map: np.ndarray, cfb:np.ndarray | None, out: np.ndarray | None = None) -> np.ndarray:
     """Table 15, Hirsch 1196: Type of fire categories
     cfb: crown fraction burned
     S: surface fire
@@ -41,7 +45,7 @@ def classify_fire_type(fuel_map: np.ndarray, cfb:np.ndarray | None) -> np.ndarra
     C: crown fire
     Null: not applicable
     """
-    FD = np.full_like(fuel_map, "Null", dtype="<U4")
+    FD = full_out(fuel_map, "Null", dtype="<U4", out=out)
     
 
     mask_surface = get_fuel_mask(fuel_map, ["D1", "O1a", "O1b"])
@@ -1,6 +1,7 @@
 import numpy as np
 
 from fbp.constants import FBP_FUEL_MAP
+from fbp.core.utils import full_out
 
 """Table 6, FCFDG 1992: Rate of spread parameters for all fuel types (except mixedwood)"""
 ROS_PARAMS = {
@@ -86,11 +87,13 @@ def initial_rate_of_spread(
         isi: np.ndarray,
         percent_grass_curing_map: np.ndarray | None = None,
         percent_conifer_map: np.ndarray | None = None,
-        percent_dead_fir_map: np.ndarray | None = None) -> np.ndarray:
+        percent_dead_fir_map: np.ndarray | None = None,
+        out: np.ndarray | None = None) -> np.ndarray:
+    """
+    C6: surface RSI only (Eq. 62); see `c6_rate_of_spread` for the crown fire blend
+    """
     
-    # FIXME C-6 isn't implemented.
-    
-    rsi = np.full_like(fuel_map, np.nan, dtype=float)
+    rsi = full_out(fuel_map, np.nan, out=out)
 
     # --- standard fuels ---
     for fuel, param in ROS_PARAMS.items():
@@ -155,11 +158,6 @@ def initial_rate_of_spread(
 
         """Eq. 31, Wotton 2009"""
         rsi[mask] = pdf_safe/100 * rsi_m4_100 + 0.2 * (1 - pdf_safe/100) * rsi_d1
-    
-    # -- C6 ---
-    mask = fuel_map == FBP_FUEL_MAP["C6"]
-    if np.any(mask):
-        raise NotImplementedError
 
     return rsi
 
@@ -182,8 +180,8 @@ def initial_rate_of_spread(
 #     isi = 0.208 * fW * fF
 #     return isi
 
-def buildup_effect(fuel_map: np.ndarray, bui: np.ndarray) -> np.ndarray:
-    be = np.zeros_like(fuel_map, dtype=float)
+def buildup_effect(fuel_map: np.ndarray, bui: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    be = full_out(fuel_map, 0., out=out)
     for fuel, param in BUILTUP_PARAMS.items():
         mask = fuel_map == FBP_FUEL_MAP[fuel]
 
@@ -200,8 +198,41 @@ def buildup_effect(fuel_map: np.ndarray, bui: np.ndarray) -> np.ndarray:
 
     return be
 
-def rate_of_spread(rsi: np.ndarray, be: np.ndarray) -> np.ndarray:
+def _fme_formula(fmc: np.ndarray) -> np.ndarray:
+    """Eqs. 60 & 61, FCFDG 1992: foliar moisture effect (FME)"""
+    return 1000 * (1.5 - 0.00275 * fmc) ** 4 / (460 + 25.9 * fmc)
+
+def c6_crown_rate_of_spread(isi: np.ndarray, fmc: np.ndarray) -> np.ndarray:
+    """Eq. 64, FCFDG 1992: C6 crown fire spread rate (RSC), FMEavg = 0.778"""
+    return 60 * (1 - np.exp(-0.0497 * isi)) * _fme_formula(fmc) / 0.778
+
+def c6_rate_of_spread(isi: np.ndarray,
+                      bui: np.ndarray,
+                      fmc: np.ndarray,
+                      sfc: np.ndarray,
+                      cbh: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+    """Eqs. 59-66, FCFDG 1992: C6 conifer plantation rate of spread and crown
+    fraction burned; the crown fire only develops when RSC exceeds RSS.
+    """
+    from fbp.core.crowning import crown_fraction_burned
+
+    isi, bui, fmc, sfc = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in (isi, bui, fmc, sfc)])
+    c6 = np.full(isi.shape, FBP_FUEL_MAP["C6"])
+
+    """Eqs. 62 & 63, FCFDG 1992: surface spread rate (RSS)"""
+    rss = _rsi_formula(isi, **ROS_PARAMS["C6"]) * buildup_effect(c6, bui)
+    rsc = c6_crown_rate_of_spread(isi, fmc)
+
+    crowning = rsc > rss
+    cfb = crown_fraction_burned(rss, fmc, sfc, cbh)
+    cfb = np.where(crowning, np.maximum(cfb, 0), 0)
+
+    """Eq. 65, FCFDG 1992"""
+    ros = np.where(crowning, rss + cfb * (rsc - rss), rss)
+    return np.maximum(ros, 1e-6), cfb
+
+def rate_of_spread(rsi: np.ndarray, be: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     """Eq. 55, FCFDG 1992: Rate of spread (ROS)"""
-    ros = np.maximum(rsi * be, 1e-6)   
+    ros = np.multiply(rsi, be, out=out)
+    ros = np.maximum(ros, 1e-6, out=out)
     return ros
-    
\ No newline at end of file
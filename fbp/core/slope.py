@@ -55,11 +55,12 @@ def slope_adjusted_zero_wind_rate_of_spread(
         percent_ground_slope: np.ndarray,
         percent_grass_curing_map: np.ndarray | None = None,
         percent_conifer_map: np.ndarray | None = None,
-        percent_dead_fir_map: np.ndarray | None = None
+        percent_dead_fir_map: np.ndarray | None = None,
+        fF: np.ndarray | None = None
         ) -> np.ndarray:
     
     # ISI: zero wind on level ground
-    isz = initial_spread_index(ffmc, ws=np.zeros_like(ffmc))
+    isz = initial_spread_index(ffmc, ws=np.zeros_like(ffmc), fF=fF)
     rsi_zero_wind = initial_rate_of_spread(
         fuel_map,
         isi=isz,
@@ -143,21 +144,19 @@ def slope_adjusted_initial_spread_index(
     
     return isf
 
-def slope_adjusted_wind_vector(
+def slope_equivalent_wind_speed(
         fuel_map: np.ndarray,
-        wind_speed: np.ndarray,
-        wind_azimuth: np.ndarray,
         slope_percent: np.ndarray,
-        slope_azimuth: np.ndarray,
         ffmc: np.ndarray,
         percent_conifer_map: np.ndarray | None = None,
         percent_dead_fir_map: np.ndarray | None = None,
-        percent_grass_curing_map: np.ndarray | None = None
-        ) -> tuple[np.ndarray, np.ndarray]: 
-    
-    ws = wind_speed
-    waz = wind_azimuth * np.pi / 180
-    saz = slope_azimuth * np.pi / 180
+        percent_grass_curing_map: np.ndarray | None = None,
+        fF: np.ndarray | None = None
+        ) -> np.ndarray:
+    """Slope equivalent wind speed (WSE, km/h) from the zero-wind ISI -> RSI -> RSF
+    pass and its inversion (Wotton 2009)."""
+    if fF is None:
+        fF = _fF_formula(ffmc)
 
     rsf = slope_adjusted_zero_wind_rate_of_spread(
         fuel_map=fuel_map,
@@ -165,7 +164,8 @@ def slope_adjusted_wind_vector(
         percent_ground_slope=slope_percent,
         percent_conifer_map=percent_conifer_map,
         percent_dead_fir_map=percent_dead_fir_map,
-        percent_grass_curing_map=percent_grass_curing_map)
+        percent_grass_curing_map=percent_grass_curing_map,
+        fF=fF)
 
     isf = slope_adjusted_initial_spread_index(
         rsf=rsf,
@@ -175,20 +175,61 @@ def slope_adjusted_wind_vector(
         percent_grass_curing_map=percent_grass_curing_map
         )
 
-    fF = _fF_formula(ffmc)
-    wse = _wse_formula(isf, fF)
+    return _wse_formula(isf, fF)
+
+def slope_adjusted_wind_vector(
+        fuel_map: np.ndarray,
+        wind_speed: np.ndarray,
+        wind_azimuth: np.ndarray,
+        slope_percent: np.ndarray,
+        slope_azimuth: np.ndarray,
+        ffmc: np.ndarray,
+        percent_conifer_map: np.ndarray | None = None,
+        percent_dead_fir_map: np.ndarray | None = None,
+        percent_grass_curing_map: np.ndarray | None = None,
+        wse_table=None,
+        fF: np.ndarray | None = None,
+        out: tuple[np.ndarray, np.ndarray] | None = None
+        ) -> tuple[np.ndarray, np.ndarray]: 
+    """
+    wse_table: optional `fbp.core.tables.WSETable`; WSE is then interpolated
+        for the tabulated fuels and computed exactly for the others
+    fF: precomputed FFMC function (Eq. 45) of `ffmc`
+    out: (wsv, raz) buffers for the results
+    """
+    
+    ws = wind_speed
+    waz = wind_azimuth * np.pi / 180
+    saz = slope_azimuth * np.pi / 180
+
+    maps = dict(percent_conifer_map=percent_conifer_map,
+                percent_dead_fir_map=percent_dead_fir_map,
+                percent_grass_curing_map=percent_grass_curing_map)
+    if wse_table is None:
+        wse = slope_equivalent_wind_speed(fuel_map, slope_percent, ffmc, fF=fF, **maps)
+    else:
+        wse = wse_table(fuel_map, ffmc, slope_percent)
+        exact = np.isnan(wse) & (fuel_map != FBP_FUEL_MAP["Non-fuel"])
+        if np.any(exact):
+            wse[exact] = slope_equivalent_wind_speed(
+                fuel_map[exact], slope_percent[exact], ffmc[exact],
+                fF=fF[exact] if fF is not None else None,
+                **{name: m[exact] if m is not None else None for name, m in maps.items()})
 
     """Eq. 47 & 48, Wotton 2009"""
     wsx = ws * np.sin(waz) + wse * np.sin(saz)
     wsy = ws * np.cos(waz) + wse * np.cos(saz)
 
+    wsv_out, raz_out = out if out is not None else (None, None)
+
     """Eq. 49 & 50, Wotton 2009"""
-    wsv = np.sqrt(wsx**2 + wsy**2)
-    raz = np.arccos(wsy / wsv) * 180 / np.pi
+    wsv = np.hypot(wsx, wsy, out=wsv_out)
+    raz = np.divide(wsy, wsv, out=raz_out)
+    raz = np.arccos(raz, out=raz_out)
+    raz = np.multiply(raz, 180 / np.pi, out=raz_out)
     
     """Eq. 51, Wotton 2009"""
-    raz = np.where(wsx < 0, 360 - raz, raz)
+    raz = np.where(wsx < 0, 360 - raz, raz) if raz_out is None else \
+        np.subtract(360, raz, out=raz, where=wsx < 0)
 
     return wsv, raz
-
-
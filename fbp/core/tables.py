@@ -0,0 +1,506 @@
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.core.ros import ROS_PARAMS
+
+
+class RegularGridTable:
+    """Values tabulated on a regular 1-D or 2-D grid, evaluated by (bi)linear
+    interpolation. Points outside the grid, or in cells disabled by
+    `restrict_error`, evaluate to NaN.
+
+    A table may stack several functions along a leading axis (e.g. one per
+    fuel type); `__call__` then takes the stack index of every point.
+    """
+
+    def __init__(self,
+                 start: tuple[float, ...],
+                 step: tuple[float, ...],
+                 values: np.ndarray,
+                 valid: np.ndarray | None = None) -> None:
+        self.start = tuple(float(s) for s in start)
+        self.step = tuple(float(s) for s in step)
+        self.values = np.asarray(values, dtype=float)
+        self.shape = self.values.shape[-len(self.start):]
+        self.stop = tuple(s + d * (n - 1) for s, d, n in zip(self.start, self.step, self.shape))
+        self.valid = valid
+
+    @staticmethod
+    def _axes(start, stop, step) -> list[np.ndarray]:
+        return [np.linspace(a, b, int(round((b - a) / d)) + 1) for a, b, d in zip(start, stop, step)]
+
+    @classmethod
+    def from_function(cls, func, start: tuple[float, ...], stop: tuple[float, ...], step: tuple[float, ...]):
+        """Tabulate `func(*coords)` on the grid from `start` to `stop` (inclusive)."""
+        axes = cls._axes(start, stop, step)
+        grids = np.meshgrid(*axes, indexing="ij")
+        return cls(start, [(b - a) / (len(ax) - 1) for a, b, ax in zip(start, stop, axes)], func(*grids))
+
+    @classmethod
+    def stack(cls, tables: list["RegularGridTable"]) -> "RegularGridTable":
+        """Stack tables sharing the same grid along a new leading axis."""
+        first = tables[0]
+        valid = None
+        if any(t.valid is not None for t in tables):
+            valid = np.stack([t.valid if t.valid is not None else np.ones(np.subtract(t.shape, 1), dtype=bool)
+                              for t in tables])
+        return cls(first.start, first.step, np.stack([t.values for t in tables]), valid)
+
+    def cell_error(self, func, relative: bool = False, floor: float = 1e-12, samples: int = 3) -> np.ndarray:
+        """Largest interpolation error against `func` in every grid cell, sampled on
+        a `samples`^ndim lattice inside each cell (including its midpoint).
+        Relative errors are taken against max(|exact|, `floor`)."""
+        error = None
+        for offset in np.ndindex(*([samples] * len(self.shape))):
+            frac = [(o + 1) / (samples + 1) for o in offset]
+            axes = [s + d * (np.arange(n - 1) + f) for s, d, n, f in zip(self.start, self.step, self.shape, frac)]
+            grids = np.meshgrid(*axes, indexing="ij")
+            exact = func(*grids)
+            e = np.abs(self._interpolate(self.values, [g.astype(float) for g in grids]) - exact)
+            if relative:
+                e = e / np.maximum(np.abs(exact), floor)
+            error = e if error is None else np.fmax(error, e)
+        return error
+
+    def restrict_error(self, func, tolerance: float, relative: bool = False, floor: float = 1e-12) -> float:
+        """Disable the cells whose sampled error exceeds `tolerance` (kinks and jumps
+        of `func`) and return the largest sampled error left in the enabled cells."""
+        error = self.cell_error(func, relative, floor)
+        self.valid = ~(error > tolerance)
+        return float(np.nanmax(error, initial=0., where=self.valid))
+
+    def _positions(self, coords: list[np.ndarray]) -> tuple[list, list, np.ndarray]:
+        inside = np.ones(coords[0].shape, dtype=bool)
+        index, frac = [], []
+        for x, x0, x1, dx, n in zip(coords, self.start, self.stop, self.step, self.shape):
+            inside &= (x >= x0) & (x <= x1)
+            pos = (x - x0) / dx
+            np.clip(pos, 0, n - 1, out=pos)
+            pos[np.isnan(pos)] = 0
+            i = np.minimum(pos.astype(np.intp), n - 2)
+            pos -= i
+            index.append(i)
+            frac.append(pos)
+        return index, frac, inside
+
+    def _flat_cell(self, index: list[np.ndarray], lead: np.ndarray | None) -> np.ndarray:
+        """Flat index (into `values`) of the lower corner of every point's cell."""
+        flat = index[0] if lead is None else lead * self.shape[0] + index[0]
+        for i, n in zip(index[1:], self.shape[1:]):
+            flat = flat * n + i
+        return flat
+
+    def _interpolate(self, values: np.ndarray, coords: list[np.ndarray], lead: np.ndarray | None = None,
+                     positions: tuple | None = None) -> np.ndarray:
+        index, frac, _ = positions or self._positions(coords)
+        flat = self._flat_cell(index, lead)
+        v = values.ravel()
+        if len(index) == 1:
+            (t,) = frac
+            v0 = v.take(flat)
+            return v0 + (v.take(flat + 1) - v0) * t
+
+        (t, u) = frac
+        n = self.shape[1]
+        v00, v01 = v.take(flat), v.take(flat + 1)
+        v10, v11 = v.take(flat + n), v.take(flat + n + 1)
+        low = v00 + (v01 - v00) * u
+        high = v10 + (v11 - v10) * u
+        return low + (high - low) * t
+
+    def __call__(self, *coords: np.ndarray, index: np.ndarray | None = None) -> np.ndarray:
+        coords = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in coords])
+
+        positions = self._positions(coords)
+        cells, _, inside = positions
+        out = self._interpolate(self.values, coords, index, positions)
+        if self.valid is not None:
+            lead = () if index is None else (index,)
+            inside &= self.valid[lead + tuple(cells)]
+        out[~inside] = np.nan
+        return out
+
+
+class WSETable:
+    """Slope equivalent wind speed tabulated per fuel on an (FFMC x slope %) grid.
+
+    For fuels whose spread rate depends only on ISI (all standard fuels except
+    grass, whose WSE also depends on curing; mixedwoods depend on PC/PDF), WSE is
+    a function of FFMC and slope only. `slope_adjusted_wind_vector(wse_table=...)`
+    interpolates it and falls back to the exact equations for other fuels, for
+    cells outside the grid and for grid cells where the interpolation error
+    exceeds `tolerance` (km/h) -- those crossing the branches of Eq. 44, where
+    WSE kinks at 40 km/h and jumps to its 112.45 km/h cap.
+
+    `max_error` holds the largest error per fuel (km/h) found on a 3x3 lattice
+    inside every enabled cell. It is a sampled estimate, not a guaranteed
+    bound: between the lattice points the error can exceed it slightly (by up
+    to about 20% with the default grid), so allow a margin. `fallback` is the
+    fraction of the grid left to the exact equations.
+    """
+
+    DEFAULT_FUELS = [f for f in ROS_PARAMS if f not in ("O1a", "O1b")]
+
+    def __init__(self,
+                 fuels: list[str],
+                 table: RegularGridTable,
+                 max_error: dict[str, float],
+                 fallback: dict[str, float]) -> None:
+        self.fuels = fuels
+        self.table = table
+        self.max_error = max_error
+        self.fallback = fallback
+
+        # fuel code -> stack index, -1 for fuels that are not tabulated
+        self._index = np.full(256, -1, dtype=np.intp)
+        for i, fuel in enumerate(fuels):
+            self._index[FBP_FUEL_MAP[fuel]] = i
+
+    @classmethod
+    def build(cls,
+              fuels: list[str] | None = None,
+              ffmc_step: float = 0.25,
+              slope_step: float = 0.5,
+              max_slope: float = 150.,
+              tolerance: float = 0.1) -> "WSETable":
+        from fbp.core.slope import slope_equivalent_wind_speed
+
+        fuels = fuels or cls.DEFAULT_FUELS
+        tables, max_error, fallback = [], {}, {}
+        for fuel in fuels:
+            if fuel not in cls.DEFAULT_FUELS:
+                raise ValueError(f"WSE of {fuel} depends on more than FFMC and slope")
+
+            def wse(ffmc, slope_percent, code=FBP_FUEL_MAP[fuel]):
+                fuel_map = np.full(ffmc.shape, code)
+                return slope_equivalent_wind_speed(fuel_map, slope_percent, ffmc)
+
+            with np.errstate(all="ignore"):
+                table = RegularGridTable.from_function(wse, (0., 0.), (101., max_slope), (ffmc_step, slope_step))
+                max_error[fuel] = table.restrict_error(wse, tolerance)
+            fallback[fuel] = float(1 - table.valid.mean())
+            tables.append(table)
+
+        return cls(list(fuels), RegularGridTable.stack(tables), max_error, fallback)
+
+    def __call__(self, fuel_map: np.ndarray, ffmc: np.ndarray, slope_percent: np.ndarray) -> np.ndarray:
+        """WSE for the tabulated fuels; NaN for other fuels, outside the grid and in
+        disabled cells."""
+        index = self._index[np.asarray(fuel_map, dtype=np.intp)]
+        tabulated = index >= 0
+        wse = self.table(ffmc, slope_percent, index=np.maximum(index, 0))
+        return np.where(tabulated, wse, np.nan)
+
+
+class FFMCTable:
+    """FFMC-only terms tabulated over FFMC in [0, 101]: the ISI fine fuel
+    moisture function fF (Eq. 45, FCFDG 1992), C-1 surface fuel consumption
+    (Eq. 9, Wotton et al. 2009) and C-7 forest floor consumption (Eq. 13,
+    FCFDG 1992).
+
+    step: grid resolution (FFMC units)
+    interpolate: linear interpolation between nodes; otherwise the nearest node
+        is used, which is exact for FFMC quantized to `step` (FFMC is usually
+        reported to 0.1)
+
+    `max_error` holds the largest error per term found on a sample of FFMC
+    values, an estimate rather than a guaranteed bound (relative for fF, which spans many orders of magnitude; absolute kg/m^2 for
+    the consumption terms, largest around the C-1 kink at FFMC 84). FFMC
+    outside [0, 101] or NaN is computed exactly.
+    """
+
+    def __init__(self, step: float = 0.1, interpolate: bool = False) -> None:
+        from fbp.core.weather import _fF_formula
+        from fbp.core.consumption import _sfc_c1_formula, _ffc_c7_formula
+
+        self.step = step
+        self.interpolate = interpolate
+        self._formulas = {"fF": _fF_formula, "sfc_c1": _sfc_c1_formula, "ffc_c7": _ffc_c7_formula}
+        with np.errstate(all="ignore"):
+            self.tables = {name: RegularGridTable.from_function(func, (0.,), (101.,), (step,))
+                           for name, func in self._formulas.items()}
+            self.max_error = {name: self._sampled_error(name) for name in self._formulas}
+
+    def _sampled_error(self, name: str) -> float:
+        table, func = self.tables[name], self._formulas[name]
+        if self.interpolate:
+            return float(np.nanmax(table.cell_error(func, relative=name == "fF")))
+        # nearest node: worst case is half a step away
+        x = np.linspace(0, 101, 8 * (table.shape[0] - 1) + 1)
+        exact = func(x)
+        error = np.abs(self._evaluate(name, x) - exact)
+        if name == "fF":
+            error /= np.abs(exact)
+        return float(np.nanmax(error))
+
+    def _evaluate(self, name: str, ffmc: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        ffmc = np.asarray(ffmc, dtype=float)
+        values = self.tables[name].values
+        n = len(values)
+
+        pos = ffmc * (1 / self.step)
+        if pos.size and not (pos.min() >= 0 and pos.max() <= n - 1):
+            # NaN or out of range: exact equations for those cells
+            inside = (pos >= 0) & (pos <= n - 1)
+            if out is None:
+                out = np.empty_like(pos)
+            out[inside] = self._evaluate(name, ffmc[inside])
+            out[~inside] = self._formulas[name](ffmc[~inside])
+            return out
+
+        if not self.interpolate:
+            return values.take(np.rint(pos).astype(np.intp), out=out)
+
+        i = pos.astype(np.intp)
+        np.minimum(i, n - 2, out=i)
+        pos -= i
+        v0 = values.take(i, out=out)
+        pos *= values.take(i + 1) - v0
+        v0 += pos
+        return v0
+
+    def fF(self, ffmc: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        return self._evaluate("fF", ffmc, out=out)
+
+    def sfc_c1(self, ffmc: np.ndarray) -> np.ndarray:
+        return self._evaluate("sfc_c1", ffmc)
+
+    def ffc_c7(self, ffmc: np.ndarray) -> np.ndarray:
+        return self._evaluate("ffc_c7", ffmc)
+
+
+class _FuelSurface:
+    """One function per fuel tabulated on a shared 1-D grid and stacked, so that a
+    mixed fuel map is evaluated with a single gather. NaN for other fuels."""
+
+    def __init__(self, fuels: list[str], table: RegularGridTable) -> None:
+        self.fuels = fuels
+        self.table = table
+        self._index = np.full(256, -1, dtype=np.intp)
+        for i, fuel in enumerate(fuels):
+            self._index[FBP_FUEL_MAP[fuel]] = i
+
+    @classmethod
+    def build(cls, funcs: dict, start: float, stop: float, step: float,
+              tolerance: float, floor: float) -> tuple["_FuelSurface", dict[str, float]]:
+        tables, errors = [], {}
+        for fuel, func in funcs.items():
+            with np.errstate(all="ignore"):
+                table = RegularGridTable.from_function(func, (start,), (stop,), (step,))
+                errors[fuel] = table.restrict_error(func, tolerance, relative=True, floor=floor)
+            tables.append(table)
+        return cls(list(funcs), RegularGridTable.stack(tables)), errors
+
+    def __call__(self, fuel_map: np.ndarray, x: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        index = self._index[np.asarray(fuel_map, dtype=np.intp)]
+        x = np.broadcast_to(np.asarray(x, dtype=float), index.shape)
+        values = self.table(x, index=np.maximum(index, 0))
+        if out is not None:
+            np.copyto(out, values)
+            values = out
+        values[index < 0] = np.nan
+        return values
+
+
+class ResponseSurfaces:
+    """Per-fuel response surfaces of the FBP equations that depend on a single
+    weather index, evaluated by interpolation instead of the exact equations:
+
+    - `rsi`: initial rate of spread (Eq. 26) against ISI for the standard fuels
+      (grass: times the exact curing factor)
+    - `be`: buildup effect (Eq. 54) against BUI
+    - `sfc_bui`/`sfc_ffmc`: surface fuel consumption against BUI, and against
+      FFMC for C-1 and the C-7 forest floor term (C-7 is their sum)
+
+    Cells of a grid whose sampled relative error exceeds `tolerance` (values
+    below `floor` are compared against `floor`) are left to the exact
+    equations, as are mixedwoods, out-of-range and NaN inputs.
+    `max_relative_error` reports the sampled error per surface and fuel (an
+    estimate, see `RegularGridTable.cell_error`); `verify()` measures the error
+    against the `fbp.core` functions on random inputs.
+
+    Surfaces are built on first use and persisted to `cache_dir`
+    (`$WILDFIRE_FBP_CACHE` or `~/.cache/wildfire-fbp`), see `load`.
+    """
+
+    VERSION = 2
+    FLOOR = 1e-3
+
+    def __init__(self, surfaces: dict[str, _FuelSurface], max_relative_error: dict[str, dict[str, float]],
+                 params: dict) -> None:
+        self.surfaces = surfaces
+        self.max_relative_error = max_relative_error
+        self.params = params
+
+    @staticmethod
+    def _functions() -> dict[str, dict]:
+        from fbp.core.ros import _rsi_formula, buildup_effect, BUILTUP_PARAMS
+        from fbp.core.consumption import surface_fuel_consumption, _sfc_c1_formula, _ffc_c7_formula, _wfc_c7_formula
+
+        def code_map(fuel, x):
+            return np.full(x.shape, FBP_FUEL_MAP[fuel])
+
+        rsi = {fuel: (lambda isi, p=params: _rsi_formula(isi, **p))
+               for fuel, params in ROS_PARAMS.items()}
+        be = {fuel: (lambda bui, f=fuel: buildup_effect(code_map(f, bui), bui))
+              for fuel in BUILTUP_PARAMS}
+        sfc_bui = {fuel: (lambda bui, f=fuel: surface_fuel_consumption(code_map(f, bui), bui))
+                   for fuel in ("C2", "C3", "C4", "C5", "C6", "D1", "M3", "M4", "S1", "S2", "S3")}
+        sfc_bui["C7"] = _wfc_c7_formula
+        sfc_ffmc = {"C1": _sfc_c1_formula, "C7": _ffc_c7_formula}
+        return {"rsi": rsi, "be": be, "sfc_bui": sfc_bui, "sfc_ffmc": sfc_ffmc}
+
+    @classmethod
+    def build(cls,
+              isi_step: float = 0.01,
+              max_isi: float = 300.,
+              bui_step: float = 0.1,
+              max_bui: float = 1000.,
+              ffmc_step: float = 0.01,
+              tolerance: float = 1e-4) -> "ResponseSurfaces":
+        params = dict(isi_step=isi_step, max_isi=max_isi, bui_step=bui_step, max_bui=max_bui,
+                      ffmc_step=ffmc_step, tolerance=tolerance)
+        grids = {"rsi": (0., max_isi, isi_step),
+                 "be": (0., max_bui, bui_step),
+                 "sfc_bui": (0., max_bui, bui_step),
+                 "sfc_ffmc": (0., 101., ffmc_step)}
+
+        surfaces, errors = {}, {}
+        for name, funcs in cls._functions().items():
+            surfaces[name], errors[name] = _FuelSurface.build(funcs, *grids[name], tolerance, cls.FLOOR)
+        return cls(surfaces, errors, params)
+
+    @classmethod
+    def load(cls, cache_dir: str | None = None, **params) -> "ResponseSurfaces":
+        """Load the surfaces for `params` (see `build`) from `cache_dir`, building
+        and saving them on first use."""
+        import os
+        import json
+        import hashlib
+        import inspect
+
+        defaults = {k: v.default for k, v in inspect.signature(cls.build).parameters.items() if k != "cls"}
+        params = {**defaults, **params}
+        key = hashlib.sha1(json.dumps([cls.VERSION, params], sort_keys=True).encode()).hexdigest()[:12]
+
+        cache_dir = cache_dir or os.environ.get("WILDFIRE_FBP_CACHE",
+                                                os.path.join(os.path.expanduser("~"), ".cache", "wildfire-fbp"))
+        path = os.path.join(cache_dir, f"response_surfaces_{key}.npz")
+
+        if os.path.exists(path):
+            with np.load(path) as f:
+                meta = json.loads(str(f["meta"]))
+                surfaces = {}
+                for name, info in meta["surfaces"].items():
+                    table = RegularGridTable(info["start"], info["step"], f[f"{name}_values"], f[f"{name}_valid"])
+                    surfaces[name] = _FuelSurface(info["fuels"], table)
+            return cls(surfaces, meta["max_relative_error"], meta["params"])
+
+        surfaces = cls.build(**params)
+        surfaces.save(path)
+        return surfaces
+
+    def save(self, path: str) -> None:
+        import os
+        import json
+        from fbp.utils import atomic_write
+
+        meta = {"params": self.params,
+                "max_relative_error": self.max_relative_error,
+                "surfaces": {name: {"fuels": s.fuels, "start": s.table.start, "step": s.table.step}
+                             for name, s in self.surfaces.items()}}
+        arrays = {}
+        for name, s in self.surfaces.items():
+            arrays[f"{name}_values"] = s.table.values
+            arrays[f"{name}_valid"] = s.table.valid
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        atomic_write(path, lambda f: np.savez(f, meta=json.dumps(meta), **arrays))
+
+    # --- evaluation (same signatures as fbp.core) ---
+    @staticmethod
+    def _fill_exact(out: np.ndarray, exact, fuel_map: np.ndarray, *arrays) -> np.ndarray:
+        """Evaluate `exact` on the packed cells where `out` is NaN (non-fuel excluded)."""
+        missing = np.isnan(out) & (fuel_map != FBP_FUEL_MAP["Non-fuel"])
+        if np.any(missing):
+            packed = [a[missing] if isinstance(a, np.ndarray) and a.shape == out.shape else a for a in arrays]
+            out[missing] = exact(fuel_map[missing], *packed)
+        return out
+
+    def initial_rate_of_spread(self,
+                               fuel_map: np.ndarray,
+                               isi: np.ndarray,
+                               percent_grass_curing_map: np.ndarray | None = None,
+                               percent_conifer_map: np.ndarray | None = None,
+                               percent_dead_fir_map: np.ndarray | None = None,
+                               out: np.ndarray | None = None) -> np.ndarray:
+        from fbp.core.ros import initial_rate_of_spread, _cf_formula
+
+        rsi = self.surfaces["rsi"](fuel_map, isi, out=out)
+        grass = (fuel_map == FBP_FUEL_MAP["O1a"]) | (fuel_map == FBP_FUEL_MAP["O1b"])
+        if np.any(grass):
+            if percent_grass_curing_map is None:
+                raise ValueError(f"percent_grass_curing_map required for O1a & O1b (cells: {np.sum(grass)})")
+            rsi[grass] *= _cf_formula(percent_grass_curing_map[grass])
+
+        return self._fill_exact(rsi, initial_rate_of_spread, fuel_map, isi,
+                                percent_grass_curing_map, percent_conifer_map, percent_dead_fir_map)
+
+    def buildup_effect(self, fuel_map: np.ndarray, bui: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        from fbp.core.ros import buildup_effect
+
+        be = self.surfaces["be"](fuel_map, bui, out=out)
+        return self._fill_exact(be, buildup_effect, fuel_map, bui)
+
+    def surface_fuel_consumption(self,
+                                 fuel_map: np.ndarray,
+                                 bui: np.ndarray,
+                                 ffmc: np.ndarray | None = None,
+                                 percent_conifer_map: np.ndarray | None = None,
+                                 grass_fuel_load: float = 0.3,
+                                 out: np.ndarray | None = None) -> np.ndarray:
+        from fbp.core.consumption import surface_fuel_consumption
+
+        sfc = self.surfaces["sfc_bui"](fuel_map, bui, out=out)
+        ffmc_terms = (fuel_map == FBP_FUEL_MAP["C1"]) | (fuel_map == FBP_FUEL_MAP["C7"])
+        if np.any(ffmc_terms):
+            if ffmc is None:
+                raise ValueError(f"ffmc required for C1 & C7 (cells: {np.sum(ffmc_terms)})")
+            c1 = fuel_map[ffmc_terms] == FBP_FUEL_MAP["C1"]
+            term = self.surfaces["sfc_ffmc"](fuel_map[ffmc_terms], ffmc[ffmc_terms])
+            sfc[ffmc_terms] = np.where(c1, term, sfc[ffmc_terms] + term)
+
+        grass = (fuel_map == FBP_FUEL_MAP["O1a"]) | (fuel_map == FBP_FUEL_MAP["O1b"])
+        sfc[grass] = grass_fuel_load
+
+        sfc = self._fill_exact(sfc, surface_fuel_consumption, fuel_map, bui, ffmc, percent_conifer_map,
+                               grass_fuel_load)
+        sfc[fuel_map == FBP_FUEL_MAP["Non-fuel"]] = 0
+        sfc[sfc <= 0] = 1e-6
+        return sfc
+
+    def verify(self, samples: int = 100000, seed: int = 0) -> dict[str, float]:
+        """Max relative error (values below `FLOOR` compared against it) of every
+        surface against the exact `fbp.core` functions on random inputs."""
+        from fbp.core.ros import initial_rate_of_spread, buildup_effect
+        from fbp.core.consumption import surface_fuel_consumption
+
+        rng = np.random.default_rng(seed)
+        codes = [FBP_FUEL_MAP[f] for f in ROS_PARAMS] + [FBP_FUEL_MAP[f] for f in ("M1", "M2")]
+        fuel_map = rng.choice(codes, size=samples)
+        isi = rng.uniform(0, self.params["max_isi"], samples)
+        bui = rng.uniform(0, self.params["max_bui"], samples)
+        ffmc = rng.uniform(0, 101, samples)
+        pc = rng.uniform(0, 100, samples)
+        gc = rng.uniform(0, 100, samples)
+
+        def rel(a, b):
+            return float(np.nanmax(np.abs(a - b) / np.maximum(np.abs(b), self.FLOOR)))
+
+        with np.errstate(all="ignore"):
+            return {
+                "rsi": rel(self.initial_rate_of_spread(fuel_map, isi, gc, pc),
+                           initial_rate_of_spread(fuel_map, isi, gc, pc)),
+                "be": rel(self.buildup_effect(fuel_map, bui), buildup_effect(fuel_map, bui)),
+                "sfc": rel(self.surface_fuel_consumption(fuel_map, bui, ffmc, pc),
+                           surface_fuel_consumption(fuel_map, bui, ffmc, pc)),
+            }
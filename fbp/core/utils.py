@@ -2,8 +2,33 @@ import numpy as np
 
 from fbp.constants import FBP_FUEL_MAP
 
+# every FBP fuel code fits in a byte
+FUEL_DTYPE = np.uint8
+
+def to_fuel_codes(fuel_map: np.ndarray) -> np.ndarray:
+    """Return `fuel_map` as compact `FUEL_DTYPE` codes (no copy if it already is)."""
+    fuel_map = np.asarray(fuel_map)
+    if fuel_map.dtype == FUEL_DTYPE:
+        return fuel_map
+    info = np.iinfo(FUEL_DTYPE)
+    if fuel_map.size and (fuel_map.min() < info.min or fuel_map.max() > info.max):
+        raise ValueError(f"Fuel codes must be within [{info.min}, {info.max}]")
+    return fuel_map.astype(FUEL_DTYPE)
+
+def full_out(like: np.ndarray, fill_value, dtype=float, out: np.ndarray | None = None) -> np.ndarray:
+    """`np.full_like(like, fill_value, dtype)`, or `out` filled in place."""
+    if out is None:
+        return np.full_like(like, fill_value, dtype=dtype)
+    if out.shape != np.shape(like):
+        raise ValueError(f"out has shape {out.shape}, expected {np.shape(like)}")
+    out.fill(fill_value)
+    return out
+
 def get_fuel_mask(fuel_map: np.ndarray, fuel_types: list[str]) -> np.ndarray:
     fuel_codes = [FBP_FUEL_MAP[f] for f in fuel_types]
+    if fuel_map.dtype == FUEL_DTYPE:
+        lut = np.zeros(np.iinfo(FUEL_DTYPE).max + 1, dtype=bool)
+        lut[fuel_codes] = True
+        return lut[fuel_map]
     mask = np.isin(fuel_map, fuel_codes)
     return mask
-    
@@ -287,21 +287,30 @@ def fire_weather_index(isi: np.ndarray, bui: np.ndarray) -> np.ndarray:
                     bb)
      return fwi
 
-def _fF_formula(ffmc: np.ndarray):
+def daily_severity_rating(fwi: np.ndarray) -> np.ndarray:
+     """Eq. 41, Van Wagner 1987"""
+     return 0.0272 * np.asarray(fwi) ** 1.77
+
+def _fF_formula(ffmc: np.ndarray, out: np.ndarray | None = None):
     FFMC_COEFFICIENT = 250 * 59.5 / 101
     
     """Eq. 46, FCFDG 1992"""
     m = FFMC_COEFFICIENT * (101 - ffmc) / (59.5 + ffmc)
 
     """Eq. 45, FCFDG 1992"""
-    return 91.9 * np.exp(-0.1386 * m) * (1 + (m**5.31) / 4.93e7)
+    fF = np.multiply(91.9, np.exp(-0.1386 * m), out=out)
+    fF *= 1 + (m**5.31) / 4.93e7
+    return fF
 
-def initial_spread_index(ffmc: np.ndarray, ws: np.ndarray) -> np.ndarray:
+def initial_spread_index(ffmc: np.ndarray, ws: np.ndarray, fF: np.ndarray | None = None,
+                         out: np.ndarray | None = None) -> np.ndarray:
     """
         ws: wind speed (km/h)
+        fF: precomputed FFMC function (Eq. 45) of `ffmc`, to share it between calls
     """
 
-    fF = _fF_formula(ffmc)
+    if fF is None:
+        fF = _fF_formula(ffmc)
     
     """Eqs. 53 & 53a, FCFDG 1992: wsv: net effective wind speed"""
     fW = np.where(
@@ -311,5 +320,6 @@ def initial_spread_index(ffmc: np.ndarray, ws: np.ndarray) -> np.ndarray:
     )
 
     """Eq. 52, FCFDG 1992"""
-    isi = 0.208 * fW * fF
-    return isi
\ No newline at end of file
+    isi = np.multiply(fW, fF, out=out)
+    isi *= 0.208
+    return isi
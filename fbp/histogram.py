@@ -0,0 +1,71 @@
+"""Fixed-bin histograms for mergeable, approximate percentiles (used by
+`fbp.zonal` and `fbp.climatology`)."""
+import numpy as np
+
+
+def log_edges(start: float, stop: float, bins_per_decade: int) -> np.ndarray:
+    """0 followed by log-spaced edges from `start` to `stop`."""
+    decades = np.log10(stop / start)
+    return np.concatenate([[0.], np.geomspace(start, stop, int(round(decades * bins_per_decade)) + 1)])
+
+
+class Bins:
+    """Histogram bins on increasing `edges`; values outside go to the first or
+    last bin."""
+
+    def __init__(self, edges: np.ndarray) -> None:
+        self.edges = np.asarray(edges, dtype=float)
+        if self.edges.ndim != 1 or len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("Bin edges must be increasing, with at least 2 edges")
+
+        # 0 followed by log-spaced edges (see `log_edges`): the bin from the logarithm
+        self._log = None
+        if self.edges[0] == 0 and self.edges[1] > 0 and len(self.edges) > 2:
+            steps = np.diff(np.log(self.edges[1:]))
+            if np.allclose(steps, steps[0]):
+                self._log = (np.log(self.edges[1]), steps[0])
+
+    @property
+    def size(self) -> int:
+        return len(self.edges) - 1
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Bins) and np.array_equal(self.edges, other.edges)
+
+    def index(self, values: np.ndarray) -> np.ndarray:
+        """Bin of every (finite) value."""
+        if self._log is not None:
+            log_start, log_step = self._log
+            with np.errstate(divide="ignore", invalid="ignore"):
+                bins = np.floor((np.log(values) - log_start) / log_step)
+            bins += 1
+            # values <= 0 (log -inf or NaN) go to the first bin
+            np.fmax(bins, 0, out=bins)
+            np.minimum(bins, self.size - 1, out=bins)
+            return bins.astype(np.intp)
+        return np.clip(np.searchsorted(self.edges, values, side="right") - 1, 0, self.size - 1)
+
+    def percentile(self, hist: np.ndarray, q: float,
+                   lo: np.ndarray | None = None, hi: np.ndarray | None = None,
+                   block: int = 1 << 16) -> np.ndarray:
+        """Approximate `q`-th percentile of every row of `hist` (rows x bins),
+        interpolated within the bin and clipped to the exact row minimum `lo`
+        and maximum `hi`; NaN for empty rows. Rows are processed in blocks."""
+        out = np.empty(len(hist))
+        for start in range(0, len(hist), block):
+            rows = slice(start, start + block)
+            h = hist[rows]
+            cum = np.cumsum(h, axis=1, dtype=np.int64)
+            total = cum[:, -1]
+            rank = q / 100 * total
+            b = np.minimum((cum < rank[:, None]).sum(axis=1), self.size - 1)
+            r = np.arange(len(h))
+            below = np.where(b > 0, cum[r, np.maximum(b - 1, 0)], 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                frac = np.clip((rank - below) / h[r, b], 0, 1)
+            left, right = self.edges[b], self.edges[b + 1]
+            values = left + frac * (right - left)
+            if lo is not None:
+                values = np.clip(values, lo[rows], hi[rows])
+            out[rows] = np.where(total > 0, values, np.nan)
+        return out
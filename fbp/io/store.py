@@ -0,0 +1,237 @@
+import os
+import json
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+
+from fbp.models.fbp import FBPResults
+from fbp.models.fwi import FWIResults
+from fbp.utils import atomic_write
+
+RESULT_TYPES = {cls.__name__: cls for cls in (FBPResults, FWIResults)}
+
+META_FILE = "meta.json"
+TIMES_DIR = "_times"
+
+
+def _fill_value(dtype: np.dtype):
+    if np.issubdtype(dtype, np.floating):
+        return np.nan
+    if np.issubdtype(dtype, np.str_):
+        return ""
+    return 0
+
+
+class ResultStore:
+    """Chunked, compressed (time x y x x) store for `FWIResults`/`FBPResults`
+    series on the local filesystem.
+
+    Every variable lives in its own directory with one compressed file per
+    chunk, so a pixel time series only touches the chunks covering it.
+    Writers that own disjoint, chunk-aligned windows never share a file and
+    can write concurrently (e.g. one process per tile).
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.kind = meta["kind"]
+        self.shape = tuple(meta["shape"])
+        self.chunks = tuple(meta["chunks"])
+        self.variables = {name: np.dtype(dtype) for name, dtype in meta["variables"].items()}
+
+        self._pending: dict[tuple, np.ndarray] = {}
+        self._written: dict[tuple, set] = {}
+
+    @classmethod
+    def create(cls,
+               path: str,
+               template: FBPResults | FWIResults,
+               chunks: tuple[int, int, int] = (24, 256, 256),
+               shape: tuple[int, int] | None = None,
+               variables: list[str] | None = None) -> "ResultStore":
+        """
+        template: results of one timestep, used for the variable names and dtypes
+        chunks: (time, y, x) chunk size
+        shape: full (height, width) of the store, if the template is a single tile
+        variables: subset of the result fields to keep (default: all)
+        """
+        if not is_dataclass(template) or type(template).__name__ not in RESULT_TYPES:
+            raise ValueError(f"Unsupported results type: {type(template).__name__}")
+
+        names = [f.name for f in fields(template)]
+        if variables is not None:
+            unknown = set(variables) - set(names)
+            if unknown:
+                raise ValueError(f"Unknown variables: {sorted(unknown)}")
+            names = [n for n in names if n in variables]
+
+        arrays = {n: np.asarray(getattr(template, n)) for n in names}
+        if shape is None:
+            shape = arrays[names[0]].shape
+        if len(shape) != 2:
+            raise ValueError(f"Results must be 2-D rasters (got shape {shape})")
+
+        meta = {
+            "kind": type(template).__name__,
+            "shape": list(shape),
+            "chunks": list(chunks),
+            "variables": {n: arr.dtype.str for n, arr in arrays.items()},
+        }
+
+        os.makedirs(os.path.join(path, TIMES_DIR), exist_ok=True)
+        for n in names:
+            os.makedirs(os.path.join(path, n), exist_ok=True)
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        return cls(path)
+
+    # --- time axis ---
+    @property
+    def ntime(self) -> int:
+        times = [int(name) for name in os.listdir(os.path.join(self.path, TIMES_DIR))
+                 if name.isdigit()]
+        return max(times) + 1 if times else 0
+
+    @property
+    def labels(self) -> list[str | None]:
+        labels = []
+        for t in range(self.ntime):
+            marker = os.path.join(self.path, TIMES_DIR, str(t))
+            if os.path.exists(marker):
+                with open(marker) as f:
+                    labels.append(f.read() or None)
+            else:
+                labels.append(None)
+        return labels
+
+    # --- chunk I/O ---
+    def _chunk_path(self, name: str, key: tuple[int, int, int]) -> str:
+        return os.path.join(self.path, name, "{}.{}.{}.npz".format(*key))
+
+    def _chunk_shape(self, key: tuple[int, int, int]) -> tuple[int, int, int]:
+        ct, cy, cx = self.chunks
+        _, iy, ix = key
+        h, w = self.shape
+        return ct, min(cy, h - iy * cy), min(cx, w - ix * cx)
+
+    def _load_chunk(self, name: str, key: tuple[int, int, int]) -> np.ndarray:
+        pending = self._pending.get((name, key))
+        if pending is not None:
+            return pending
+
+        path = self._chunk_path(name, key)
+        if os.path.exists(path):
+            with np.load(path) as f:
+                return f["data"]
+
+        dtype = self.variables[name]
+        return np.full(self._chunk_shape(key), _fill_value(dtype), dtype=dtype)
+
+    def _save_chunk(self, name: str, key: tuple[int, int, int], data: np.ndarray) -> None:
+        atomic_write(self._chunk_path(name, key),
+                      lambda f: np.savez_compressed(f, data=data))
+
+    def flush(self) -> None:
+        for (name, key), data in self._pending.items():
+            self._save_chunk(name, key, data)
+        self._pending.clear()
+        self._written.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- writing ---
+    def write(self,
+              t: int,
+              results: FBPResults | FWIResults,
+              window: tuple[int, int] = (0, 0),
+              label: str | None = None) -> None:
+        """Write one timestep of `results` at `window` = (row_off, col_off).
+
+        The window must start on a chunk boundary and either end on one or
+        at the raster edge. Chunks are buffered until all of their timesteps
+        are written or `flush()` is called.
+        """
+        ct, cy, cx = self.chunks
+        h, w = self.shape
+        row_off, col_off = window
+
+        for name in self.variables:
+            data = np.asarray(getattr(results, name))
+            th, tw = data.shape
+            if (row_off % cy or col_off % cx
+                    or (row_off + th != h and th % cy)
+                    or (col_off + tw != w and tw % cx)
+                    or row_off + th > h or col_off + tw > w):
+                raise ValueError(f"Window {window} with shape {data.shape} is not aligned "
+                                 f"with the store chunks {self.chunks[1:]}")
+
+            tc, tt = divmod(t, ct)
+            for y0 in range(0, th, cy):
+                for x0 in range(0, tw, cx):
+                    key = (tc, (row_off + y0) // cy, (col_off + x0) // cx)
+                    chunk = self._load_chunk(name, key)
+                    if not chunk.flags.writeable:
+                        chunk = chunk.copy()
+                    chunk[tt] = data[y0:y0 + cy, x0:x0 + cx]
+                    self._pending[(name, key)] = chunk
+
+                    written = self._written.setdefault((name, key), set())
+                    written.add(tt)
+                    if len(written) == ct:
+                        self._save_chunk(name, key, chunk)
+                        del self._pending[(name, key)]
+                        del self._written[(name, key)]
+
+        marker = os.path.join(self.path, TIMES_DIR, str(t))
+        atomic_write(marker, lambda f: f.write((label or "").encode()))
+
+    def append(self, results: FBPResults | FWIResults, label: str | None = None) -> int:
+        """Write `results` (full extent) as the next timestep; single writer only."""
+        t = self.ntime
+        self.write(t, results, label=label)
+        return t
+
+    # --- reading ---
+    def read_pixel(self, name: str, row: int, col: int,
+                   start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Time series of `name` at (row, col), reading only the chunks covering it."""
+        ct, cy, cx = self.chunks
+        stop = self.ntime if stop is None else stop
+        if stop <= start:
+            return np.empty(0, dtype=self.variables[name])
+
+        iy, ry = divmod(row, cy)
+        ix, rx = divmod(col, cx)
+        series = [self._load_chunk(name, (tc, iy, ix))[:, ry, rx]
+                  for tc in range(start // ct, (stop - 1) // ct + 1)]
+        offset = (start // ct) * ct
+        return np.concatenate(series)[start - offset:stop - offset]
+
+    def read(self, name: str, t: int) -> np.ndarray:
+        """Full raster of `name` at timestep `t`."""
+        ct, cy, cx = self.chunks
+        h, w = self.shape
+        dtype = self.variables[name]
+        out = np.empty(self.shape, dtype=dtype)
+        tc, tt = divmod(t, ct)
+        for iy in range(-(-h // cy)):
+            for ix in range(-(-w // cx)):
+                out[iy * cy:(iy + 1) * cy, ix * cx:(ix + 1) * cx] = self._load_chunk(name, (tc, iy, ix))[tt]
+        return out
+
+    def read_results(self, t: int) -> FBPResults | FWIResults:
+        """Rebuild the results dataclass of timestep `t` (variables not stored are None)."""
+        cls = RESULT_TYPES[self.kind]
+        return cls(**{f.name: self.read(f.name, t) if f.name in self.variables else None
+                      for f in fields(cls)})
@@ -0,0 +1,289 @@
+"""Landscapes kept on disk as `.npy` files and memory-mapped, so a long-running
+process can evaluate the FBP equations on any set of cells without reading
+the rasters again.
+
+    landscape = Landscape.from_rasters("landscape/", fuel="fuel.tif", slope="slope.tif",
+                                       azimuth="azimuth.tif", percent_conifer=50)
+    rows, cols = landscape.index(x, y)
+    results = landscape.evaluate(rows, cols, {"ffmc": 90, "bui": 60, "wind_speed": 20,
+                                              "wind_azimuth": 270, "date": "2024-07-01"})
+"""
+import os
+import json
+from datetime import date, datetime
+
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.core.utils import FUEL_DTYPE
+from fbp.core.weather import foliar_moisture_content
+from fbp.models.fbp import FBPModel, FBPResults
+from fbp.utils import transform_points
+
+META_FILE = "landscape.json"
+
+# layer: default value
+LAYERS = {
+    "fuel": None,
+    "slope": 0.,
+    "azimuth": 0.,
+    "percent_conifer": 50.,
+    "percent_dead_fir": 0.,
+    "percent_grass_curing": 60.,
+    "crown_base_height": 2.,
+    "elevation": None,
+}
+
+# per-query weather: default value (None: required)
+WEATHER = {
+    "ffmc": None,
+    "bui": None,
+    "wind_speed": None,
+    "wind_azimuth": 0.,
+    "fmc": None,     # or computed from "date" and the cell latitude/longitude
+}
+
+
+class Landscape:
+    """Memory-mapped FBP input layers of one raster grid.
+
+    Each layer is either a constant (stored in the metadata) or a `.npy`
+    file opened with `mmap_mode="r"`: gathering cells only reads the pages
+    holding them. `latitude`/`longitude` of the cell centres are stored when
+    the grid has a CRS, for the foliar moisture content.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.shape = tuple(meta["shape"])
+        self.transform = tuple(meta["transform"])
+        self.crs = meta["crs"]
+        self.layers = {}
+        for name, value in meta["layers"].items():
+            self.layers[name] = np.load(os.path.join(path, value), mmap_mode="r") if isinstance(value, str) else value
+
+        a, b, c, d, e, f = self.transform
+        self._inverse = np.linalg.inv([[a, b], [d, e]])
+
+    @classmethod
+    def create(cls,
+               path: str,
+               fuel: np.ndarray,
+               transform: tuple = (1., 0., 0., 0., -1., 0.),
+               crs: str | None = None,
+               **layers) -> "Landscape":
+        """Write a landscape. `transform` holds the affine coefficients
+        (a, b, c, d, e, f) of the grid, as in `rasterio`; `layers` are arrays
+        of the fuel map shape or constants (see `LAYERS` for the defaults)."""
+        unknown = set(layers) - set(LAYERS)
+        if unknown:
+            raise ValueError(f"Unknown landscape layers {sorted(unknown)}")
+
+        fuel = np.asarray(fuel)
+        os.makedirs(path, exist_ok=True)
+        meta = {"shape": list(fuel.shape), "transform": [float(v) for v in tuple(transform)[:6]],
+                "crs": None if crs is None else str(crs), "layers": {}}
+
+        for name, default in LAYERS.items():
+            value = fuel.astype(FUEL_DTYPE) if name == "fuel" else layers.get(name, default)
+            if value is None:
+                continue
+            if np.ndim(value) == 0:
+                meta["layers"][name] = float(value)
+                continue
+            value = np.asarray(value)
+            if value.shape != fuel.shape:
+                raise ValueError(f"Layer {name} has shape {value.shape}, expected {fuel.shape}")
+            np.save(os.path.join(path, f"{name}.npy"), value)
+            meta["layers"][name] = f"{name}.npy"
+
+        if crs is not None:
+            cls._write_lat_lon(path, meta)
+
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+        return cls(path)
+
+    @staticmethod
+    def _write_lat_lon(path: str, meta: dict, block_rows: int = 256) -> None:
+        from rasterio.crs import CRS
+        from rasterio.warp import transform as warp
+
+        h, w = meta["shape"]
+        a, b, c, d, e, f = meta["transform"]
+        geographic = CRS.from_user_input(meta["crs"]).is_geographic
+        lat = np.lib.format.open_memmap(os.path.join(path, "latitude.npy"), "w+", np.float64, (h, w))
+        lon = np.lib.format.open_memmap(os.path.join(path, "longitude.npy"), "w+", np.float64, (h, w))
+        cols = np.arange(w) + 0.5
+        for row in range(0, h, block_rows):
+            rr, cc = np.meshgrid(np.arange(row, min(row + block_rows, h)) + 0.5, cols, indexing="ij")
+            xs, ys = a * cc + b * rr + c, d * cc + e * rr + f
+            if not geographic:
+                xs, ys = warp(meta["crs"], "EPSG:4326", xs.ravel(), ys.ravel())
+            lon[row:row + rr.shape[0]] = np.reshape(xs, rr.shape)
+            lat[row:row + rr.shape[0]] = np.reshape(ys, rr.shape)
+        lat.flush()
+        lon.flush()
+        meta["layers"].update(latitude="latitude.npy", longitude="longitude.npy")
+
+    @classmethod
+    def from_rasters(cls, path: str, fuel: str, **layers) -> "Landscape":
+        """Write a landscape from GeoTIFFs aligned with the `fuel` raster;
+        `layers` are raster paths or constants."""
+        import rasterio
+
+        with rasterio.open(fuel) as src:
+            fuel_map, transform, crs = src.read(1), src.transform, src.crs
+            if src.nodata is not None:
+                fuel_map[fuel_map == src.nodata] = FBP_FUEL_MAP["Non-fuel"]
+
+        arrays = {}
+        for name, value in layers.items():
+            if isinstance(value, str):
+                with rasterio.open(value) as src:
+                    value = src.read(1)
+            arrays[name] = value
+        return cls.create(path, fuel_map, tuple(transform)[:6], None if crs is None else crs.to_string(), **arrays)
+
+    def __getitem__(self, name: str) -> np.ndarray | float:
+        return self.layers[name]
+
+    # --- cells ---
+    def index(self, x: np.ndarray, y: np.ndarray, crs=None) -> tuple[np.ndarray, np.ndarray]:
+        """Row and column of the cells containing the points (x, y), given in
+        `crs` (default: the landscape CRS); -1 for points outside the grid."""
+        x, y = transform_points(x, y, crs, self.crs)
+        a, b, c, d, e, f = self.transform
+        x, y = x - c, y - f
+        cols = np.floor(self._inverse[0, 0] * x + self._inverse[0, 1] * y).astype(np.intp)
+        rows = np.floor(self._inverse[1, 0] * x + self._inverse[1, 1] * y).astype(np.intp)
+        outside = (rows < 0) | (rows >= self.shape[0]) | (cols < 0) | (cols >= self.shape[1])
+        rows[outside] = -1
+        cols[outside] = -1
+        return rows, cols
+
+    def cells_in_polygon(self, polygon: np.ndarray, max_cells: int | None = None,
+                         block_cells: int = 1 << 20) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and columns of the cells whose centre lies inside `polygon`, an
+        (n, 2) array of (x, y) vertices in the landscape CRS (even-odd rule).
+        The bounding box is tested in strips of about `block_cells` cells;
+        raises a ValueError once more than `max_cells` cells are inside."""
+        polygon = np.asarray(polygon, dtype=float)
+        if polygon.ndim != 2 or polygon.shape[1] != 2 or len(polygon) < 3:
+            raise ValueError("A polygon needs at least 3 (x, y) vertices")
+
+        # candidate cells: the bounding box of the polygon in pixel space
+        a, b, c, d, e, f = self.transform
+        px = self._inverse @ (polygon - [c, f]).T
+        h, w = self.shape
+        c0, c1 = max(int(np.floor(px[0].min())), 0), min(int(np.ceil(px[0].max())), w)
+        r0, r1 = max(int(np.floor(px[1].min())), 0), min(int(np.ceil(px[1].max())), h)
+        if c0 >= c1 or r0 >= r1:
+            return np.empty(0, np.intp), np.empty(0, np.intp)
+
+        selected, count = [], 0
+        strip = max(block_cells // (c1 - c0), 1)
+        for top in range(r0, r1, strip):
+            rows, cols = np.mgrid[top:min(top + strip, r1), c0:c1]
+            rows, cols = rows.ravel(), cols.ravel()
+            x = a * (cols + 0.5) + b * (rows + 0.5) + c
+            y = d * (cols + 0.5) + e * (rows + 0.5) + f
+
+            inside = np.zeros(x.shape, dtype=bool)
+            for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+                crosses = (y1 > y) != (y2 > y)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                inside ^= crosses & (x < x_cross)
+
+            count += np.count_nonzero(inside)
+            if max_cells is not None and count > max_cells:
+                raise ValueError(f"The polygon covers more than {max_cells} cells")
+            selected.append((rows[inside], cols[inside]))
+        return np.concatenate([r for r, _ in selected]), np.concatenate([c for _, c in selected])
+
+    def gather(self, name: str, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        value = self.layers[name]
+        if np.ndim(value) == 0:
+            return np.full(np.shape(rows), value)
+        return np.asarray(value[rows, cols])
+
+    # --- evaluation ---
+    def cell_weather(self, rows: np.ndarray, cols: np.ndarray, weather: dict) -> dict[str, np.ndarray]:
+        """Weather of a query (constants or one value per cell) as per-cell
+        arrays; the FMC is computed from "date" unless "fmc" is given."""
+        def fmc(day):
+            if "latitude" not in self.layers:
+                raise ValueError("The landscape has no CRS: the FMC can't be computed, pass 'fmc'")
+            elevation = self.gather("elevation", rows, cols) if "elevation" in self.layers else None
+            return foliar_moisture_content_on(day, self.gather("latitude", rows, cols),
+                                              self.gather("longitude", rows, cols), elevation)
+        return resolve_weather(weather, np.shape(rows), fmc)
+
+    def evaluate(self, rows: np.ndarray, cols: np.ndarray, weather: dict, **model_options) -> FBPResults:
+        """FBP results of the cells (rows, cols), as 1-D arrays; cells outside
+        the grid (-1) are Non-fuel."""
+        rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+        weather = self.cell_weather(rows, cols, weather)
+        valid = rows >= 0
+        r, c = np.where(valid, rows, 0), np.where(valid, cols, 0)
+
+        fuel = np.where(valid, self.gather("fuel", r, c), FBP_FUEL_MAP["Non-fuel"])
+        layers = {name: self.gather(name, r, c) for name in LAYERS if name not in ("fuel", "elevation")}
+        return evaluate_cells(fuel, weather, layers, **model_options)
+
+
+def foliar_moisture_content_on(day: str | date, latitude: np.ndarray, longitude: np.ndarray,
+                               elevation: np.ndarray | None = None) -> np.ndarray:
+    if isinstance(day, str):
+        day = datetime.fromisoformat(day)
+    return foliar_moisture_content(np.asarray(latitude, dtype=float), np.asarray(longitude, dtype=float),
+                                   day.timetuple().tm_yday, elevation)
+
+
+def resolve_weather(weather: dict, shape: tuple, fmc=None) -> dict[str, np.ndarray]:
+    """Query weather (constants or arrays of `shape`) broadcast to `shape`;
+    `fmc(date)` computes the FMC when only "date" is given."""
+    unknown = set(weather) - set(WEATHER) - {"date"}
+    if unknown:
+        raise ValueError(f"Unknown weather variables {sorted(unknown)}")
+
+    out = {}
+    for name, default in WEATHER.items():
+        value = weather.get(name, default)
+        if value is None and name == "fmc" and weather.get("date") is not None and fmc is not None:
+            value = fmc(weather["date"])
+        if value is None:
+            raise ValueError(f"Weather needs '{name}'" + (" or 'date'" if name == "fmc" else ""))
+        try:
+            out[name] = np.broadcast_to(np.asarray(value, dtype=float), shape)
+        except ValueError:
+            raise ValueError(f"Weather '{name}' has shape {np.shape(value)}, expected {shape}") from None
+    return out
+
+
+def evaluate_cells(fuel: np.ndarray, weather: dict, layers: dict, **model_options) -> FBPResults:
+    """`FBPModel` on 1-D vectors of cells: `weather` as from `resolve_weather`,
+    `layers` per-cell arrays or constants (missing ones take the `LAYERS`
+    defaults)."""
+    fuel = np.asarray(fuel).astype(FUEL_DTYPE)
+    layers = {name: np.full(fuel.shape, float(layers.get(name, default))) if np.ndim(layers.get(name, default)) == 0
+              else np.asarray(layers[name], dtype=float)
+              for name, default in LAYERS.items() if name not in ("fuel", "elevation")}
+    model = FBPModel(fuel,
+                     percent_conifer=layers["percent_conifer"],
+                     slope_percent=layers["slope"],
+                     slope_azimuth=layers["azimuth"],
+                     **model_options)
+    with np.errstate(all="ignore"):
+        return model.run(fine_fuel_moisture_content=np.array(weather["ffmc"]),
+                         builtup_index=np.array(weather["bui"]),
+                         percent_grass_curing=layers["percent_grass_curing"],
+                         percent_dead_fir=layers["percent_dead_fir"],
+                         crown_base_height=layers["crown_base_height"],
+                         wind_speed=np.array(weather["wind_speed"]),
+                         wind_azimuth=np.array(weather["wind_azimuth"]),
+                         folier_moisture_content=np.array(weather["fmc"]))
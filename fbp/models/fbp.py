@@ -1,13 +1,17 @@
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 import numpy as np
 
-from fbp.core.ros import rate_of_spread, initial_rate_of_spread, buildup_effect
+from fbp.core.ros import rate_of_spread, initial_rate_of_spread, buildup_effect, c6_rate_of_spread
 from fbp.core.slope import slope_adjusted_wind_vector
 from fbp.core.consumption import total_fuel_consumption, surface_fuel_consumption, fire_intensity
 from fbp.core.crowning import crown_fraction_burned, classify_fire_type
-from fbp.core.weather import initial_spread_index
+from fbp.core.weather import initial_spread_index, _fF_formula
+from fbp.constants import FBP_FUEL_MAP
+from fbp.core.utils import to_fuel_codes, full_out
+from fbp.core.tables import WSETable, FFMCTable, ResponseSurfaces
+from fbp.profiling import Profiler, profile_run
 
 
 @dataclass
@@ -24,20 +28,117 @@ class FBPResults:
     tfc: np.ndarray
 
 
+class BurnableCells:
+    """The burnable cells of a fuel map (known fuel codes other than Non-fuel,
+    optionally restricted to `mask`) as flat indices, to run the FBP equations
+    on packed 1-D vectors and scatter the results back to rasters."""
+
+    def __init__(self, fuel_map: np.ndarray, mask: np.ndarray | None = None) -> None:
+        fuel_map = to_fuel_codes(fuel_map)
+        burnable = np.zeros(np.iinfo(fuel_map.dtype).max + 1, dtype=bool)
+        burnable[[code for fuel, code in FBP_FUEL_MAP.items() if fuel != "Non-fuel"]] = True
+        burnable = burnable[fuel_map]
+        if mask is not None:
+            burnable &= mask
+        self.shape = fuel_map.shape
+        self.indices = np.flatnonzero(burnable)
+
+    @property
+    def size(self) -> int:
+        return self.indices.size
+
+    def pack(self, values: np.ndarray | float | None,
+             out: np.ndarray | None = None) -> np.ndarray | float | None:
+        """Burnable cells of a raster (into `out` if given, of the raster's
+        dtype); scalars and already packed vectors are returned as is."""
+        if values is None or np.ndim(values) == 0:
+            return values
+        values = np.asarray(values)
+        if values.shape == self.shape:
+            return np.take(values.reshape(-1), self.indices, out=out)
+        if values.shape == (self.size,):
+            return values
+        raise ValueError(f"Expected a raster of shape {self.shape} or {self.size} packed cells, got {values.shape}")
+
+    def unpack(self, values: np.ndarray, fill_value=np.nan) -> np.ndarray:
+        raster = np.full(int(np.prod(self.shape)), fill_value, dtype=values.dtype)
+        raster[self.indices] = values
+        return raster.reshape(self.shape)
+
+
+class FBPWorkspace:
+    """Reusable buffers for `FBPModel.run(..., workspace=...)`: one array per
+    intermediate and result field, allocated on first use and never shared
+    between fields. The results of a run are views of these buffers and are
+    overwritten by the next run with the same workspace."""
+
+    def __init__(self, shape: tuple[int, ...]) -> None:
+        self.shape = tuple(shape)
+        self._buffers: dict[str, np.ndarray] = {}
+
+    def buffer(self, name: str, dtype=float) -> np.ndarray:
+        buf = self._buffers.get(name)
+        if buf is None or buf.dtype != np.dtype(dtype):
+            buf = self._buffers[name] = np.empty(self.shape, dtype=dtype)
+        return buf
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for buf in self._buffers.values())
+
+
 class FBPModel:
     def __init__(self,
                  fuel_map: np.ndarray,
                  percent_conifer: np.ndarray | None = None,
                  slope_percent: np.ndarray | float = 0,
-                 slope_azimuth: np.ndarray | float = 0) -> None:
-        self.fuel_map = fuel_map
-        self.percent_conifer = percent_conifer
-        self.slope_percent = self._to_array(slope_percent)
-        self.slope_azimuth = self._to_array(slope_azimuth)
+                 slope_azimuth: np.ndarray | float = 0,
+                 wse_table: WSETable | None = None,
+                 ffmc_table: FFMCTable | None = None,
+                 response_surfaces: ResponseSurfaces | None = None,
+                 sparse: bool = False,
+                 mask: np.ndarray | None = None) -> None:
+        """
+        wse_table: precomputed slope equivalent wind speeds (`WSETable.build()`)
+            used instead of the zero-wind inversion for the tabulated fuels
+        ffmc_table: lookup of the FFMC-only terms (fF, C1/C7 consumption)
+        response_surfaces: interpolated RSI, BE and SFC (`ResponseSurfaces.load()`)
+        sparse: compute on the burnable cells only (`self.cells`); `run` then
+            takes rasters or packed inputs and returns packed results, see `unpack`
+        mask: cells to compute in sparse mode, in addition to being burnable
+        """
+        if mask is not None and not sparse:
+            raise ValueError("mask is only supported with sparse=True")
+        self.fuel_map = to_fuel_codes(fuel_map)
+        self.cells = BurnableCells(self.fuel_map, mask) if sparse else None
+        # fuel codes of the computed cells: the packed burnable cells in sparse mode
+        self._fuel = self._pack(self.fuel_map)
+        self.wse_table = wse_table
+        self.ffmc_table = ffmc_table
+        self.response_surfaces = response_surfaces
+        self.percent_conifer = self._pack(percent_conifer)
+        self.slope_percent = self._to_array(self._pack(slope_percent))
+        self.slope_azimuth = self._to_array(self._pack(slope_azimuth))
+
+    def _pack(self, values: np.ndarray | float | None,
+              out: np.ndarray | None = None) -> np.ndarray | float | None:
+        return self.cells.pack(values, out) if self.cells is not None else values
 
-    def _to_array(self, attr: np.ndarray | float) -> np.ndarray:
+    def unpack(self, results: FBPResults) -> FBPResults:
+        """Scatter the packed results of a sparse run to rasters (NaN, or "Null"
+        fire type, outside the computed cells)."""
+        if self.cells is None:
+            return results
+        rasters = {}
+        for f in fields(results):
+            values = getattr(results, f.name)
+            fill = {"fuel": FBP_FUEL_MAP["Non-fuel"], "fd": "Null"}.get(f.name, np.nan)
+            rasters[f.name] = self.cells.unpack(values, fill)
+        return FBPResults(**rasters)
+
+    def _to_array(self, attr: np.ndarray | float, out: np.ndarray | None = None) -> np.ndarray:
         if isinstance(attr, (int, float)):
-            return np.full_like(self.fuel_map, attr, dtype=float)
+            return full_out(self._fuel, attr, out=out)
         else:
             return attr
 
@@ -49,67 +150,140 @@ class FBPModel:
             crown_base_height: np.ndarray | float = 2.,
             wind_speed: np.ndarray | float = 0,
             wind_azimuth: np.ndarray | float = 0,
-            folier_moisture_content: np.ndarray | float = 0.) -> FBPResults:
+            folier_moisture_content: np.ndarray | float = 0.,
+            workspace: FBPWorkspace | None = None,
+            profiler: Profiler | None = None) -> FBPResults:
+        """
+        workspace: buffers to compute into instead of allocating new arrays;
+            the returned results are then overwritten by its next use
+        profiler: receives the time (and memory) of every stage, see `fbp.profiling`
+        """
+        if workspace is not None and workspace.shape != self._fuel.shape:
+            raise ValueError(f"Workspace shape {workspace.shape} does not match the fuel map {self._fuel.shape}")
 
-        self._ffmc = fine_fuel_moisture_content
-        self._bui = builtup_index
-        self._fmc = self._to_array(folier_moisture_content)
-        self._cbh = crown_base_height
+        def buffer(name, dtype=float):
+            return workspace.buffer(name, dtype) if workspace is not None else None
 
-        
-        self._percent_dead_fir = self._to_array(percent_dead_fir) if percent_dead_fir is not None else None
-        self._percent_grass_curing = self._to_array(percent_grass_curing) if percent_grass_curing is not None else None
-
-        self._wind_speed = self._to_array(wind_speed)
-        self._wind_azimuth = self._to_array(wind_azimuth)
-
-
-        wsv, raz = slope_adjusted_wind_vector(
-            fuel_map=self.fuel_map,
-            wind_speed=self._wind_speed,
-            wind_azimuth=self._wind_azimuth,
-            slope_percent=self.slope_percent,
-            slope_azimuth=self.slope_azimuth,
-            ffmc=self._ffmc,
-            percent_conifer_map=self.percent_conifer,
-            percent_dead_fir_map=self._percent_dead_fir,
-            percent_grass_curing_map=self._percent_grass_curing
-        )
+        def pack(name, values):
+            # scalars broadcast and rasters packed (sparse mode) into workspace buffers
+            if values is None:
+                return None
+            if np.ndim(values) == 0:
+                return self._to_array(values, buffer(f"input_{name}"))
+            if self.cells is not None and np.shape(values) == self.cells.shape:
+                return self.cells.pack(values, buffer(f"input_{name}", np.asarray(values).dtype))
+            return self._pack(values)
 
-        isi = initial_spread_index(ffmc=self._ffmc, ws=wsv)
-        rsi = initial_rate_of_spread(self.fuel_map, isi, self._percent_grass_curing, self.percent_conifer)
+        with profile_run(profiler, "FBPModel", self._fuel) as stage:
+            with stage("inputs"):
+                self._ffmc = pack("ffmc", fine_fuel_moisture_content)
+                self._bui = pack("bui", builtup_index)
+                self._fmc = pack("fmc", folier_moisture_content)
+                self._cbh = self._pack(crown_base_height)
 
-        be = buildup_effect(self.fuel_map, bui=self._bui)
-        ros = rate_of_spread(rsi, be)
+                self._percent_dead_fir = pack("percent_dead_fir", percent_dead_fir)
+                self._percent_grass_curing = pack("percent_grass_curing", percent_grass_curing)
 
-        sfc = surface_fuel_consumption(
-            fuel_map=self.fuel_map,
-            bui=self._bui,
-            ffmc=self._ffmc,
-            percent_conifer_map=self.percent_conifer
-        )
+                self._wind_speed = pack("wind_speed", wind_speed)
+                self._wind_azimuth = pack("wind_azimuth", wind_azimuth)
 
-        # TODO this need not to be done if there is not conifer fuel
-        cfb = crown_fraction_burned(
-            rate_of_spread=ros,
-            folier_moisture_content=self._fmc,
-            surface_fuel_consumption=sfc,
-            crown_base_height=self._cbh
-        )
+            # fF depends on FFMC only; shared by the slope and ISI calculations
+            with stage("fF"):
+                if self.ffmc_table is not None:
+                    fF = self.ffmc_table.fF(self._ffmc, out=buffer("fF"))
+                else:
+                    fF = _fF_formula(self._ffmc, out=buffer("fF"))
 
-        tfc = total_fuel_consumption(
-            fuel_map=self.fuel_map,
-            surface_fuel_consumption=sfc,
-            crown_fraction_burned=cfb,
-            percent_conifer_map=self.percent_conifer
-        )
+            with stage("slope_adjusted_wind_vector"):
+                wsv, raz = slope_adjusted_wind_vector(
+                    fuel_map=self._fuel,
+                    wind_speed=self._wind_speed,
+                    wind_azimuth=self._wind_azimuth,
+                    slope_percent=self.slope_percent,
+                    slope_azimuth=self.slope_azimuth,
+                    ffmc=self._ffmc,
+                    percent_conifer_map=self.percent_conifer,
+                    percent_dead_fir_map=self._percent_dead_fir,
+                    percent_grass_curing_map=self._percent_grass_curing,
+                    wse_table=self.wse_table,
+                    fF=fF,
+                    out=(buffer("wsv"), buffer("raz")) if workspace is not None else None
+                )
+
+            with stage("initial_spread_index"):
+                isi = initial_spread_index(ffmc=self._ffmc, ws=wsv, fF=fF, out=buffer("isi"))
+
+            if self.response_surfaces is not None:
+                with stage("initial_rate_of_spread"):
+                    rsi = self.response_surfaces.initial_rate_of_spread(
+                        self._fuel, isi, self._percent_grass_curing, self.percent_conifer, self._percent_dead_fir,
+                        out=buffer("rsi"))
+                with stage("buildup_effect"):
+                    be = self.response_surfaces.buildup_effect(self._fuel, bui=self._bui, out=buffer("be"))
+                with stage("surface_fuel_consumption"):
+                    sfc = self.response_surfaces.surface_fuel_consumption(
+                        fuel_map=self._fuel,
+                        bui=self._bui,
+                        ffmc=self._ffmc,
+                        percent_conifer_map=self.percent_conifer,
+                        out=buffer("sfc")
+                    )
+            else:
+                with stage("initial_rate_of_spread"):
+                    rsi = initial_rate_of_spread(self._fuel, isi, self._percent_grass_curing, self.percent_conifer,
+                                                 self._percent_dead_fir, out=buffer("rsi"))
+                with stage("buildup_effect"):
+                    be = buildup_effect(self._fuel, bui=self._bui, out=buffer("be"))
+                with stage("surface_fuel_consumption"):
+                    sfc = surface_fuel_consumption(
+                        fuel_map=self._fuel,
+                        bui=self._bui,
+                        ffmc=self._ffmc,
+                        percent_conifer_map=self.percent_conifer,
+                        ffmc_table=self.ffmc_table,
+                        out=buffer("sfc")
+                    )
+
+            with stage("rate_of_spread"):
+                ros = rate_of_spread(rsi, be, out=buffer("ros"))
+
+            # TODO this need not to be done if there is not conifer fuel
+            with stage("crown_fraction_burned"):
+                cfb = crown_fraction_burned(
+                    rate_of_spread=ros,
+                    folier_moisture_content=self._fmc,
+                    surface_fuel_consumption=sfc,
+                    crown_base_height=self._cbh,
+                    out=buffer("cfb")
+                )
+
+            # --- C6: crown fire spread blended with the surface spread ---
+            c6 = self._fuel == FBP_FUEL_MAP["C6"]
+            if np.any(c6):
+                def take(values):
+                    return values[c6] if np.ndim(values) else values
+                with stage("c6_rate_of_spread"):
+                    ros[c6], cfb[c6] = c6_rate_of_spread(
+                        isi=isi[c6], bui=take(self._bui), fmc=take(self._fmc), sfc=sfc[c6], cbh=take(self._cbh))
+
+            with stage("total_fuel_consumption"):
+                tfc = total_fuel_consumption(
+                    fuel_map=self._fuel,
+                    surface_fuel_consumption=sfc,
+                    crown_fraction_burned=cfb,
+                    percent_conifer_map=self.percent_conifer,
+                    percent_dead_fir_map=self._percent_dead_fir,
+                    out=buffer("tfc")
+                )
 
-        hfi = fire_intensity(fc=tfc, ros=ros)
+            with stage("fire_intensity"):
+                hfi = fire_intensity(fc=tfc, ros=ros, out=buffer("hfi"))
 
-        fd = classify_fire_type(fuel_map=self.fuel_map, cfb=cfb)
+            with stage("classify_fire_type"):
+                fd = classify_fire_type(fuel_map=self._fuel, cfb=cfb, out=buffer("fd", "<U4"))
 
         results = FBPResults(
-            fuel=self.fuel_map,
+            fuel=self._fuel,
             ros=ros,
             wsv=wsv,
             raz=raz,
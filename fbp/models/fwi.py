@@ -1,5 +1,6 @@
 from datetime import datetime
 from dataclasses import dataclass
+from typing import Callable, Iterable
 
 import numpy as np
 
@@ -11,6 +12,7 @@ from fbp.core.weather import (
     fine_fuel_moisture_code, 
     initial_spread_index, 
     fire_weather_index)
+from fbp.profiling import Profiler, profile_run
 
 @dataclass
 class FWIResults:
@@ -39,6 +41,18 @@ class FWIModel:
 
         self.lon_arr, self.lat_arr = np.meshgrid(lon, lat)
         self.elevation = elevation
+
+    @classmethod
+    def from_lat_lon(cls, latitude: np.ndarray, longitude: np.ndarray, elevation=None) -> "FWIModel":
+        """A model on cells with the given latitudes and longitudes (degrees),
+        e.g. the cell centres of a projected raster."""
+        latitude, longitude = np.broadcast_arrays(np.asarray(latitude, dtype=float),
+                                                  np.asarray(longitude, dtype=float))
+        model = cls.__new__(cls)
+        model.shape = latitude.shape
+        model.lat_arr, model.lon_arr = latitude, longitude
+        model.elevation = elevation
+        return model
     
     def _to_array(self, attr: np.ndarray | float) -> np.ndarray:
         if isinstance(attr, (int, float)):
@@ -53,50 +67,62 @@ class FWIModel:
             relative_humidity: float | np.ndarray,
             drought_code_yesterday: float | np.ndarray,
             duff_moisture_code_yesterday: float | np.ndarray,
-            fine_fuel_moisture_code_yesterday: float | np.ndarray
+            fine_fuel_moisture_code_yesterday: float | np.ndarray,
+            profiler: Profiler | None = None
             ) -> FWIResults:
+        """
+        profiler: receives the time (and memory) of every stage, see `fbp.profiling`
+        """
         
-        self._wind_speed = self._to_array(wind_speed)
-        self._temperature = self._to_array(temperature)
-        self._precipitation = self._to_array(precipitation)
-        self._relative_humidity = self._to_array(relative_humidity)
-        self._drought_code_yesterday = self._to_array(drought_code_yesterday)
-        self._duff_moisture_code_yesterday = self._to_array(duff_moisture_code_yesterday) 
-        self._fine_fuel_moisture_code_yesterday = self._to_array(fine_fuel_moisture_code_yesterday)
+        with profile_run(profiler, "FWIModel", shape=self.shape) as stage:
+            with stage("inputs"):
+                self._wind_speed = self._to_array(wind_speed)
+                self._temperature = self._to_array(temperature)
+                self._precipitation = self._to_array(precipitation)
+                self._relative_humidity = self._to_array(relative_humidity)
+                self._drought_code_yesterday = self._to_array(drought_code_yesterday)
+                self._duff_moisture_code_yesterday = self._to_array(duff_moisture_code_yesterday) 
+                self._fine_fuel_moisture_code_yesterday = self._to_array(fine_fuel_moisture_code_yesterday)
 
-        
-        if isinstance(date, str):
-            date = datetime.strptime(date, "%Y-%m-%d")
+            if isinstance(date, str):
+                date = datetime.strptime(date, "%Y-%m-%d")
 
-        doy = date.timetuple().tm_yday
-        fmc = foliar_moisture_content(latitude=self.lat_arr,
-                                longitude=self.lon_arr,
-                                elevation=self.elevation,
-                                day_of_year=doy)
-        
-        dc = drought_code(dc_yesterday=self._drought_code_yesterday,
-                          temp=self._temperature,
-                          prec=self._precipitation,
-                          month=date.month,
-                          latitude=self.lat_arr)
-        
-        dmc = duff_moisture_code(dmc_yesterday=self._duff_moisture_code_yesterday,
-                                 temp=self._temperature,
-                                 prec=self._precipitation,
-                                 rh=self._relative_humidity,
-                                 month=date.month,
-                                 latitude=self.lat_arr)
-        bui = builtup_index(dmc, dc)
+            doy = date.timetuple().tm_yday
+            with stage("foliar_moisture_content"):
+                fmc = foliar_moisture_content(latitude=self.lat_arr,
+                                        longitude=self.lon_arr,
+                                        elevation=self.elevation,
+                                        day_of_year=doy)
+            
+            with stage("drought_code"):
+                dc = drought_code(dc_yesterday=self._drought_code_yesterday,
+                                  temp=self._temperature,
+                                  prec=self._precipitation,
+                                  month=date.month,
+                                  latitude=self.lat_arr)
+            
+            with stage("duff_moisture_code"):
+                dmc = duff_moisture_code(dmc_yesterday=self._duff_moisture_code_yesterday,
+                                         temp=self._temperature,
+                                         prec=self._precipitation,
+                                         rh=self._relative_humidity,
+                                         month=date.month,
+                                         latitude=self.lat_arr)
+            with stage("builtup_index"):
+                bui = builtup_index(dmc, dc)
 
-        ffmc = fine_fuel_moisture_code(ffmc_yesterday=self._fine_fuel_moisture_code_yesterday,
-                                       temp=self._temperature,
-                                       rh=self._relative_humidity,
-                                       ws=self._wind_speed,
-                                       prec=self._precipitation)
-        
-        isi = initial_spread_index(ffmc=ffmc, ws=self._wind_speed)
+            with stage("fine_fuel_moisture_code"):
+                ffmc = fine_fuel_moisture_code(ffmc_yesterday=self._fine_fuel_moisture_code_yesterday,
+                                               temp=self._temperature,
+                                               rh=self._relative_humidity,
+                                               ws=self._wind_speed,
+                                               prec=self._precipitation)
+            
+            with stage("initial_spread_index"):
+                isi = initial_spread_index(ffmc=ffmc, ws=self._wind_speed)
 
-        fwi = fire_weather_index(isi=isi, bui=bui)
+            with stage("fire_weather_index"):
+                fwi = fire_weather_index(isi=isi, bui=bui)
         
         results = FWIResults(fmc=fmc,
                              bui_today=bui,
@@ -105,4 +131,42 @@ class FWIModel:
                              ffmc_today=ffmc,
                              isi_today=isi,
                              fwi_today=fwi)
-        return results
\ No newline at end of file
+        return results
+
+    def run_series(self,
+                   dates: Iterable[str | datetime],
+                   weather: Callable[[datetime], dict] | Iterable[dict],
+                   fine_fuel_moisture_code_start: float | np.ndarray = 85.,
+                   duff_moisture_code_start: float | np.ndarray = 6.,
+                   drought_code_start: float | np.ndarray = 15.,
+                   accumulators: Iterable = (),
+                   profiler: Profiler | None = None
+                   ) -> FWIResults | None:
+        """Run consecutive days, each starting from the codes of the day before,
+        and pass every day's results to the `update` of each accumulator (e.g.
+        `fbp.climatology.ClimatologyAccumulator`); returns the last day's results.
+
+        weather: the wind_speed, temperature, precipitation and relative_humidity
+            of each day, as a function of the date or one dict per date
+        """
+        accumulators = list(accumulators)
+        daily = weather if callable(weather) else iter(weather)
+        ffmc, dmc, dc = fine_fuel_moisture_code_start, duff_moisture_code_start, drought_code_start
+
+        results = None
+        for date in dates:
+            if isinstance(date, str):
+                date = datetime.strptime(date, "%Y-%m-%d")
+            day = daily(date) if callable(daily) else next(daily, None)
+            if day is None:
+                raise ValueError(f"No weather for {date:%Y-%m-%d}")
+            results = self.run(date,
+                               drought_code_yesterday=dc,
+                               duff_moisture_code_yesterday=dmc,
+                               fine_fuel_moisture_code_yesterday=ffmc,
+                               profiler=profiler,
+                               **day)
+            ffmc, dmc, dc = results.ffmc_today, results.dmc_today, results.dc_today
+            for accumulator in accumulators:
+                accumulator.update(results)
+        return results
@@ -0,0 +1,154 @@
+"""Read, compute and write timesteps in overlapping stages.
+
+    stats = run_pipeline(hours, read=read_weather, compute=run_hour, write=write_hour)
+
+While step t computes on the calling thread, a reader thread prefetches the
+inputs of the next steps and a writer thread writes the outputs of the
+previous ones. Queues of `prefetch` and `write_behind` items bound the memory
+held ahead and behind: a slow writer stalls the compute stage instead of
+piling up outputs. NumPy, rasterio and zlib release the GIL in their heavy
+calls, so the stages run concurrently and the wall time approaches that of the
+slowest stage.
+
+Outputs are written after the next step started computing: `compute` must not
+return arrays it reuses (e.g. an `FBPWorkspace` shared across steps).
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from fbp.models.fbp import FBPModel, FBPResults
+
+_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    steps: int
+    read_seconds: float     # time spent in each stage, summed over the steps
+    compute_seconds: float
+    write_seconds: float
+    wall_seconds: float
+
+
+class _Failed:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put `item`, waiting for room unless the pipeline stops."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.05)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def run_pipeline(steps: Iterable,
+                 read: Callable[[Any], Any],
+                 compute: Callable[[Any, Any], Any],
+                 write: Callable[[Any, Any], None],
+                 prefetch: int = 2,
+                 write_behind: int = 2) -> PipelineStats:
+    """Run `write(step, compute(step, read(step)))` for every step in order,
+    with `read` and `write` on their own threads. The first error of any stage
+    stops the pipeline and is raised here.
+
+    prefetch: inputs read ahead of the step computing
+    write_behind: outputs waiting to be written
+    """
+    if prefetch < 1 or write_behind < 1:
+        raise ValueError("prefetch and write_behind must be at least 1")
+
+    inputs = queue.Queue(maxsize=prefetch)
+    outputs = queue.Queue(maxsize=write_behind)
+    stop = threading.Event()
+    seconds = {"read": 0., "write": 0.}
+    errors = []
+
+    def reader():
+        try:
+            for step in steps:
+                start = time.perf_counter()
+                item = (step, read(step))
+                seconds["read"] += time.perf_counter() - start
+                if not _put(inputs, item, stop):
+                    return
+        except BaseException as e:
+            _put(inputs, _Failed(e), stop)
+            return
+        _put(inputs, _DONE, stop)
+
+    def writer():
+        while True:
+            item = outputs.get()
+            if item is _DONE:
+                return
+            try:
+                start = time.perf_counter()
+                write(*item)
+                seconds["write"] += time.perf_counter() - start
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                return
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=writer, daemon=True)]
+    wall = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    done, compute_seconds = 0, 0.
+    try:
+        while not stop.is_set():
+            try:
+                item = inputs.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            if isinstance(item, _Failed):
+                raise item.error
+            step, data = item
+            start = time.perf_counter()
+            results = compute(step, data)
+            compute_seconds += time.perf_counter() - start
+            if not _put(outputs, (step, results), stop):
+                break
+            done += 1
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        # the writer drains the queued outputs, unless it failed
+        while threads[1].is_alive():
+            try:
+                outputs.put(_DONE, timeout=0.05)
+                break
+            except queue.Full:
+                pass
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return PipelineStats(done, seconds["read"], compute_seconds, seconds["write"], time.perf_counter() - wall)
+
+
+def run_fbp_series(model: FBPModel,
+                   steps: Iterable,
+                   read_weather: Callable[[Any], dict],
+                   write: Callable[[Any, FBPResults], None],
+                   prefetch: int = 2,
+                   write_behind: int = 2) -> PipelineStats:
+    """`model.run` over `steps` (e.g. forecast hours) with the weather of the
+    next steps prefetched and the results of the previous ones written in the
+    background. `read_weather(step)` returns the `FBPModel.run` arguments."""
+    return run_pipeline(steps, read_weather, lambda step, weather: model.run(**weather), write,
+                        prefetch=prefetch, write_behind=write_behind)
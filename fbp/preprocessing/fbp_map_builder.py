@@ -1,57 +1,194 @@
-from typing import Self
+import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Self, TYPE_CHECKING
 
 import numpy as np
-from skimage import measure, morphology
 
 from fbp.constants import FBP_FUEL_MAP
+from fbp.core.utils import FUEL_DTYPE
+from fbp.utils import bounded_map
+
+if TYPE_CHECKING:
+    from rasterio.windows import Window
 
 DECIDUOUS_FUEL_CODES = [code for fuel, code in FBP_FUEL_MAP.items() if fuel.startswith("D")]
 CONIFER_FUEL_CODES = [code for fuel, code in FBP_FUEL_MAP.items() if fuel.startswith("C")]
+FUEL_CODES = sorted(set(FBP_FUEL_MAP.values()))
+
+# nodata of tiled fuel outputs: blocks without any vegetation (background only)
+FUEL_NODATA = 255
+
+
+def _block_histogram(layer: np.ndarray,
+                     kernel: int,
+                     codes: np.ndarray | list,
+                     mask: np.ndarray | None = None,
+                     band_size: int = 2**20) -> np.ndarray:
+    """Count every value of `codes` in each (kernel x kernel) block of `layer`.
+
+    Returns an array of shape (ceil(H/k), ceil(W/k), len(codes)); cells outside
+    `mask` or with a value not in `codes` are not counted. The raster is scanned
+    once, in bands of whole block rows (about `band_size` cells each) so the
+    temporary keys stay small.
+    """
+    codes = np.asarray(codes)
+    n = len(codes)
+    h, w = layer.shape
+    bh, bw = -(-h // kernel), -(-w // kernel)
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    col_block = (np.arange(w) // kernel) * n
+
+    counts = np.empty((bh, bw, n), dtype=np.uint32)
+    band_blocks = max(1, band_size // (kernel * max(w, 1)))
+    for b0 in range(0, bh, band_blocks):
+        b1 = min(b0 + band_blocks, bh)
+        band = layer[b0 * kernel:b1 * kernel]
+
+        pos = np.minimum(np.searchsorted(sorted_codes, band), n - 1)
+        valid = sorted_codes[pos] == band
+        if mask is not None:
+            valid &= mask[b0 * kernel:b1 * kernel]
+
+        row_block = (np.arange(band.shape[0]) // kernel)[:, None] * (bw * n)
+        keys = (row_block + col_block + order[pos])[valid]
+        counts[b0:b1] = np.bincount(keys, minlength=(b1 - b0) * bw * n).reshape(b1 - b0, bw, n)
+
+    return counts
+
+def _lookup(layer: np.ndarray,
+            keys: np.ndarray,
+            values: np.ndarray,
+            default=0,
+            max_dense_size: int = 2**20) -> np.ndarray:
+    """Map every cell of `layer` from `keys` to `values` (`default` if absent).
+
+    Small non-negative integer code spaces use a dense table and a single
+    gather; anything else falls back to a sorted-key (searchsorted) lookup.
+    """
+    keys = np.asarray(keys)
+    values = np.asarray(values)
+
+    if np.issubdtype(layer.dtype, np.integer) and (keys.size == 0 or keys.min() >= 0):
+        if layer.dtype.itemsize <= 2 and np.issubdtype(layer.dtype, np.unsignedinteger):
+            low, high = 0, np.iinfo(layer.dtype).max
+        else:
+            low, high = int(layer.min()), int(layer.max())
+        high = max(high, int(keys.max()) if keys.size else 0)
+        if low >= 0 and high < max_dense_size:
+            lut = np.full(high + 1, default, dtype=values.dtype)
+            lut[keys] = values
+            return lut[layer]
+
+    if keys.size == 0:
+        return np.full(layer.shape, default, dtype=values.dtype)
+
+    order = np.argsort(keys)
+    sorted_keys, sorted_values = keys[order], values[order]
+    pos = np.minimum(np.searchsorted(sorted_keys, layer), len(keys) - 1)
+    return np.where(sorted_keys[pos] == layer, sorted_values[pos], default)
+
+def _compile_crosswalk(mapping: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Vegetation codes and their (n_vegetation, n_fuel_codes) fuel weights.
+
+    A mapping value is either an FBP fuel type ("C2") or a weighted split
+    ({"C2": 0.6, "D1": 0.4}); weights are normalized to sum to one.
+    """
+    veg_codes = np.array(list(mapping.keys()))
+    weights = np.zeros((len(mapping), len(FUEL_CODES)), dtype=float)
+    for i, fuel in enumerate(mapping.values()):
+        if isinstance(fuel, str):
+            fuel = {fuel: 1.0}
+        total = sum(fuel.values())
+        if total <= 0:
+            raise ValueError(f"Crosswalk weights must sum to a positive value (got {fuel})")
+        for fuel_type, weight in fuel.items():
+            weights[i, FUEL_CODES.index(FBP_FUEL_MAP[fuel_type])] += weight / total
+    return veg_codes, weights
+
+def _histogram_majority(counts: np.ndarray, codes: np.ndarray | list, fill=0) -> np.ndarray:
+    """Most frequent code per block (ties go to the smallest code, empty blocks to `fill`)."""
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind="stable")
+    counts = counts[..., order]
+    majority = codes[order][np.argmax(counts, axis=-1)]
+    return np.where(counts.sum(axis=-1) > 0, majority, fill)
 
 class FuelMapBuilder:
-    def __init__(self, vegetation_map: np.ndarray, kernel=10, background_index=0) -> None:
+    def __init__(self, vegetation_map: np.ndarray, kernel=10, background_index=0, keep_masks=False) -> None:
+        """
+        vegetation_map: read-only; it is referenced, not copied
+        keep_masks: keep full-resolution intermediate masks (`fuel_mask`) as attributes
+        """
         self.kernel = kernel
         self.background_index = background_index
         
-        self.vegetation_map = vegetation_map.copy()
+        self.vegetation_map = vegetation_map
 
-        self.fuel_mask = (self.vegetation_map != background_index)
+        fuel_mask = (self.vegetation_map != background_index)
+        if keep_masks:
+            self.fuel_mask = fuel_mask
         
         """NRCan FBP Fuel Layer 2018 (pp. 1)"""
-        self.fuel_layer = self._reduce_mean(self.fuel_mask) >= 0.6
+        fuel_fraction = self._reduce_mean(fuel_mask)
+        self.fuel_layer = fuel_fraction >= 0.6
+        self.background_layer = fuel_fraction == 0
+        del fuel_mask
 
-        self.fbp_fuel_layer = np.zeros_like(self.fuel_layer, dtype=int)
+        self.fbp_fuel_layer = np.zeros_like(self.fuel_layer, dtype=FUEL_DTYPE)
+        self.block_histogram = None
+        self.crosswalk = None
 
    
     def map_vegetation_to_fuel(self, mapping: dict) -> Self:
-        self.fuel_map = np.zeros_like(self.vegetation_map, dtype=int)
-        for veg_code, fuel_code in mapping.items():
-            self.fuel_map[self.vegetation_map == veg_code] = FBP_FUEL_MAP[fuel_code]    
+        """
+        mapping: vegetation code -> FBP fuel type, or -> {fuel type: weight} for
+        classes that split over several fuels. The cell-level `fuel_map` takes the
+        heaviest fuel; block statistics use the full weights.
+        """
+        veg_codes, weights = _compile_crosswalk(mapping)
+        dominant = np.asarray(FUEL_CODES, dtype=FUEL_DTYPE)[np.argmax(weights, axis=1)]
+        self.fuel_map = _lookup(self.vegetation_map, veg_codes, dominant, default=FBP_FUEL_MAP["Non-fuel"])
+        self.crosswalk = (veg_codes, weights)
+        self.block_histogram = None
+        return self
+
+    def compute_block_histogram(self) -> Self:
+        """Counts of every FBP fuel code per output block, from a single pass over
+        the fuel map; all block layers below are derived from it."""
+        veg_codes, weights = self.crosswalk if self.crosswalk is not None else (None, None)
+        if weights is not None and np.any((weights > 0) & (weights < 1)):
+            # weighted crosswalk: vegetation class counts spread over their fuels
+            veg_counts = _block_histogram(self.vegetation_map, self.kernel, veg_codes)
+            self.block_histogram = veg_counts @ weights
+            unmapped = self._block_sizes() - veg_counts.sum(axis=-1)
+            self.block_histogram[..., FUEL_CODES.index(FBP_FUEL_MAP["Non-fuel"])] += unmapped
+        else:
+            self.block_histogram = _block_histogram(self.fuel_map, self.kernel, FUEL_CODES)
         return self
 
     def compute_crown_closure(self, threshold=0.10) -> Self:
         """NRCan FBP Fuel Layer 2018 (pp. 1): forest vs. open thershold = 0.10"""
-        cc = np.isin(self.fuel_map, DECIDUOUS_FUEL_CODES + CONIFER_FUEL_CODES)
-        self.crown_closure_mask = cc
-        self.forest_layer = self._reduce_mean(cc) >= threshold
+        self.crown_closure_layer = self._block_count(DECIDUOUS_FUEL_CODES + CONIFER_FUEL_CODES) / self.kernel**2
+        self.forest_layer = self.crown_closure_layer >= threshold
         return self
     
     def compute_deciduous(self, threshold=0.75) -> Self:
         """NRCan FBP Fuel Layer 2018 (pp. 1): deciduous vs. conifer thershold = 0.75"""
-        dec_mask = np.isin(self.fuel_map, DECIDUOUS_FUEL_CODES)
-        deciduous_ratio_layer = self._reduce_sum(dec_mask) / (self._reduce_sum(self.crown_closure_mask) + 1e-8)
+        deciduous_ratio_layer = self._block_count(DECIDUOUS_FUEL_CODES) / (self._crown_count() + 1e-8)
         deciduous_layer = deciduous_ratio_layer >= threshold
-        self.fbp_fuel_layer[deciduous_layer] = self._reduce_majority(self.fuel_map[dec_mask])
+        self.fbp_fuel_layer[deciduous_layer] = self._block_majority(DECIDUOUS_FUEL_CODES)[deciduous_layer]
         self.deciduous_ratio_layer = deciduous_ratio_layer
         self.deciduous_layer = deciduous_layer
         return self
     
     def compute_conifer(self, threshold=0.75) -> Self:
         """NRCan FBP Fuel Layer 2018 (pp. 1): deciduous vs. conifer thershold = 0.75"""
-        conf_mask = np.isin(self.fuel_map, CONIFER_FUEL_CODES)
-        conifer_ratio_layer = self._reduce_sum(conf_mask) / (self._reduce_sum(self.crown_closure_mask) + 1e-8)
+        conifer_ratio_layer = self._block_count(CONIFER_FUEL_CODES) / (self._crown_count() + 1e-8)
         conifer_layer = conifer_ratio_layer >= threshold
-        self.fbp_fuel_layer[conifer_layer] = self._reduce_majority(self.fuel_map[conf_mask])
+        self.fbp_fuel_layer[conifer_layer] = self._block_majority(CONIFER_FUEL_CODES)[conifer_layer]
         self.conifer_ratio_layer = conifer_ratio_layer
         self.conifer_layer = conifer_layer
         return self
@@ -68,28 +205,71 @@ class FuelMapBuilder:
         self.open_stand = open_mask
         return self
 
+    def compute_percent_conifer(self) -> Self:
+        """FBP percent conifer (PC) per block: conifer share of the crown closure
+        cells (0 where a block has no crown), aligned with `fbp_fuel_layer`."""
+        crown = self._crown_count()
+        conifer = self._block_count(CONIFER_FUEL_CODES)
+        pc = np.divide(100. * conifer, crown, out=np.zeros(crown.shape), where=crown > 0)
+        self.percent_conifer_layer = pc.astype(np.float32)
+        return self
+
+    def compute_percent_dead_fir(self,
+                                 vegetation_codes: list | None = None,
+                                 hook: Callable[["FuelMapBuilder"], np.ndarray] | None = None) -> Self:
+        """FBP percent dead fir (PDF) per block, aligned with `fbp_fuel_layer`.
+
+        vegetation_codes: vegetation classes that denote dead balsam fir; PDF is
+            their share of the crown closure cells
+        hook: custom estimator called with the builder (e.g. from insect survey
+            layers); must return an array with the shape of `fbp_fuel_layer`
+        Without either, PDF is 0.
+        """
+        if hook is not None:
+            pdf = np.asarray(hook(self), dtype=float)
+            if pdf.shape != self.fbp_fuel_layer.shape:
+                raise ValueError(f"Percent dead fir hook returned shape {pdf.shape}, "
+                                 f"expected {self.fbp_fuel_layer.shape}")
+        elif vegetation_codes:
+            crown = self._crown_count()
+            dead_fir = _block_histogram(self.vegetation_map, self.kernel, vegetation_codes).sum(axis=-1)
+            pdf = np.divide(100. * dead_fir, crown, out=np.zeros(crown.shape), where=crown > 0)
+            pdf = np.minimum(pdf, 100.)
+        else:
+            pdf = np.zeros(self.fbp_fuel_layer.shape)
+        self.percent_dead_fir_layer = pdf.astype(np.float32)
+        return self
+
+    def _block_sizes(self) -> np.ndarray:
+        """Number of raster cells in each block (smaller along the right/bottom edges)."""
+        h, w = self.vegetation_map.shape
+        k = self.kernel
+        rows = np.minimum(k, h - np.arange(0, h, k))
+        cols = np.minimum(k, w - np.arange(0, w, k))
+        return np.outer(rows, cols)
+
+    def _histogram_columns(self, codes: list) -> np.ndarray:
+        if self.block_histogram is None:
+            self.compute_block_histogram()
+        return self.block_histogram[..., [FUEL_CODES.index(c) for c in codes]]
+
+    def _block_count(self, codes: list) -> np.ndarray:
+        return self._histogram_columns(codes).sum(axis=-1)
+
+    def _crown_count(self) -> np.ndarray:
+        return self._block_count(DECIDUOUS_FUEL_CODES + CONIFER_FUEL_CODES)
+
+    def _block_majority(self, codes: list) -> np.ndarray:
+        return _histogram_majority(self._histogram_columns(codes), codes)
    
     def _reduce_mean(self, layer: np.ndarray) -> np.ndarray:
-        return measure.block_reduce(
-            layer, block_size=self.kernel, func=np.mean
-        )
-    
-    def _reduce_sum(self, layer: np.ndarray) -> np.ndarray:
-        return measure.block_reduce(
-            layer, block_size=self.kernel, func=np.sum
-        )
-
-    def _reduce_majority(self, layer: np.ndarray) -> np.ndarray:
-        def majority_func(arr, axis=None):
-            if arr.size == 0:
-                return 0
-            values, counts = np.unique(arr, return_counts=True)
-            mode = values[np.argmax(counts)]
-            return mode
-
-        return measure.block_reduce(
-            layer, block_size=self.kernel, func=majority_func
-        )
+        """Block mean of a boolean layer (cells beyond the raster edge count as False)."""
+        return _block_histogram(layer, self.kernel, [True])[..., 0] / self.kernel**2
+
+    def _reduce_majority(self, layer: np.ndarray, codes: list, mask: np.ndarray | None = None) -> np.ndarray:
+        """Block mode of `layer` restricted to `codes` (and `mask`); 0 where a block has none."""
+        counts = _block_histogram(layer, self.kernel, codes, mask)
+        return _histogram_majority(counts, codes)
         
     # def close_standing_vegetation(self, radius=10) -> Self:
     #     self.standing_map = morphology.closing(self.standing_map, morphology.disk(radius))
@@ -102,5 +282,122 @@ class FuelMapBuilder:
        
     def get_fbp_fuel_layer(self) -> np.ndarray:
         return self.fbp_fuel_layer
-    
 
+    def build(self,
+              mapping: dict,
+              crown_closure_threshold=0.10,
+              deciduous_threshold=0.75,
+              conifer_threshold=0.75,
+              mixedwood_kind="M1",
+              open_stand_kind="O1a") -> np.ndarray:
+        """Run the full crown closure/deciduous/conifer/mixedwood/open-stand chain."""
+        return (self.map_vegetation_to_fuel(mapping)
+                .compute_crown_closure(crown_closure_threshold)
+                .compute_deciduous(deciduous_threshold)
+                .compute_conifer(conifer_threshold)
+                .compute_mixedwood(mixedwood_kind)
+                .compute_open_stands(open_stand_kind)
+                .get_fbp_fuel_layer())
+
+
+def _build_window(src_path: str,
+                  window: "Window",
+                  kernel: int,
+                  background_index,
+                  mapping: dict,
+                  options: dict,
+                  outputs: tuple[str, ...],
+                  dead_fir_codes: list | None) -> dict[str, np.ndarray]:
+    import rasterio
+
+    with rasterio.open(src_path) as src:
+        vegetation = src.read(1, window=window)
+
+    builder = FuelMapBuilder(vegetation, kernel, background_index)
+    layers = {"fuel": builder.build(mapping, **options)}
+    if "percent_conifer" in outputs:
+        layers["percent_conifer"] = builder.compute_percent_conifer().percent_conifer_layer
+    if "percent_dead_fir" in outputs:
+        layers["percent_dead_fir"] = builder.compute_percent_dead_fir(dead_fir_codes).percent_dead_fir_layer
+
+    background = builder.background_layer
+    if np.any(background):
+        layers = {name: np.where(background, FUEL_NODATA if name == "fuel" else np.nan, layer)
+                  .astype(np.uint8 if name == "fuel" else np.float32)
+                  for name, layer in layers.items()}
+    return layers
+
+
+def build_fuel_layer_tiled(src_path: str,
+                           dst_path: str,
+                           mapping: dict,
+                           kernel: int = 10,
+                           background_index=0,
+                           window_size: int = 4096,
+                           workers: int = 1,
+                           percent_conifer_path: str | None = None,
+                           percent_dead_fir_path: str | None = None,
+                           dead_fir_codes: list | None = None,
+                           **options) -> None:
+    """Stream a vegetation GeoTIFF into a coarse FBP fuel GeoTIFF.
+
+    The vegetation raster is read in windows of about `window_size` cells
+    (rounded down to a multiple of `kernel`, so no block straddles two windows),
+    each window runs `FuelMapBuilder.build` (in a process pool if `workers` > 1,
+    with at most 2 x `workers` windows in flight) and its `fbp_fuel_layer` is
+    written straight to `dst_path`. The output is identical to building the
+    whole raster at once, except that blocks holding only `background_index`
+    cells are nodata: `FUEL_NODATA` in the fuel output, NaN in the others.
+
+    percent_conifer_path, percent_dead_fir_path: optional aligned float32 outputs
+        computed from the same block statistics (see `compute_percent_conifer`
+        and `compute_percent_dead_fir`; `dead_fir_codes` are vegetation codes)
+    options: keyword arguments of `FuelMapBuilder.build`
+    """
+    import rasterio
+    from rasterio.windows import Window
+
+    step = max(kernel, window_size // kernel * kernel)
+
+    with rasterio.open(src_path) as src:
+        height, width = src.height, src.width
+        profile = {
+            "driver": "GTiff",
+            "dtype": "uint8",
+            "count": 1,
+            "height": math.ceil(height / kernel),
+            "width": math.ceil(width / kernel),
+            "crs": src.crs,
+            "transform": src.transform * rasterio.Affine.scale(kernel),
+            "tiled": True,
+            "compress": "deflate",
+            "nodata": FUEL_NODATA,
+        }
+
+    paths = {"fuel": dst_path,
+             "percent_conifer": percent_conifer_path,
+             "percent_dead_fir": percent_dead_fir_path}
+    paths = {name: path for name, path in paths.items() if path is not None}
+
+    windows = [Window(col, row, min(step, width - col), min(step, height - row))
+               for row in range(0, height, step)
+               for col in range(0, width, step)]
+    n = len(windows)
+    args = ([src_path] * n, windows, [kernel] * n, [background_index] * n,
+            [mapping] * n, [options] * n, [tuple(paths)] * n, [dead_fir_codes] * n)
+
+    float_profile = {**profile, "dtype": "float32", "nodata": np.nan}
+    with ExitStack() as stack:
+        dsts = {name: stack.enter_context(rasterio.open(path, "w", **(profile if name == "fuel" else float_profile)))
+                for name, path in paths.items()}
+
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = bounded_map(executor, _build_window, *args, max_pending=2 * workers)
+        else:
+            results = map(_build_window, *args)
+
+        for window, layers in zip(windows, results):
+            for name, layer in layers.items():
+                dsts[name].write(layer, 1, window=Window(window.col_off // kernel, window.row_off // kernel,
+                                                         layer.shape[1], layer.shape[0]))
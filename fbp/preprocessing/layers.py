@@ -1,10 +1,10 @@
 from typing import Any, Dict, Union
 
 import numpy as np
-import rasterio
-from rasterio.coords import BoundingBox
-from rasterio.transform import from_bounds
-from rasterio.warp import reproject, Resampling, calculate_default_transform
+
+from fbp.utils import transform_points
+
+# rasterio is imported where it is used, so that Layer is cheap to import
 
 class Layer:
     def __init__(self, data: np.ndarray, meta: dict) -> None:
@@ -33,8 +33,43 @@ class Layer:
     def shape(self):
         return self.data.shape
 
+    def index(self, x, y, crs=None) -> tuple[np.ndarray, np.ndarray]:
+        """Row and column of the cells containing the points (x, y), given in
+        `crs` (default: the layer CRS); -1 for points outside the layer."""
+        x, y = transform_points(x, y, crs, self.meta.get("crs"))
+        a, b, c, d, e, f = tuple(self.meta["transform"])[:6]
+        det = a * e - b * d
+        x, y = x - c, y - f
+        cols = np.floor((e * x - b * y) / det).astype(np.intp)
+        rows = np.floor((a * y - d * x) / det).astype(np.intp)
+        h, w = self.shape[-2:]
+        outside = (rows < 0) | (rows >= h) | (cols < 0) | (cols >= w)
+        rows[outside] = -1
+        cols[outside] = -1
+        return rows, cols
+
+    def sample(self, x, y, crs=None, fill_value=np.nan) -> np.ndarray:
+        """Values of the (first band of the) layer at the points (x, y), with
+        `fill_value` outside the layer and on nodata cells."""
+        return self.read_cells(*self.index(x, y, crs), fill_value=fill_value)
+
+    def read_cells(self, rows: np.ndarray, cols: np.ndarray, fill_value=np.nan) -> np.ndarray:
+        """Values of the (first band of the) layer at the cells (rows, cols) as
+        returned by `index`."""
+        data = self.data if self.data.ndim == 2 else self.data[0]
+        outside = rows < 0
+        values = data[np.where(outside, 0, rows), np.where(outside, 0, cols)]
+        nodata = self.meta.get("nodata")
+        invalid = outside if nodata is None else outside | (values == nodata)
+        if np.any(invalid):
+            values = np.where(invalid, fill_value, values)
+        return values
+
 
     def reproject(self, dst_crs, method):
+        from rasterio.coords import BoundingBox
+        from rasterio.warp import reproject, Resampling, calculate_default_transform
+
         method_map = {
             "bilinear": Resampling.bilinear,
             "nearest": Resampling.nearest
@@ -91,6 +126,9 @@ class Layer:
         print(f"Layer reprojected from {src_crs} to {dst_crs}.")
 
     def resize(self, shape, method):
+        from rasterio.transform import from_bounds
+        from rasterio.warp import reproject, Resampling
+
         method_map = {
             "bilinear": Resampling.bilinear,
             "nearest": Resampling.nearest
@@ -138,6 +176,8 @@ class Layer:
         print(f"Layer resized from ({src_height}, {src_width}) to ({dst_height}, {dst_width})")
         
     def save(self, path):
+        import rasterio
+
         if path.lower().endswith(("tiff", "tif")):
             with rasterio.open(path, "w", **self.meta) as dst:
                 dst.write(self._data)
@@ -153,6 +193,7 @@ class Layer:
     
 class GeoTiffLayer(Layer):
     def __init__(self, path: str) -> None:
+        import rasterio
 
         with rasterio.open(path) as src:
             data = src.read()
@@ -167,6 +208,8 @@ class GeoTiffLayer(Layer):
 
 class ChildLayer(Layer):
     def __init__(self, data: np.ndarray, parent: Layer) -> None:
+        from rasterio.transform import from_bounds
+
         meta = parent.meta.copy()
         bounds = meta["bounds"]
         
@@ -188,4 +231,4 @@ class ChildLayer(Layer):
             "width": width,
         })
 
-        super().__init__(data=data, meta=meta)
\ No newline at end of file
+        super().__init__(data=data, meta=meta)
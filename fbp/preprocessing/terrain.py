@@ -0,0 +1,148 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from fbp.preprocessing.layers import Layer, ChildLayer
+from fbp.utils import bounded_map
+
+if TYPE_CHECKING:
+    from rasterio.windows import Window
+
+
+def _horn_gradient(padded: np.ndarray, dx: float, dy: float) -> tuple[np.ndarray, np.ndarray]:
+    """Horn (1981) 3x3 finite differences on a DEM padded with a one-cell halo.
+    Returns dz/dx (eastwards) and dz/dy (southwards, i.e. along the rows)."""
+    a, b, c = padded[:-2, :-2], padded[:-2, 1:-1], padded[:-2, 2:]
+    d, f = padded[1:-1, :-2], padded[1:-1, 2:]
+    g, h, i = padded[2:, :-2], padded[2:, 1:-1], padded[2:, 2:]
+
+    dzdx = ((c + 2 * f + i) - (a + 2 * d + g)) / (8 * dx)
+    dzdy = ((g + 2 * h + i) - (a + 2 * b + c)) / (8 * dy)
+    return dzdx, dzdy
+
+def _mask_nodata(dem: np.ndarray, nodata: float | None) -> np.ndarray:
+    """The DEM as floats with its nodata cells (edges, voids) set to NaN."""
+    dem = dem.astype(float, copy=False)
+    if nodata is None or np.isnan(nodata):
+        return dem
+    return np.where(dem == nodata, np.nan, dem)
+
+def _slope_aspect_padded(padded: np.ndarray, dx: float, dy: float) -> tuple[np.ndarray, np.ndarray]:
+    dzdx, dzdy = _horn_gradient(padded, dx, dy)
+
+    slope_percent = 100 * np.hypot(dzdx, dzdy)
+
+    # azimuth (clockwise from north) of the steepest descent; 0 on flat ground
+    aspect = np.degrees(np.arctan2(-dzdx, dzdy)) % 360
+    aspect[slope_percent == 0] = 0
+    return slope_percent.astype(np.float32), aspect.astype(np.float32)
+
+def slope_aspect(dem: np.ndarray, dx: float, dy: float, nodata: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    dem: elevation (m) on a projected grid
+    dx, dy: cell width and height (m)
+    nodata: DEM nodata value; the slope and aspect are NaN wherever the 3x3
+        neighbourhood of a cell holds nodata
+
+    Returns slope (%) and aspect, the downslope azimuth (degrees clockwise from
+    north, as in `notebooks/sample/aspect.tif`). `FBPModel` expects the upslope
+    direction as `slope_azimuth`, see `upslope_azimuth`.
+    """
+    dem = _mask_nodata(dem, nodata)
+    return _slope_aspect_padded(np.pad(dem, 1, mode="reflect", reflect_type="odd"), dx, dy)
+
+def upslope_azimuth(aspect: np.ndarray) -> np.ndarray:
+    """FBP slope azimuth (direction up the slope) from the downslope aspect."""
+    return (aspect + 180) % 360
+
+def _cell_size(meta: dict) -> tuple[float, float]:
+    crs = meta.get("crs")
+    if crs is not None and getattr(crs, "is_geographic", False):
+        raise ValueError("DEM must be in a projected CRS (cell size in metres); reproject it first")
+    transform = meta["transform"]
+    return abs(transform.a), abs(transform.e)
+
+def terrain_layers(dem: Layer) -> tuple[ChildLayer, ChildLayer]:
+    """Slope (%) and FBP slope azimuth (upslope, degrees) layers of a DEM `Layer`."""
+    dx, dy = _cell_size(dem.meta)
+    slope_percent, aspect = slope_aspect(dem.data, dx, dy, dem.meta.get("nodata"))
+    return ChildLayer(slope_percent, dem), ChildLayer(upslope_azimuth(aspect), dem)
+
+
+def _terrain_window(src_path: str, window: "Window", upslope: bool) -> tuple[np.ndarray, np.ndarray]:
+    import rasterio
+    from rasterio.windows import Window
+
+    with rasterio.open(src_path) as src:
+        height, width = src.height, src.width
+        dx, dy = _cell_size(src.meta)
+
+        # read the window with a one-cell halo; extrapolate linearly only at the raster border
+        row0, col0 = max(window.row_off - 1, 0), max(window.col_off - 1, 0)
+        row1 = min(window.row_off + window.height + 1, height)
+        col1 = min(window.col_off + window.width + 1, width)
+        dem = _mask_nodata(src.read(1, window=Window(col0, row0, col1 - col0, row1 - row0)), src.nodata)
+
+    pad = ((window.row_off - row0 == 0, window.row_off + window.height == height),
+           (window.col_off - col0 == 0, window.col_off + window.width == width))
+    padded = np.pad(dem, [(int(top), int(bottom)) for top, bottom in pad], mode="reflect", reflect_type="odd")
+
+    slope_percent, aspect = _slope_aspect_padded(padded, dx, dy)
+    if upslope:
+        aspect = upslope_azimuth(aspect)
+    return slope_percent, aspect
+
+
+def terrain_tiled(src_path: str,
+                  slope_path: str,
+                  azimuth_path: str,
+                  tile_size: int = 2048,
+                  workers: int = 1,
+                  upslope: bool = True) -> None:
+    """Stream a DEM GeoTIFF into slope (%) and azimuth GeoTIFFs.
+
+    Tiles are read with a one-cell halo, so the result is identical to
+    `slope_aspect` on the whole DEM; tiles run in a process pool if
+    `workers` > 1. Cells next to DEM nodata are written as NaN nodata.
+
+    upslope: write the FBP slope azimuth (upslope) instead of the aspect
+    """
+    import rasterio
+    from rasterio.windows import Window
+
+    with rasterio.open(src_path) as src:
+        height, width = src.height, src.width
+        profile = {
+            "driver": "GTiff",
+            "dtype": "float32",
+            "count": 1,
+            "height": height,
+            "width": width,
+            "crs": src.crs,
+            "transform": src.transform,
+            "tiled": True,
+            "compress": "deflate",
+            "nodata": np.nan,
+        }
+
+    windows = [Window(col, row, min(tile_size, width - col), min(tile_size, height - row))
+               for row in range(0, height, tile_size)
+               for col in range(0, width, tile_size)]
+    n = len(windows)
+
+    with ExitStack() as stack:
+        slope_dst = stack.enter_context(rasterio.open(slope_path, "w", **profile))
+        azimuth_dst = stack.enter_context(rasterio.open(azimuth_path, "w", **profile))
+
+        if workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            results = bounded_map(executor, _terrain_window, [src_path] * n, windows, [upslope] * n,
+                                  max_pending=2 * workers)
+        else:
+            results = map(_terrain_window, [src_path] * n, windows, [upslope] * n)
+
+        for window, (slope_percent, azimuth) in zip(windows, results):
+            slope_dst.write(slope_percent, 1, window=window)
+            azimuth_dst.write(azimuth, 1, window=window)
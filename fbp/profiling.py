@@ -0,0 +1,140 @@
+"""Per-stage instrumentation of `FBPModel.run` and `FWIModel.run`.
+
+    profiler = Profiler(JSONLinesReporter("fbp_profile.jsonl"), trace_memory=True)
+    results = model.run(..., profiler=profiler)
+
+Every stage of a run is reported to the callback as a `StageRecord`, followed
+by a "run" record for the whole call. Without a profiler the models only enter
+a shared no-op context per stage.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict, field
+from typing import Callable, IO
+
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+
+_NULL_STAGE = nullcontext()
+
+
+def _null_stage(name: str):
+    return _NULL_STAGE
+
+
+@dataclass
+class StageRecord:
+    model: str
+    stage: str
+    seconds: float
+    allocated_bytes: int | None     # peak traced allocation during the stage (trace_memory)
+    cells: dict[str, int] = field(default_factory=dict)     # cells per fuel type (or "all")
+
+
+def fuel_cell_counts(fuel_map: np.ndarray) -> dict[str, int]:
+    counts = np.bincount(np.asarray(fuel_map, dtype=np.intp).ravel())
+    names = {code: fuel for fuel, code in FBP_FUEL_MAP.items()}
+    return {names.get(code, f"code {code}"): int(n) for code, n in enumerate(counts) if n}
+
+
+class Profiler:
+    """Collects the `StageRecord`s of instrumented runs in `records` and passes
+    each one to `callback`. With `trace_memory`, allocations are measured with
+    `tracemalloc` (started for the duration of a run if it is not already
+    tracing), which slows the numpy calls down noticeably."""
+
+    def __init__(self,
+                 callback: Callable[[StageRecord], None] | None = None,
+                 trace_memory: bool = False) -> None:
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records: list[StageRecord] = []
+        self._model = None
+        self._cells = {}
+        self._peak = 0
+
+    def record(self, record: StageRecord) -> None:
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            allocated = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                allocated = max(peak - start, 0)
+                self._peak = max(self._peak, peak)
+            self.record(StageRecord(self._model, name, seconds, allocated, self._cells))
+
+    @contextmanager
+    def run(self, model: str, cells: dict[str, int]):
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        self._model, self._cells = model, cells
+        start = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        self._peak = start
+        t0 = time.perf_counter()
+        try:
+            yield self.stage
+        finally:
+            seconds = time.perf_counter() - t0
+            allocated = self._peak - start if self.trace_memory else None
+            if started:
+                tracemalloc.stop()
+            self.record(StageRecord(model, "run", seconds, allocated, cells))
+
+    def summary(self) -> dict[str, float]:
+        """Total seconds per model stage over the recorded runs."""
+        totals = {}
+        for r in self.records:
+            key = f"{r.model}.{r.stage}"
+            totals[key] = totals.get(key, 0.) + r.seconds
+        return totals
+
+
+def profile_run(profiler: Profiler | None, model: str, fuel_map: np.ndarray | None = None,
+                shape: tuple[int, ...] | None = None):
+    """Context of one instrumented run, yielding the `stage(name)` context
+    factory (a no-op without a profiler)."""
+    if profiler is None:
+        return nullcontext(_null_stage)
+    if fuel_map is not None:
+        cells = fuel_cell_counts(fuel_map)
+    else:
+        cells = {"all": int(np.prod(shape))}
+    return profiler.run(model, cells)
+
+
+class JSONLinesReporter:
+    """Profiler callback writing one JSON object per stage record."""
+
+    def __init__(self, file: str | IO[str]) -> None:
+        self._own = isinstance(file, str)
+        self._file = open(file, "a") if self._own else file
+
+    def __call__(self, record: StageRecord) -> None:
+        self._file.write(json.dumps(asdict(record)) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._own:
+            self._file.close()
+
+    def __enter__(self) -> "JSONLinesReporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,86 @@
+"""FBP results at points, without running the model over whole rasters.
+
+    results = sample_fbp(x, y, fuel_layer, {"ffmc": ffmc_layer, "bui": 60, "wind_speed": ws,
+                                            "date": "2024-07-01"},
+                         crs="EPSG:4326", slope=slope_layer, percent_conifer=50)
+
+The points are transformed to each grid's CRS in one batched call and mapped
+to cells with the grid transform; only those cells are read and evaluated.
+"""
+import numpy as np
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.landscape import LAYERS, Landscape, resolve_weather, evaluate_cells, foliar_moisture_content_on
+from fbp.models.fbp import FBPResults
+from fbp.preprocessing.layers import Layer
+from fbp.utils import to_lat_lon
+
+
+class _Points:
+    """Points in `crs`, sampled on layers; the cells are looked up once per grid."""
+
+    def __init__(self, x, y, crs) -> None:
+        self.x, self.y = np.atleast_1d(np.asarray(x, dtype=float)), np.atleast_1d(np.asarray(y, dtype=float))
+        if self.x.shape != self.y.shape:
+            raise ValueError(f"x and y have different shapes {self.x.shape} and {self.y.shape}")
+        self.crs = crs
+        self._cells = {}
+
+    def cells(self, layer: Layer) -> tuple[np.ndarray, np.ndarray]:
+        meta = layer.meta
+        key = (tuple(meta["transform"])[:6], str(meta.get("crs")), layer.shape[-2:])
+        if key not in self._cells:
+            self._cells[key] = layer.index(self.x, self.y, self.crs)
+        return self._cells[key]
+
+    def sample(self, value, fill_value=np.nan):
+        """A layer sampled at the points; constants and arrays are returned as is."""
+        if not isinstance(value, Layer):
+            return value
+        return value.read_cells(*self.cells(value), fill_value=fill_value)
+
+    def lat_lon(self) -> tuple[np.ndarray, np.ndarray]:
+        if self.crs is None:
+            raise ValueError("The points have no CRS: the FMC can't be computed, pass 'fmc'")
+        lon, lat = to_lat_lon(self.x, self.y, self.crs)
+        return lat, lon
+
+
+def sample_fbp(x, y,
+               fuel: Layer | Landscape,
+               weather: dict,
+               crs=None,
+               **layers) -> FBPResults:
+    """FBP results at the points (x, y), given in `crs` (default: the CRS of
+    `fuel`), as 1-D arrays; points outside the fuel grid are Non-fuel.
+
+    fuel: a fuel code `Layer`, or a `Landscape` holding all input layers
+    weather: "ffmc", "bui", "wind_speed", "wind_azimuth" and "fmc" (or "date")
+        as constants, arrays with one value per point or `Layer`s
+    layers: the other inputs of `fbp.landscape.LAYERS` ("slope",
+        "percent_conifer", ...) as constants, per-point arrays or `Layer`s
+        (ignored for a `Landscape`)
+    """
+    if crs is None:
+        # the other layers may be on another grid: resolve the fuel CRS before sampling them
+        crs = fuel.crs if isinstance(fuel, Landscape) else fuel.meta.get("crs")
+    points = _Points(x, y, crs)
+    weather = {name: points.sample(value) for name, value in weather.items()}
+
+    if isinstance(fuel, Landscape):
+        rows, cols = fuel.index(points.x, points.y, crs)
+        return fuel.evaluate(rows, cols, weather)
+
+    unknown = set(layers) - set(LAYERS)
+    if unknown:
+        raise ValueError(f"Unknown layers {sorted(unknown)}")
+
+    fuel_codes = points.sample(fuel, fill_value=FBP_FUEL_MAP["Non-fuel"])
+    layers = {name: points.sample(value) for name, value in layers.items()}
+
+    def fmc(day):
+        lat, lon = points.lat_lon()
+        return foliar_moisture_content_on(day, lat, lon, layers.get("elevation"))
+
+    weather = resolve_weather(weather, points.x.shape, fmc)
+    return evaluate_cells(fuel_codes, weather, layers)
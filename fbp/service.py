@@ -0,0 +1,179 @@
+"""A local HTTP service answering FBP queries on a resident `Landscape`.
+
+    fbp serve landscape/ --port 8080
+
+    POST /point    {"x": [...], "y": [...], "crs": "EPSG:4326", "weather": {...}, "variables": ["ros", "hfi"]}
+    POST /polygon  {"polygon": [[x, y], ...], "weather": {...}, "variables": [...]}
+    GET  /health
+
+Points are given in "crs" (default: the landscape CRS), polygons in the
+landscape CRS; the weather values are constants or one value per point (see
+`fbp.landscape.WEATHER`). Responses hold the row, column and the requested
+variables of every cell (null outside the grid).
+
+Concurrent queries are coalesced by a `QueryBatcher`: the cells of all
+queries waiting within `max_wait` seconds are evaluated in one vectorized
+`Landscape.evaluate` call.
+"""
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import fields
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+
+from fbp.landscape import Landscape
+from fbp.models.fbp import FBPResults
+
+DEFAULT_VARIABLES = ("fuel", "ros", "hfi", "cfb", "sfc", "tfc", "fd")
+
+
+class QueryBatcher:
+    """Evaluates queued (rows, cols, weather) queries in batches on a worker
+    thread; `submit` returns a future of the query's `FBPResults`."""
+
+    def __init__(self, landscape: Landscape, max_wait: float = 0.002, max_cells: int = 1_000_000) -> None:
+        self.landscape = landscape
+        self.max_wait = max_wait
+        self.max_cells = max_cells
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, rows: np.ndarray, cols: np.ndarray, weather: dict) -> Future:
+        rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+        # validated here, so a bad query fails alone instead of failing its batch
+        cell_weather = self.landscape.cell_weather(rows, cols, weather)
+        future = Future()
+        self._queue.put((rows, cols, cell_weather, future))
+        return future
+
+    def evaluate(self, rows: np.ndarray, cols: np.ndarray, weather: dict) -> FBPResults:
+        return self.submit(rows, cols, weather).result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch, cells = [item], item[0].size
+            while cells < self.max_cells:
+                try:
+                    item = self._queue.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+                cells += item[0].size
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        self.batches += 1
+        try:
+            rows = np.concatenate([b[0] for b in batch])
+            cols = np.concatenate([b[1] for b in batch])
+            weather = {name: np.concatenate([b[2][name] for b in batch]) for name in batch[0][2]}
+            results = self.landscape.evaluate(rows, cols, weather)
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+
+        offsets = np.cumsum([0] + [b[0].size for b in batch])
+        for (*_, future), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+            future.set_result(FBPResults(**{f.name: getattr(results, f.name)[start:stop]
+                                            for f in fields(FBPResults)}))
+
+
+def _to_json(values: np.ndarray, valid: np.ndarray) -> list:
+    if values.dtype.kind == "f":
+        return [float(v) if ok and np.isfinite(v) else None for v, ok in zip(values, valid)]
+    return [v.item() if ok else None for v, ok in zip(values, valid)]
+
+
+def respond(rows: np.ndarray, cols: np.ndarray, results: FBPResults, variables) -> dict:
+    valid = rows >= 0
+    out = {"row": rows.tolist(), "col": cols.tolist()}
+    for name in variables:
+        out[name] = _to_json(np.asarray(getattr(results, name)), valid)
+    return out
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    batcher: QueryBatcher       # set by `make_server`
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            return self._send(404, {"error": f"Unknown path {self.path}"})
+        landscape = self.batcher.landscape
+        self._send(200, {"status": "ok", "shape": list(landscape.shape), "crs": landscape.crs,
+                         "batches": self.batcher.batches})
+
+    def do_POST(self) -> None:
+        try:
+            query = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            landscape = self.batcher.landscape
+            if self.path == "/point":
+                rows, cols = landscape.index(np.atleast_1d(query["x"]), np.atleast_1d(query["y"]),
+                                             query.get("crs"))
+            elif self.path == "/polygon":
+                rows, cols = landscape.cells_in_polygon(query["polygon"], max_cells=self.batcher.max_cells)
+            else:
+                return self._send(404, {"error": f"Unknown path {self.path}"})
+
+            variables = query.get("variables", DEFAULT_VARIABLES)
+            unknown = set(variables) - {f.name for f in fields(FBPResults)}
+            if unknown:
+                raise ValueError(f"Unknown variables {sorted(unknown)}")
+            results = self.batcher.evaluate(rows, cols, query.get("weather", {}))
+        except (KeyError, ValueError, TypeError) as e:
+            return self._send(400, {"error": str(e) if not isinstance(e, KeyError) else f"Missing {e}"})
+        except Exception as e:
+            # e.g. a MemoryError: answer instead of dropping the connection
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        self._send(200, respond(rows, cols, results, variables))
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def make_server(landscape: Landscape | str, host: str = "127.0.0.1", port: int = 8080,
+                **batch_options) -> ThreadingHTTPServer:
+    """A `ThreadingHTTPServer` (not started) answering queries on `landscape`;
+    `server.batcher.close()` after `server.shutdown()`."""
+    if isinstance(landscape, str):
+        landscape = Landscape(landscape)
+    batcher = QueryBatcher(landscape, **batch_options)
+    handler = type("Handler", (QueryHandler,), {"batcher": batcher})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.batcher = batcher
+    return server
+
+
+def serve(landscape: Landscape | str, host: str = "127.0.0.1", port: int = 8080, **batch_options) -> None:
+    server = make_server(landscape, host, port, **batch_options)
+    print(f"Serving {server.batcher.landscape.path} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
@@ -1,5 +1,8 @@
+import os
+import tempfile
+from collections import deque
+
 import numpy as np
-from rasterio.warp import transform
 
 from fbp.constants import FBP_FUEL_DESC
 
@@ -15,13 +18,63 @@ def make_grid(extent, shape):
     return X, Y
 
 
-def to_lat_lon(easting: float, northing: float, src_crs: str):
-    lons, lats = transform(src_crs, "EPSG:4326", [easting], [northing])
-    return lons[0], lats[0]
+def atomic_write(path: str, write) -> None:
+    """Write to a temporary file next to `path` and move it into place, so
+    readers never observe a partially written file. `write` is called with the
+    file opened in binary mode."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def bounded_map(executor, func, *iterables, max_pending: int):
+    """`executor.map(func, *iterables)` that submits a call only once fewer
+    than `max_pending` results are waiting to be consumed, so the results of
+    a slow consumer do not pile up in memory. Yields results in order."""
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
+def transform_points(x, y, src_crs, dst_crs) -> tuple[np.ndarray, np.ndarray]:
+    """Transform arrays of coordinates between CRSs in one batched call (a
+    no-op when the CRSs are equal)."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if src_crs is None or dst_crs is None or _same_crs(src_crs, dst_crs):
+        return x, y
+
+    from rasterio.warp import transform
+
+    xs, ys = transform(src_crs, dst_crs, x.ravel(), y.ravel())
+    return np.reshape(xs, x.shape), np.reshape(ys, y.shape)
+
+
+def _same_crs(a, b) -> bool:
+    from rasterio.crs import CRS
+
+    return CRS.from_user_input(a) == CRS.from_user_input(b)
+
+
+def to_lat_lon(easting, northing, src_crs: str):
+    """Longitude and latitude of one point, or of arrays of points."""
+    lons, lats = transform_points(easting, northing, src_crs, "EPSG:4326")
+    if lons.ndim == 0:
+        return float(lons), float(lats)
+    return lons, lats
 
 
 def describe_fbp_fuel_types():
     print("="*50)
     for fuel, desc in FBP_FUEL_DESC.items():
         print(f"{fuel:>5} : {desc:<50}")
-    print("="*50)
\ No newline at end of file
+    print("="*50)
@@ -1,9 +1,11 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
 from .models.fbp import FBPResults
+from .core.utils import to_fuel_codes
 
 def plot_fire_intensity(results: FBPResults, extent=None):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     im = ax.imshow(results.hfi, cmap="Wistia", extent=extent)
     ax.set_title("Head Fire Intensity (kW/m)")
@@ -11,6 +13,8 @@ def plot_fire_intensity(results: FBPResults, extent=None):
     plt.show()
 
 def plot_rate_of_spread(results: FBPResults, extent=None):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     im = ax.imshow(results.ros, cmap="Wistia", extent=extent)
     ax.set_title("Rate of Spread (m/min)")
@@ -18,6 +22,8 @@ def plot_rate_of_spread(results: FBPResults, extent=None):
     plt.show()
 
 def plot_fuel_consumption(results: FBPResults, extent=None):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     im = ax.imshow(results.tfc, cmap="Wistia", extent=extent)
     ax.set_title(r"Total Fuel Consumption (kg/m$^2$)")
@@ -25,6 +31,7 @@ def plot_fuel_consumption(results: FBPResults, extent=None):
     plt.show()
 
 def plot_fuel_map(fuel_map: np.ndarray, extent=None):
+    import matplotlib.pyplot as plt
     from matplotlib.colors import ListedColormap, BoundaryNorm
     from .constants import FBP_FUEL_COLOR, FBP_FUEL_MAP, FBP_FUEL_DESC
 
@@ -32,10 +39,9 @@ def plot_fuel_map(fuel_map: np.ndarray, extent=None):
 
     FUEL_ID_TO_CODE = {c: f for f, c in FBP_FUEL_MAP.items()}
     
-    fuel_map = fuel_map.copy()
-    classes = np.unique(fuel_map)
-    class_to_idx = {c: i for i, c in enumerate(classes)}
-    vectorized_map = np.vectorize(class_to_idx.get)(fuel_map)
+    fuel_map = to_fuel_codes(fuel_map)
+    classes = np.flatnonzero(np.bincount(fuel_map.ravel(), minlength=256))
+    vectorized_map = np.searchsorted(classes, fuel_map)
 
     norm = BoundaryNorm(boundaries=np.arange(len(classes)+1)-0.5, ncolors=len(classes))
 
@@ -49,6 +55,7 @@ def plot_fuel_map(fuel_map: np.ndarray, extent=None):
     plt.show()
 
 def plot_fire_description(results: FBPResults, extent=None):
+    import matplotlib.pyplot as plt
     from matplotlib.colors import ListedColormap, BoundaryNorm
 
     COLOR_MAP = {"S": (255/255, 255/255, 0),
@@ -75,4 +82,4 @@ def plot_fire_description(results: FBPResults, extent=None):
     cbar.ax.set_yticklabels([f"{val_to_class[c]}" for c in classes])
 
     ax.set_title("Fire Class")
-    plt.show()
\ No newline at end of file
+    plt.show()
@@ -0,0 +1,162 @@
+"""xarray entry points for the FBP and FWI models.
+
+    import fbp.xr
+
+    ds = fbp.xr.fbp(fuel, ffmc=forecast.ffmc, bui=forecast.bui, wind_speed=forecast.ws,
+                    wind_azimuth=forecast.wd, percent_conifer=50., fmc=100.)
+    fwi = fbp.xr.fwi_series(forecast.temp, forecast.rh, forecast.ws, forecast.prec)
+
+Inputs are DataArrays (or constants) broadcast against each other by
+dimension name; outputs are Datasets with the broadcast dims and coords, one
+variable per `FBPResults`/`FWIResults` field. Dask-backed inputs stay lazy:
+the models run chunk by chunk with `xarray.apply_ufunc(dask="parallelized")`
+(`fwi_series` chunks over space only, since every day depends on the day
+before).
+"""
+from dataclasses import fields
+
+import numpy as np
+
+try:
+    import xarray as xr
+except ImportError as e:
+    raise ImportError("fbp.xr needs xarray (pip install wildfire-fbp[xarray])") from e
+
+from fbp.models.fbp import FBPModel, FBPResults
+from fbp.models.fwi import FWIModel, FWIResults
+
+FBP_DTYPES = {"fuel": np.uint8, "fd": "<U4"}
+
+
+def _fbp_block(fuel, ffmc, bui, wind_speed, wind_azimuth, percent_conifer, slope, azimuth,
+               percent_grass_curing, percent_dead_fir, crown_base_height, fmc,
+               variables=None, model_options=None):
+    arrays = np.broadcast_arrays(fuel, ffmc, bui, wind_speed, wind_azimuth, percent_conifer, slope, azimuth,
+                                 percent_grass_curing, percent_dead_fir, crown_base_height, fmc)
+    (fuel, ffmc, bui, wind_speed, wind_azimuth, percent_conifer, slope, azimuth,
+     percent_grass_curing, percent_dead_fir, crown_base_height, fmc) = [np.array(a) for a in arrays]
+
+    model = FBPModel(fuel, percent_conifer=percent_conifer, slope_percent=slope, slope_azimuth=azimuth,
+                     **model_options)
+    with np.errstate(all="ignore"):
+        results = model.run(fine_fuel_moisture_content=ffmc, builtup_index=bui,
+                            percent_grass_curing=percent_grass_curing, percent_dead_fir=percent_dead_fir,
+                            crown_base_height=crown_base_height, wind_speed=wind_speed,
+                            wind_azimuth=wind_azimuth, folier_moisture_content=fmc)
+    return tuple(np.asarray(getattr(results, name)) for name in variables)
+
+
+def fbp(fuel: xr.DataArray,
+        ffmc: xr.DataArray | float,
+        bui: xr.DataArray | float,
+        wind_speed: xr.DataArray | float = 0.,
+        wind_azimuth: xr.DataArray | float = 0.,
+        percent_conifer: xr.DataArray | float = 50.,
+        slope: xr.DataArray | float = 0.,
+        azimuth: xr.DataArray | float = 0.,
+        percent_grass_curing: xr.DataArray | float = 60.,
+        percent_dead_fir: xr.DataArray | float = 0.,
+        crown_base_height: xr.DataArray | float = 2.,
+        fmc: xr.DataArray | float = 100.,
+        variables: list[str] | None = None,
+        **model_options) -> xr.Dataset:
+    """`FBPModel` on DataArrays: e.g. a (y, x) fuel map with (time, y, x)
+    weather gives (time, y, x) results. `model_options` go to `FBPModel`
+    (`wse_table`, `ffmc_table`, `response_surfaces`)."""
+    variables = list(variables or [f.name for f in fields(FBPResults)])
+    unknown = set(variables) - {f.name for f in fields(FBPResults)}
+    if unknown:
+        raise ValueError(f"Unknown FBP variables {sorted(unknown)}")
+
+    args = [fuel, ffmc, bui, wind_speed, wind_azimuth, percent_conifer, slope, azimuth,
+            percent_grass_curing, percent_dead_fir, crown_base_height, fmc]
+    outputs = xr.apply_ufunc(
+        _fbp_block, *args,
+        kwargs={"variables": variables, "model_options": model_options},
+        output_core_dims=[[] for _ in variables],
+        dask="parallelized",
+        output_dtypes=[np.dtype(FBP_DTYPES.get(name, float)) for name in variables])
+    if len(variables) == 1:
+        outputs = (outputs,)
+    # dims in the order of the input with the most dims, e.g. (time, y, x) for a (y, x) fuel map
+    dims = []
+    for a in sorted((a for a in args if isinstance(a, xr.DataArray)), key=lambda a: -a.ndim):
+        dims += [d for d in a.dims if d not in dims]
+    return xr.Dataset(dict(zip(variables, outputs))).transpose(*dims)
+
+
+def _lat_lon(da: xr.DataArray, latitude, longitude) -> tuple:
+    if latitude is None:
+        latitude = next((da.coords[n] for n in ("latitude", "lat") if n in da.coords), None)
+    if longitude is None:
+        longitude = next((da.coords[n] for n in ("longitude", "lon") if n in da.coords), None)
+    if latitude is None or longitude is None:
+        raise ValueError("Pass latitude and longitude, or give the inputs latitude/longitude (or lat/lon) coords")
+    return latitude, longitude
+
+
+def _fwi_block(temperature, relative_humidity, wind_speed, precipitation, ffmc, dmc, dc, latitude, longitude,
+               dates=None, variables=None):
+    # the time axis is last (the core dimension)
+    arrays = np.broadcast_arrays(temperature, relative_humidity, wind_speed, precipitation)
+    shape = arrays[0].shape[:-1]
+    ffmc, dmc, dc, latitude, longitude = [np.array(np.broadcast_to(a, shape), dtype=float)
+                                          for a in (ffmc, dmc, dc, latitude, longitude)]
+
+    model = FWIModel.from_lat_lon(latitude, longitude)
+    days = [dict(zip(("temperature", "relative_humidity", "wind_speed", "precipitation"),
+                     (np.array(a[..., t], dtype=float) for a in arrays)))
+            for t in range(len(dates))]
+    out = {name: np.empty(shape + (len(dates),)) for name in variables}
+
+    class Collect:
+        def __init__(self):
+            self.t = 0
+
+        def update(self, results):
+            for name in variables:
+                out[name][..., self.t] = getattr(results, name)
+            self.t += 1
+
+    with np.errstate(all="ignore"):
+        model.run_series([d.astype("datetime64[D]").item() for d in dates], days,
+                         ffmc, dmc, dc, accumulators=[Collect()])
+    return tuple(out[name] for name in variables)
+
+
+def fwi_series(temperature: xr.DataArray,
+               relative_humidity: xr.DataArray | float,
+               wind_speed: xr.DataArray | float,
+               precipitation: xr.DataArray | float,
+               ffmc_start: xr.DataArray | float = 85.,
+               dmc_start: xr.DataArray | float = 6.,
+               dc_start: xr.DataArray | float = 15.,
+               latitude: xr.DataArray | None = None,
+               longitude: xr.DataArray | None = None,
+               time_dim: str = "time",
+               variables: list[str] | None = None) -> xr.Dataset:
+    """`FWIModel.run_series` on daily DataArrays along `time_dim` (datetime
+    coordinate). The latitude/longitude default to the coords of `temperature`;
+    Dask inputs are rechunked to a single chunk along time."""
+    variables = list(variables or [f.name for f in fields(FWIResults)])
+    unknown = set(variables) - {f.name for f in fields(FWIResults)}
+    if unknown:
+        raise ValueError(f"Unknown FWI variables {sorted(unknown)}")
+    if time_dim not in temperature.dims:
+        raise ValueError(f"temperature has no '{time_dim}' dimension")
+
+    latitude, longitude = _lat_lon(temperature, latitude, longitude)
+    weather = [w if isinstance(w, xr.DataArray) else xr.full_like(temperature, w, dtype=float)
+               for w in (temperature, relative_humidity, wind_speed, precipitation)]
+    weather = [w.chunk({time_dim: -1}) if w.chunks is not None else w for w in weather]
+
+    outputs = xr.apply_ufunc(
+        _fwi_block, *weather, ffmc_start, dmc_start, dc_start, latitude, longitude,
+        kwargs={"dates": temperature[time_dim].values, "variables": variables},
+        input_core_dims=[[time_dim]] * 4 + [[]] * 5,
+        output_core_dims=[[time_dim] for _ in variables],
+        dask="parallelized",
+        output_dtypes=[float] * len(variables))
+    if len(variables) == 1:
+        outputs = (outputs,)
+    return xr.Dataset(dict(zip(variables, outputs))).transpose(time_dim, ...)
@@ -0,0 +1,224 @@
+"""Statistics of `FBPResults` per zone (fire management zone, district, ...).
+
+    stats = zonal_statistics(zones, results, variables=("hfi", "ros"), percentiles=(50, 90))
+    stats["hfi"].mean, stats["hfi"].percentiles[90], stats.fire_type["C"]
+
+A `ZonalAccumulator` reduces a tile in one pass (`np.bincount` on zone ids);
+tiles, or accumulators from other processes, are combined with `merge`.
+Percentiles come from per-zone histograms on fixed bins, so they are
+mergeable and approximate: within a bin (~5% relative with the default
+edges) and clipped to the exact zone minimum and maximum.
+"""
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from fbp.histogram import Bins, log_edges
+from fbp.models.fbp import FBPResults
+
+# bin edges shared by all variables: 0, then 48 log-spaced bins per decade from 1e-3 to 1e6
+DEFAULT_EDGES = log_edges(1e-3, 1e6, 48)
+
+FIRE_TYPES = ("S", "I", "C")
+
+
+@dataclass
+class VariableStats:
+    count: np.ndarray       # cells with a finite value
+    mean: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    percentiles: dict[float, np.ndarray] = field(default_factory=dict)
+
+
+@dataclass
+class ZonalStats:
+    zones: np.ndarray       # zone labels, sorted
+    cells: np.ndarray       # cells per zone
+    variables: dict[str, VariableStats]
+    fire_type: dict[str, np.ndarray]        # fraction of the classified cells (S, I or C) per zone
+
+    def __getitem__(self, name: str) -> VariableStats:
+        return self.variables[name]
+
+    def to_records(self) -> list[dict]:
+        """One flat dict per zone, e.g. for `pandas.DataFrame`."""
+        records = []
+        for i, zone in enumerate(self.zones):
+            record = {"zone": zone.item(), "cells": int(self.cells[i])}
+            for name, stats in self.variables.items():
+                record.update({f"{name}_count": int(stats.count[i]), f"{name}_mean": float(stats.mean[i]),
+                               f"{name}_min": float(stats.min[i]), f"{name}_max": float(stats.max[i])})
+                for q, values in stats.percentiles.items():
+                    record[f"{name}_p{q:g}"] = float(values[i])
+            for fd, fraction in self.fire_type.items():
+                record[f"fd_{fd}"] = float(fraction[i])
+            records.append(record)
+        return records
+
+
+class ZonalAccumulator:
+    """Per-zone count, sum, min, max and histogram of FBP variables, and fire
+    type counts, updated tile by tile."""
+
+    def __init__(self,
+                 variables: tuple[str, ...] = ("ros", "hfi", "cfb", "tfc"),
+                 edges: np.ndarray = DEFAULT_EDGES,
+                 nodata=None) -> None:
+        """
+        edges: increasing histogram bin edges for the percentiles; values
+            outside go to the first or last bin
+        nodata: zone label of the cells to ignore
+        """
+        self.variables = tuple(variables)
+        self.bins = Bins(edges)
+        self.edges = self.bins.edges
+        self.nodata = nodata
+        self.zones = np.empty(0, dtype=np.int64)
+        self.cells = np.empty(0, dtype=np.int64)
+        self.count = {v: np.empty(0, dtype=np.int64) for v in self.variables}
+        self.sum = {v: np.empty(0) for v in self.variables}
+        self.min = {v: np.empty(0) for v in self.variables}
+        self.max = {v: np.empty(0) for v in self.variables}
+        self.hist = {v: np.empty((0, len(self.edges) - 1), dtype=np.int64) for v in self.variables}
+        self.fire_type = np.empty((0, len(FIRE_TYPES)), dtype=np.int64)
+
+    # --- accumulation ---
+    def update(self, zones: np.ndarray, results: FBPResults) -> None:
+        """Add a tile: `zones` holds integer zone labels aligned with `results`."""
+        zones = np.asarray(zones).ravel()
+        keep = None if self.nodata is None else zones != self.nodata
+        if keep is not None:
+            zones = zones[keep]
+
+        def values_of(name):
+            values = np.asarray(getattr(results, name)).ravel()
+            return values if keep is None else values[keep]
+
+        labels, ids = _zone_ids(zones)
+        n = len(labels)
+        tile = ZonalAccumulator(self.variables, self.edges, self.nodata)
+        tile._reindex(labels)
+        tile.cells[:] = np.bincount(ids, minlength=n)
+
+        # cells grouped by zone once, for the min/max of every variable
+        order = np.argsort(ids.astype(np.uint16) if n <= 1 << 16 else ids, kind="stable")
+        starts = np.flatnonzero(tile.cells)
+        starts = np.cumsum(np.r_[0, tile.cells])[starts]
+
+        nbins = len(self.edges) - 1
+        for name in self.variables:
+            values = values_of(name).astype(float, copy=False)
+            grouped = values[order]
+            tile.min[name][tile.cells > 0] = np.fmin.reduceat(grouped, starts) if starts.size else []
+            tile.max[name][tile.cells > 0] = np.fmax.reduceat(grouped, starts) if starts.size else []
+
+            finite = np.isfinite(values)
+            v, i = values[finite], ids[finite]
+            tile.count[name][:] = np.bincount(i, minlength=n)
+            tile.sum[name][:] = np.bincount(i, weights=v, minlength=n)
+            tile.hist[name][:] = np.bincount(i * nbins + self.bins.index(v), minlength=n * nbins).reshape(n, nbins)
+
+        kind = _fire_type_index(values_of("fd"))
+        classified = kind >= 0
+        tile.fire_type[:] = np.bincount(ids[classified] * len(FIRE_TYPES) + kind[classified],
+                                        minlength=n * len(FIRE_TYPES)).reshape(n, len(FIRE_TYPES))
+        self.merge(tile)
+
+    def merge(self, other: "ZonalAccumulator") -> "ZonalAccumulator":
+        """Add the statistics of `other` (same variables and edges) in place."""
+        if other.variables != self.variables or other.bins != self.bins:
+            raise ValueError("Only accumulators with the same variables and edges can be merged")
+        zones = np.union1d(self.zones, other.zones)
+        if len(zones) != len(self.zones):
+            self._reindex(zones)
+        idx = np.searchsorted(self.zones, other.zones)
+        self.cells[idx] += other.cells
+        for name in self.variables:
+            self.count[name][idx] += other.count[name]
+            self.sum[name][idx] += other.sum[name]
+            self.min[name][idx] = np.fmin(self.min[name][idx], other.min[name])
+            self.max[name][idx] = np.fmax(self.max[name][idx], other.max[name])
+            self.hist[name][idx] += other.hist[name]
+        self.fire_type[idx] += other.fire_type
+        return self
+
+    def _reindex(self, zones: np.ndarray) -> None:
+        idx = np.searchsorted(zones, self.zones)
+
+        def grow(values, fill):
+            out = np.full((len(zones),) + values.shape[1:], fill, dtype=values.dtype)
+            out[idx] = values
+            return out
+
+        self.cells = grow(self.cells, 0)
+        for name in self.variables:
+            self.count[name] = grow(self.count[name], 0)
+            self.sum[name] = grow(self.sum[name], 0.)
+            self.min[name] = grow(self.min[name], np.nan)
+            self.max[name] = grow(self.max[name], np.nan)
+            self.hist[name] = grow(self.hist[name], 0)
+        self.fire_type = grow(self.fire_type, 0)
+        self.zones = zones
+
+    # --- results ---
+    def percentile(self, name: str, q: float) -> np.ndarray:
+        """Approximate `q`-th percentile of `name` per zone, interpolated within
+        the histogram bin and clipped to the zone min/max."""
+        return self.bins.percentile(self.hist[name], q, self.min[name], self.max[name])
+
+    def result(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> ZonalStats:
+        variables = {}
+        for name in self.variables:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = self.sum[name] / self.count[name]
+            variables[name] = VariableStats(count=self.count[name].copy(), mean=mean,
+                                            min=self.min[name].copy(), max=self.max[name].copy(),
+                                            percentiles={q: self.percentile(name, q) for q in percentiles})
+        classified = self.fire_type.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fire_type = {fd: self.fire_type[:, k] / classified for k, fd in enumerate(FIRE_TYPES)}
+        return ZonalStats(self.zones.copy(), self.cells.copy(), variables, fire_type)
+
+
+def _zone_ids(zones: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted labels and the index of every cell's label: a lookup table for
+    integer labels within a compact range, `np.unique` otherwise."""
+    if zones.size and np.issubdtype(zones.dtype, np.integer):
+        lo, hi = int(zones.min()), int(zones.max())
+        if hi - lo <= max(zones.size, 1 << 16):
+            offset = (zones - lo).astype(np.intp, copy=False)
+            present = np.bincount(offset) > 0
+            lut = np.cumsum(present) - 1
+            return np.flatnonzero(present) + lo, lut[offset]
+    return np.unique(zones, return_inverse=True)
+
+
+def _fire_type_index(fd: np.ndarray) -> np.ndarray:
+    """Index in `FIRE_TYPES` of every fire type code, -1 for others ("Null")."""
+    fd = np.ascontiguousarray(fd, dtype="<U4")
+    chars = fd.view(np.uint32).reshape(fd.size, 4)
+    lut = np.full(128, -1, dtype=np.intp)
+    lut[[ord(t) for t in FIRE_TYPES]] = np.arange(len(FIRE_TYPES))
+    first = chars[:, 0]
+    return np.where((chars[:, 1] == 0) & (first < 128), lut[np.minimum(first, 127)], -1)
+
+
+def zonal_statistics(zones: np.ndarray,
+                     results: FBPResults,
+                     variables: tuple[str, ...] = ("ros", "hfi", "cfb", "tfc"),
+                     percentiles: tuple[float, ...] = (50, 90, 99),
+                     tile_rows: int = 1024,
+                     **options) -> ZonalStats:
+    """Statistics of `results` per zone of the label raster `zones`, reduced
+    in blocks of `tile_rows` rows; `options` go to `ZonalAccumulator`."""
+    zones = np.asarray(zones)
+    if zones.shape != np.shape(results.ros):
+        raise ValueError(f"Zones have shape {zones.shape}, expected {np.shape(results.ros)}")
+
+    acc = ZonalAccumulator(variables, **options)
+    for row in range(0, zones.shape[0], tile_rows):
+        block = slice(row, row + tile_rows)
+        acc.update(zones[block], FBPResults(**{f.name: np.asarray(getattr(results, f.name))[block]
+                                               for f in fields(FBPResults)}))
+    return acc.result(percentiles)
@@ -7,7 +7,8 @@ setup(
     packages=find_packages(exclude=("data",)),
     install_requires=[
         "numpy",
-        "scikit-image",
         "rasterio",
-    ]
-)
\ No newline at end of file
+    ],
+    extras_require={"xarray": ["xarray", "dask[array]"]},
+    entry_points={"console_scripts": ["fbp = fbp.cli:main"]},
+)
@@ -0,0 +1,262 @@
+"""Whole-table conformance of `fbp.core` against the reference CSVs in
+tests/data: every table is loaded once and its function evaluated on the full
+columns (one call per distinct value of the scalar arguments, e.g. month),
+for each backend:
+
+- default: float64 inputs
+- float32: float32 inputs
+- lut: FFMCTable (fF) and ResponseSurfaces (RSI, BE, SFC) where they apply
+- tiled: the table evaluated in chunks of rows
+
+    python -m tests.conformance [--backend lut] [--table RateOfSpread]
+
+prints one line per table and backend and the first mismatching rows.
+"""
+import os
+import time
+import argparse
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.core.ros import initial_rate_of_spread, buildup_effect, rate_of_spread, c6_rate_of_spread
+from fbp.core.consumption import surface_fuel_consumption
+from fbp.core.weather import (
+    foliar_moisture_content,
+    duff_moisture_code,
+    drought_code,
+    builtup_index,
+    fire_weather_index,
+    initial_spread_index,
+    fine_fuel_moisture_code)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+@dataclass
+class Backend:
+    name: str
+    dtype: type = np.float64
+    rtol: float = 0.
+    chunk: int | None = None
+    ffmc_table: object = None
+    response_surfaces: object = None
+
+    def array(self, values) -> np.ndarray:
+        return np.asarray(values, dtype=self.dtype)
+
+
+BACKENDS = ("default", "float32", "lut", "tiled")
+
+
+def backends(names: list[str] | None = None) -> dict[str, Backend]:
+    names = names or BACKENDS
+    out = {}
+    for name in names:
+        if name == "default":
+            out[name] = Backend(name)
+        elif name == "float32":
+            out[name] = Backend(name, dtype=np.float32, rtol=1e-5)
+        elif name == "lut":
+            from fbp.core.tables import FFMCTable, ResponseSurfaces
+            out[name] = Backend(name, rtol=1e-4, ffmc_table=FFMCTable(),
+                                response_surfaces=ResponseSurfaces.build())
+        elif name == "tiled":
+            out[name] = Backend(name, chunk=257)
+        else:
+            raise ValueError(f"Unknown backend {name}")
+    return out
+
+
+def _fuel_codes(fuel_types: pd.Series) -> np.ndarray:
+    names = fuel_types.str[0].str.upper() + fuel_types.str[1:].str.lower()
+    return names.map(FBP_FUEL_MAP).fillna(0).to_numpy(dtype=np.uint8)
+
+
+def _grouped(df: pd.DataFrame, keys: list[str], func: Callable) -> np.ndarray:
+    """`func(group, *key_values)` once per distinct value of the scalar `keys`."""
+    out = np.full(len(df), np.nan)
+    for values, group in df.groupby(keys, sort=False):
+        out[df.index.get_indexer(group.index)] = func(group, *values)
+    return out
+
+
+# --- table evaluators: (rows, backend) -> computed column ---
+def _isi(df, b):
+    ffmc = b.array(df["ffmc"])
+    fF = b.ffmc_table.fF(ffmc) if b.ffmc_table is not None else None
+    return initial_spread_index(ffmc, b.array(df["ws"]), fF=fF)
+
+
+def _ros(df, b):
+    fuel_map = _fuel_codes(df["FUELTYPE"])
+    isi, bui = b.array(df["ISI"]), b.array(df["BUI"])
+    maps = dict(percent_grass_curing_map=b.array(df["CC"]),
+                percent_conifer_map=b.array(df["PC"]),
+                percent_dead_fir_map=b.array(df["PDF"]))
+
+    rs = b.response_surfaces
+    rsi = (rs.initial_rate_of_spread if rs is not None else initial_rate_of_spread)(fuel_map, isi, **maps)
+    be = (rs.buildup_effect if rs is not None else buildup_effect)(fuel_map, bui)
+    ros = rate_of_spread(rsi, be)
+
+    c6 = fuel_map == FBP_FUEL_MAP["C6"]
+    if np.any(c6):
+        ros[c6], _ = c6_rate_of_spread(isi[c6], bui[c6], b.array(df["FMC"])[c6],
+                                       b.array(df["SFC"])[c6], b.array(df["CBH"])[c6])
+    return ros
+
+
+def _sfc(df, b):
+    def evaluate(group, gfl):
+        func = b.response_surfaces.surface_fuel_consumption if b.response_surfaces is not None \
+            else surface_fuel_consumption
+        return func(_fuel_codes(group["FUELTYPE"]), b.array(group["BUI"]), b.array(group["FFMC"]),
+                    b.array(group["PC"]), grass_fuel_load=gfl)
+    return _grouped(df, ["GFL"], evaluate)
+
+
+def _ffmc(df, b):
+    return fine_fuel_moisture_code(b.array(df["ffmc_yda"]), b.array(df["temp"]), b.array(df["rh"]),
+                                   b.array(df["ws"]), b.array(df["prec"]))
+
+
+def _dmc(df, b):
+    def evaluate(group, month, lat_adjust):
+        lat = b.array(group["lat"]) if lat_adjust else None
+        return duff_moisture_code(b.array(group["dmc_yda"]), b.array(group["temp"]), b.array(group["prec"]),
+                                  b.array(group["rh"]), month, lat)
+    return _grouped(df, ["mon", "lat.adjust"], evaluate)
+
+
+def _dc(df, b):
+    def evaluate(group, month, lat_adjust):
+        lat = b.array(group["lat"]) if lat_adjust else None
+        return drought_code(b.array(group["dc_yda"]), b.array(group["temp"]), b.array(group["prec"]),
+                            month, lat)
+    return _grouped(df, ["mon", "lat.adjust"], evaluate)
+
+
+def _bui(df, b):
+    return builtup_index(b.array(df["dmc"]), b.array(df["dc"]))
+
+
+def _fwi(df, b):
+    return fire_weather_index(b.array(df["isi"]), b.array(df["bui"]))
+
+
+def _fmc(df, b):
+    def evaluate(group, dj, no_elevation, no_d0):
+        return foliar_moisture_content(latitude=b.array(group["LAT"]),
+                                       longitude=-b.array(group["LONG"]),
+                                       day_of_year=dj,
+                                       elevation=None if no_elevation else b.array(group["ELV"]),
+                                       d0=None if no_d0 else b.array(group["D0"]))
+    keyed = df.assign(no_elevation=df["ELV"] == 0, no_d0=df["D0"] == 0)
+    return _grouped(keyed, ["DJ", "no_elevation", "no_d0"], evaluate)
+
+
+@dataclass
+class Table:
+    name: str
+    reference: str
+    evaluate: Callable[[pd.DataFrame, Backend], np.ndarray]
+    atol: float = 1e-2
+    select: Callable[[pd.DataFrame], pd.Series] | None = None
+    backends: tuple[str, ...] = ("default", "float32", "tiled")
+
+
+TABLES = {t.name: t for t in [
+    Table("InitialSpreadIndex", "InitialSpreadIndex", _isi, select=lambda df: df["fbpMod"].astype(bool),
+          backends=("default", "float32", "lut", "tiled")),
+    Table("RateOfSpread", "RateOfSpread", _ros, select=lambda df: ~df["FUELTYPE"].str.upper().isin(["NF", "WA"]),
+          backends=("default", "float32", "lut", "tiled")),
+    Table("SurfaceFuelConsumption", "SurfaceFuelConsumption", _sfc,
+          backends=("default", "float32", "lut", "tiled")),
+    Table("FineFuelMoistureCode", "FineFuelMoistureCode", _ffmc),
+    Table("DuffMoistureCode", "DuffMoistureCode", _dmc),
+    Table("DroughtCode", "DroughtCode", _dc),
+    Table("BuildupIndex", "BuildupIndex", _bui),
+    Table("FireWeatherIndex", "FireWeatherIndex", _fwi),
+    Table("FoliarMoistureContent", "FoliarMoistureContent", _fmc, atol=1.),
+]}
+
+
+@dataclass
+class Report:
+    table: str
+    backend: str
+    rows: int
+    seconds: float
+    mismatches: pd.DataFrame = field(repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatches.empty
+
+    def __str__(self) -> str:
+        status = "ok" if self.ok else f"{len(self.mismatches)} mismatches"
+        return f"{self.table:<24} {self.backend:<8} {self.rows:6d} rows {self.seconds:8.4f} s  {status}"
+
+
+_FRAMES = {}
+
+
+def load(name: str) -> pd.DataFrame:
+    if name not in _FRAMES:
+        _FRAMES[name] = pd.read_csv(os.path.join(DATA_DIR, f"{name}.csv"))
+    return _FRAMES[name]
+
+
+def run(table: Table, backend: Backend) -> Report:
+    df = load(table.name)
+    if table.select is not None:
+        df = df[table.select(df)].reset_index(drop=True)
+
+    t0 = time.perf_counter()
+    with np.errstate(all="ignore"):
+        if backend.chunk is None:
+            computed = np.asarray(table.evaluate(df, backend), dtype=float)
+        else:
+            computed = np.concatenate([
+                np.asarray(table.evaluate(df.iloc[i:i + backend.chunk].reset_index(drop=True), backend),
+                           dtype=float)
+                for i in range(0, len(df), backend.chunk)])
+    seconds = time.perf_counter() - t0
+
+    expected = pd.to_numeric(df[table.reference], errors="coerce").to_numpy(dtype=float)
+    close = np.isclose(computed, expected, atol=table.atol, rtol=backend.rtol, equal_nan=True)
+    mismatches = df[~close].assign(computed=computed[~close])
+    return Report(table.name, backend.name, len(df), seconds, mismatches)
+
+
+def run_all(tables: list[str] | None = None, backend_names: list[str] | None = None) -> list[Report]:
+    available = backends(backend_names)
+    reports = []
+    for table in (TABLES[name] for name in tables or TABLES):
+        for name, backend in available.items():
+            if name in table.backends:
+                reports.append(run(table, backend))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--table", action="append", choices=list(TABLES))
+    parser.add_argument("--backend", action="append", choices=["default", "float32", "lut", "tiled"])
+    parser.add_argument("--show", type=int, default=5, help="mismatching rows to print per report")
+    args = parser.parse_args()
+
+    reports = run_all(args.table, args.backend)
+    for report in reports:
+        print(report)
+        if not report.ok and args.show:
+            print(report.mismatches.head(args.show).to_string(), "\n")
+    raise SystemExit(0 if all(r.ok for r in reports) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from fbp.constants import FBP_FUEL_MAP
+
+FUELS = [FBP_FUEL_MAP[f] for f in ("C2", "C3", "C6", "D1", "M1", "O1a", "S1", "Non-fuel")]
+
+
+@pytest.fixture(scope="session")
+def random_landscape():
+    """Seeded random FBP inputs of a given shape: uint8 fuel codes and the
+    slope (%), slope azimuth and percent conifer layers."""
+    def make(shape: tuple[int, int], seed: int = 0) -> dict[str, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        return {"fuel": rng.choice(FUELS, size=shape).astype(np.uint8),
+                "slope": rng.uniform(0, 60, shape), "azimuth": rng.uniform(0, 360, shape),
+                "percent_conifer": rng.uniform(0, 100, shape)}
+    return make
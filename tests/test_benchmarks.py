@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from benchmarks.landscapes import Landscape
+from benchmarks.run import measure, compare
+from benchmarks.suite import BENCHMARKS
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark_cases_run(name):
+    with np.errstate(all="ignore"):
+        seconds, peak = measure(BENCHMARKS[name](Landscape(64)), repeat=1)
+    assert seconds >= 0 and peak >= 0
+
+
+def test_every_public_core_function_has_a_case():
+    import importlib
+    import inspect
+
+    for name in ("weather", "ros", "slope", "consumption", "crowning", "utils"):
+        module = importlib.import_module(f"fbp.core.{name}")
+        for func_name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ == module.__name__ and not func_name.startswith("_"):
+                assert f"core.{name}.{func_name}" in BENCHMARKS
+
+
+def test_compare_flags_regressions():
+    baselines = {"a[64]": {"seconds": 1.0, "peak_bytes": 100}}
+    assert compare({"a[64]": {"seconds": 1.2, "peak_bytes": 100}}, baselines, 1.25, 1.1) == []
+    assert len(compare({"a[64]": {"seconds": 1.3, "peak_bytes": 120}}, baselines, 1.25, 1.1)) == 2
+    assert compare({"b[64]": {"seconds": 9., "peak_bytes": 9}}, baselines, 1.25, 1.1) == []
+
+
+@pytest.mark.parametrize("statement", [
+    "from fbp.models import FBPModel, FWIModel",
+    "import fbp.core.tables, fbp.io, fbp.profiling, fbp.utils, fbp.visualize",
+    "import fbp.preprocessing.fbp_map_builder, fbp.preprocessing.terrain",
+])
+def test_import_is_lazy(statement):
+    from benchmarks.bench_import import measure
+
+    assert measure(statement, repeat=1)["heavy"] == []
@@ -0,0 +1,89 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from fbp.cli import JobConfig, run, status, tiles, main
+from fbp.constants import FBP_FUEL_MAP
+from fbp.io import ResultStore
+
+
+def _write(path, data):
+    import rasterio
+    from rasterio.transform import from_origin
+
+    with rasterio.open(path, "w", driver="GTiff", dtype=data.dtype, count=1, height=data.shape[0],
+                       width=data.shape[1], crs="EPSG:3857",
+                       transform=from_origin(-8.5e6, 6.4e6, 100, 100)) as dst:
+        dst.write(data, 1)
+
+
+def _job(tmp_path, output, tile_size):
+    rng = np.random.default_rng(0)
+    shape = (21, 17)
+    fuels = np.array([FBP_FUEL_MAP[f] for f in ("C2", "C3", "D1", "M1", "O1a", "Non-fuel")], dtype=np.uint8)
+    if not os.path.exists(tmp_path / "fuel.tif"):
+        _write(str(tmp_path / "fuel.tif"), rng.choice(fuels, size=shape))
+        _write(str(tmp_path / "slope.tif"), rng.uniform(0, 40, size=shape).astype(np.float32))
+        for day in ("2024-07-01", "2024-07-02", "2024-07-03"):
+            _write(str(tmp_path / f"temp_{day}.tif"), rng.uniform(15, 30, size=shape).astype(np.float32))
+
+    config = {
+        "fuel": "fuel.tif",
+        "slope": "slope.tif",
+        "azimuth": 90,
+        "percent_conifer": 60,
+        "weather": {"temperature": "temp_{date}.tif", "relative_humidity": 35, "wind_speed": 15,
+                    "wind_azimuth": 270, "precipitation": 0},
+        "time": {"start": "2024-07-01", "end": "2024-07-03"},
+        "output": output,
+        "variables": {"fbp": ["ros", "hfi", "fd"], "fwi": ["ffmc_today", "fwi_today"]},
+        "tile_size": tile_size,
+    }
+    path = tmp_path / f"{output}.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_tiles_cover_the_raster():
+    covered = np.zeros((21, 17), dtype=int)
+    for row, col, h, w in tiles((21, 17), 8):
+        covered[row:row + h, col:col + w] += 1
+    assert np.all(covered == 1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tiled_run_matches_single_tile_and_resumes(tmp_path, workers):
+    whole = JobConfig.load(_job(tmp_path, "whole", 64))
+    tiled = JobConfig.load(_job(tmp_path, "tiled", 8))
+    assert run(whole, log=lambda msg: None) == 1
+    assert run(tiled, workers, log=lambda msg: None) == 9
+    assert status(tiled) == (9, 9)
+
+    for kind, name in [("fbp", "ros"), ("fbp", "fd"), ("fwi", "fwi_today")]:
+        expected, actual = ResultStore(os.path.join(whole.output, kind)), ResultStore(os.path.join(tiled.output, kind))
+        assert actual.ntime == 3
+        for t in range(3):
+            a, b = expected.read(name, t), actual.read(name, t)
+            assert np.array_equal(a, b) if name == "fd" else np.allclose(a, b, equal_nan=True)
+
+    assert run(tiled, log=lambda msg: None) == 0
+    os.remove(os.path.join(tiled.output, "_tiles", "8_8"))
+    assert run(tiled, log=lambda msg: None) == 1
+    assert np.allclose(ResultStore(os.path.join(tiled.output, "fbp")).read("ros", 2),
+                       ResultStore(os.path.join(whole.output, "fbp")).read("ros", 2), equal_nan=True)
+
+
+def test_job_config_errors(tmp_path, capsys):
+    with pytest.raises(ValueError, match="weather"):
+        JobConfig({"fuel": "f.tif", "time": {"start": "2024-07-01"}, "output": "out"})
+    with pytest.raises(ValueError, match="before it starts"):
+        JobConfig({"fuel": "f.tif", "output": "out", "time": {"start": "2024-07-02", "end": "2024-07-01"},
+                   "weather": dict.fromkeys(["temperature", "relative_humidity", "wind_speed",
+                                             "wind_azimuth", "precipitation"], 0)})
+
+    path = _job(tmp_path, "out", 16)
+    assert main(["run", path]) == 0
+    assert main(["status", path]) == 0
+    assert capsys.readouterr().out.strip().endswith("4/4 tiles complete")
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from fbp.climatology import ClimatologyAccumulator
+from fbp.core.weather import daily_severity_rating
+from fbp.models import FWIModel
+
+SHAPE = (6, 5)
+
+
+def _series(days, seed):
+    rng = np.random.default_rng(seed)
+    weather = [dict(wind_speed=rng.uniform(0, 40, SHAPE), temperature=rng.uniform(5, 35, SHAPE),
+                    precipitation=rng.choice([0., 0., 0., 2., 12.], SHAPE), relative_humidity=rng.uniform(15, 90, SHAPE))
+               for _ in range(days)]
+    dates = [f"2024-{6 + d // 30:02d}-{1 + d % 30:02d}" for d in range(days)]
+    return dates, weather
+
+
+def _cube(dates, weather):
+    model, cube = FWIModel(50, 52, -115, -117, SHAPE), []
+
+    class Collect:
+        def update(self, results):
+            cube.append(results)
+    model.run_series(dates, weather, accumulators=[Collect()])
+    return cube
+
+
+def test_climatology_matches_the_materialized_series():
+    dates, weather = _series(60, 0)
+    acc = ClimatologyAccumulator(SHAPE)
+    FWIModel(50, 52, -115, -117, SHAPE).run_series(dates, weather, accumulators=[acc])
+    cube = _cube(dates, weather)
+    fwi = np.stack([r.fwi_today for r in cube])
+    isi = np.stack([r.isi_today for r in cube])
+
+    climatology = acc.result(percentiles=(50, 90))
+    assert climatology.days == 60
+    assert np.allclose(climatology.mean["fwi_today"], fwi.mean(axis=0))
+    assert np.array_equal(climatology.max["isi_today"], isi.max(axis=0))
+    assert np.array_equal(climatology.days_above["fwi_today"][19.], (fwi > 19).sum(axis=0))
+    assert np.array_equal(climatology.days_above["isi_today"][10.], (isi > 10).sum(axis=0))
+    assert np.allclose(climatology.dsr_sum, daily_severity_rating(fwi).sum(axis=0))
+    assert np.allclose(climatology.ssr, daily_severity_rating(fwi).mean(axis=0))
+
+    # one sketch bin is ~15% wide: the interpolated percentile is within a bin of the exact one
+    for q in (50, 90):
+        exact = np.percentile(fwi, q, axis=0)
+        approx = climatology.percentiles["fwi_today"][q]
+        assert np.all(np.abs(approx - exact) <= 0.16 * exact + 0.1)
+
+
+def test_climatology_checkpoints_and_merges(tmp_path):
+    model = FWIModel(50, 52, -115, -117, SHAPE)
+    chunks = []
+    for seed in (1, 2):
+        dates, weather = _series(30, seed)
+        acc = ClimatologyAccumulator(SHAPE, sketch=("fwi_today", "isi_today"))
+        model.run_series(dates, weather, accumulators=[acc])
+        path = str(tmp_path / f"chunk{seed}.npz")
+        acc.save(path)
+        chunks.append((acc, path))
+
+    merged = ClimatologyAccumulator.load(chunks[0][1]).merge(ClimatologyAccumulator.load(chunks[1][1]))
+    both = ClimatologyAccumulator(SHAPE, sketch=("fwi_today", "isi_today"))
+    both.merge(chunks[0][0]).merge(chunks[1][0])
+
+    assert merged.days == 60
+    a, b = merged.result(), both.result()
+    assert np.allclose(a.mean["bui_today"], b.mean["bui_today"])
+    assert np.array_equal(a.min["ffmc_today"], b.min["ffmc_today"])
+    assert np.allclose(a.percentiles["isi_today"][97], b.percentiles["isi_today"][97])
+    assert np.allclose(a.mean["fwi_today"], (chunks[0][0].arrays["sum__fwi_today"] +
+                                             chunks[1][0].arrays["sum__fwi_today"]) / 60)
+
+    with pytest.raises(ValueError, match="same shape"):
+        merged.merge(ClimatologyAccumulator(SHAPE))
+    with pytest.raises(ValueError, match="not one of"):
+        ClimatologyAccumulator(SHAPE, variables=("isi_today",))
+
+
+def test_climatology_counters_do_not_overflow():
+    acc = ClimatologyAccumulator(SHAPE, count_dtype=np.uint8)
+    cube = _cube(*_series(1, 3))
+    for _ in range(255):
+        acc.update(cube[0])
+    with pytest.raises(ValueError, match="overflow"):
+        acc.update(cube[0])
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from conformance import BACKENDS, TABLES, Table, backends, run
+
+
+@pytest.fixture(scope="session")
+def backend_named():
+    """Backends built on first use: the LUT backend builds the response surfaces."""
+    built = {}
+
+    def get(name):
+        if name not in built:
+            built.update(backends([name]))
+        return built[name]
+    return get
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("table", list(TABLES))
+def test_reference_table(table, backend, backend_named):
+    if backend not in TABLES[table].backends:
+        pytest.skip(f"{backend} does not apply to {table}")
+    report = run(TABLES[table], backend_named(backend))
+    assert report.rows > 0
+    assert report.ok, f"{report}\n{report.mismatches.head(10).to_string()}"
+
+
+def test_mismatches_are_reported(backend_named):
+    def off_by_one(df, backend):
+        out = TABLES["BuildupIndex"].evaluate(df, backend)
+        out[::100] += 1
+        return out
+
+    report = run(Table("BuildupIndex", "BuildupIndex", off_by_one), backend_named("default"))
+    assert len(report.mismatches) == int(np.ceil(report.rows / 100))
+    assert set(report.mismatches.columns) >= {"dmc", "dc", "BuildupIndex", "computed"}
@@ -3,10 +3,10 @@ import pandas as pd
 import numpy as np
 
 from fbp.constants import FBP_FUEL_MAP
-from fbp.core.ros import rate_of_spread, initial_rate_of_spread, buildup_effect
+from fbp.core.ros import rate_of_spread, initial_rate_of_spread, buildup_effect, c6_rate_of_spread
 from fbp.core.slope import slope_adjusted_wind_vector
 from fbp.core.consumption import surface_fuel_consumption, crown_fuel_consumption, total_fuel_consumption
-from fbp.core.weather import foliar_moisture_content, duff_moisture_code, drought_code, builtup_index, fire_weather_index, initial_spread_index, fine_fuel_moisture_code
+from fbp.core.weather import foliar_moisture_content, duff_moisture_code, drought_code, builtup_index, fire_weather_index, initial_spread_index, fine_fuel_moisture_code, daily_severity_rating
 
 ref_slope_data = pd.read_csv("tests/data/Slope.csv").to_dict(orient="records")
 ref_rate_of_spread = pd.read_csv("tests/data/RateOfSpread.csv").to_dict(orient="records")
@@ -56,16 +56,23 @@ def test_rate_of_spread(row):
     pdf = np.array(row["PDF"], dtype=float)
     cc = np.array(row["CC"], dtype=float)
 
-    if fuel.upper() in ["NF", "WA", "C6"]:
+    if fuel.upper() in ["NF", "WA"]:
         pytest.skip(f"Skipping test case for {fuel}.")
 
-    rsi = initial_rate_of_spread(fuel_map=fuel_map,
-                                 isi=isi,
-                                 percent_conifer_map=pc,
-                                 percent_dead_fir_map=pdf,
-                                 percent_grass_curing_map=cc)
-    be = buildup_effect(fuel_map=fuel_map, bui=bui)
-    ros = rate_of_spread(rsi=rsi, be=be)
+    if fuel == "C6":
+        ros, _ = c6_rate_of_spread(isi=isi,
+                                   bui=bui,
+                                   fmc=np.array(row["FMC"], dtype=float),
+                                   sfc=np.array(row["SFC"], dtype=float),
+                                   cbh=np.array(row["CBH"], dtype=float))
+    else:
+        rsi = initial_rate_of_spread(fuel_map=fuel_map,
+                                     isi=isi,
+                                     percent_conifer_map=pc,
+                                     percent_dead_fir_map=pdf,
+                                     percent_grass_curing_map=cc)
+        be = buildup_effect(fuel_map=fuel_map, bui=bui)
+        ros = rate_of_spread(rsi=rsi, be=be)
 
     ref_ros = row["RateOfSpread"]
 
@@ -198,6 +205,12 @@ def test_fire_weather_index(row):
     assert np.isclose(fwi, ref_fwi, atol=1e-2), f"FQI mismatch for row {row}"
 
 
+def test_daily_severity_rating():
+    dsr = daily_severity_rating(np.array([0., 1., 10., 30.]))
+    assert np.allclose(dsr, [0., 0.0272, 0.0272 * 10 ** 1.77, 0.0272 * 30 ** 1.77])
+    assert np.isclose(daily_severity_rating(30.), 11.2, atol=0.05)
+
+
 
 # @pytest.mark.parametrize("row", ref_slope_data)
 # def test_slope(row):
@@ -241,4 +254,58 @@ def test_fire_weather_index(row):
 #         breakpoint()
     
 #     assert np.allclose(wsv, ref_wsv, atol=1e-1, equal_nan=True)
-#     # assert np.isclose(raz, ref_raz, atol=1e-1)
\ No newline at end of file
+#     # assert np.isclose(raz, ref_raz, atol=1e-1)
+
+def test_wse_table_within_error_bound():
+    from fbp.core.tables import WSETable, RegularGridTable
+    from fbp.core.slope import slope_equivalent_wind_speed
+
+    table = WSETable.build(fuels=["C2", "D1", "S1"])
+
+    # max_error is the largest error on the 3x3 lattice of the enabled cells
+    for i, fuel in enumerate(table.fuels):
+        def wse(ffmc, slope_percent, code=FBP_FUEL_MAP[fuel]):
+            return slope_equivalent_wind_speed(np.full(ffmc.shape, code), slope_percent, ffmc)
+
+        grid = RegularGridTable(table.table.start, table.table.step, table.table.values[i])
+        with np.errstate(all="ignore"):
+            error = grid.cell_error(wse)
+        assert np.max(error[table.table.valid[i]]) == table.max_error[fuel] <= 0.1
+
+    rng = np.random.default_rng(0)
+    fuel_map = rng.choice([2, 11, 21, 40], size=20000)
+    ffmc = rng.uniform(0, 101, size=fuel_map.shape)
+    gs = rng.uniform(0, 200, size=fuel_map.shape)
+
+    with np.errstate(all="ignore"):
+        exact = slope_equivalent_wind_speed(fuel_map, gs, ffmc, percent_conifer_map=np.full(fuel_map.shape, 50.))
+    wse = table(fuel_map, ffmc, gs)
+
+    assert np.all(np.isnan(wse[fuel_map == 40]))      # M1 is not tabulated
+    assert np.all(np.isnan(wse[gs > 150]))            # outside the grid
+    tabulated = ~np.isnan(wse)
+    assert tabulated.mean() > 0.5
+    # between the lattice points the error may exceed the sampled estimate slightly
+    assert np.max(np.abs(wse - exact)[tabulated]) <= 1.5 * max(table.max_error.values())
+
+    wsv, _ = slope_adjusted_wind_vector(fuel_map, np.zeros_like(gs), np.zeros_like(gs), gs, np.zeros_like(gs), ffmc,
+                                        percent_conifer_map=np.full(fuel_map.shape, 50.), wse_table=table)
+    assert np.allclose(wsv, np.abs(exact), atol=0.1, equal_nan=True)
+
+
+def test_response_surfaces_error_bound_and_cache(tmp_path):
+    from fbp.core.tables import ResponseSurfaces
+
+    surfaces = ResponseSurfaces.load(cache_dir=str(tmp_path), isi_step=0.05, bui_step=0.5, ffmc_step=0.05)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    errors = surfaces.verify(samples=20000)
+    assert max(errors.values()) <= 1e-4
+    for name, fuels in surfaces.max_relative_error.items():
+        assert max(fuels.values()) <= 1e-4, name
+
+    cached = ResponseSurfaces.load(cache_dir=str(tmp_path), isi_step=0.05, bui_step=0.5, ffmc_step=0.05)
+    assert cached.max_relative_error == surfaces.max_relative_error
+    for name, surface in surfaces.surfaces.items():
+        assert cached.surfaces[name].fuels == surface.fuels
+        assert np.array_equal(cached.surfaces[name].table.values, surface.table.values, equal_nan=True)
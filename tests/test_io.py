@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from fbp.io import ResultStore
+from fbp.models.fwi import FWIResults
+
+
+def _fwi_results(shape, value):
+    fields = ["fmc", "dmc_today", "dc_today", "bui_today", "ffmc_today", "isi_today", "fwi_today"]
+    return FWIResults(**{f: np.full(shape, value + i, dtype=float) for i, f in enumerate(fields)})
+
+
+def test_result_store_append_and_read(tmp_path):
+    shape = (10, 7)
+    store = ResultStore.create(str(tmp_path / "store"), _fwi_results(shape, 0), chunks=(3, 4, 4))
+
+    with store:
+        for t in range(5):
+            values = _fwi_results(shape, 0)
+            values.fwi_today = np.arange(70, dtype=float).reshape(shape) + 100 * t
+            assert store.append(values, label=f"day-{t}") == t
+
+    reopened = ResultStore(str(tmp_path / "store"))
+    assert reopened.ntime == 5
+    assert reopened.labels == [f"day-{t}" for t in range(5)]
+
+    series = reopened.read_pixel("fwi_today", 9, 6)
+    assert np.array_equal(series, 69 + 100 * np.arange(5))
+    assert np.array_equal(reopened.read_pixel("fwi_today", 2, 3, start=2, stop=4), [217, 317])
+
+    results = reopened.read_results(4)
+    assert np.array_equal(results.fwi_today, np.arange(70).reshape(shape) + 400)
+    assert np.all(results.fmc == 0)
+
+
+def test_result_store_tiled_writers(tmp_path):
+    shape = (8, 8)
+    path = str(tmp_path / "store")
+    ResultStore.create(path, _fwi_results(shape, 0), chunks=(2, 4, 4), variables=["fwi_today"])
+
+    # two independent writers, each owning one half of the raster
+    for col_off in (0, 4):
+        with ResultStore(path) as writer:
+            writer.write(0, _fwi_results((8, 4), col_off), window=(0, col_off))
+
+    store = ResultStore(path)
+    assert store.read("fwi_today", 0)[0, 0] == 6
+    assert store.read("fwi_today", 0)[0, 7] == 10
+    assert np.isnan(store.read_pixel("fwi_today", 0, 0, stop=2)[1])
+    assert store.read_results(0).fmc is None
+
+    with pytest.raises(ValueError):
+        store.write(1, _fwi_results((8, 3), 0), window=(0, 2))
@@ -4,7 +4,8 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 
-from fbp.models import FWIModel
+from fbp.models import FBPModel, FWIModel
+from fbp.core.weather import initial_spread_index
 
 
 def test_fwi_van_wagner_calibration():
@@ -78,3 +79,235 @@ def test_fwi_van_wagner_calibration():
         ffmc_yesterday = results.ffmc_today
     
 
+
+
+def test_fbp_model_uses_compact_fuel_codes():
+    fuel_map = np.array([[2, 11], [31, 0]], dtype=np.int64)
+    fbp_model = FBPModel(fuel_map=fuel_map)
+    assert fbp_model.fuel_map.dtype == np.uint8
+    assert np.array_equal(fbp_model.fuel_map, fuel_map)
+
+    with pytest.raises(ValueError):
+        FBPModel(fuel_map=np.array([[300]]))
+
+
+def _landscape(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    fuel_map = rng.choice([0, 1, 2, 3, 7, 11, 21, 31, 40], size=(n, n))
+    model_kwargs = dict(percent_conifer=np.full((n, n), 60.),
+                        slope_percent=rng.uniform(0, 60, (n, n)),
+                        slope_azimuth=rng.uniform(0, 360, (n, n)))
+    run_kwargs = dict(fine_fuel_moisture_content=np.round(rng.uniform(70, 96, (n, n)), 1),
+                      builtup_index=rng.uniform(10, 120, (n, n)),
+                      percent_grass_curing=80.,
+                      wind_speed=rng.uniform(0, 40, (n, n)),
+                      wind_azimuth=45.,
+                      folier_moisture_content=100.)
+    return fuel_map, model_kwargs, run_kwargs
+
+
+def test_fbp_model_ffmc_table_matches_exact():
+    from fbp.core.tables import FFMCTable
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    exact = FBPModel(fuel_map, **model_kwargs).run(**run_kwargs)
+    lookup = FBPModel(fuel_map, ffmc_table=FFMCTable(step=0.1), **model_kwargs).run(**run_kwargs)
+
+    for field in ("ros", "wsv", "sfc", "hfi"):
+        assert np.allclose(getattr(lookup, field), getattr(exact, field), rtol=1e-9, equal_nan=True)
+
+
+def test_fbp_model_response_surfaces_match_exact(tmp_path):
+    from fbp.core.tables import ResponseSurfaces
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    surfaces = ResponseSurfaces.load(cache_dir=str(tmp_path))
+    exact = FBPModel(fuel_map, **model_kwargs).run(**run_kwargs)
+    lookup = FBPModel(fuel_map, response_surfaces=surfaces, **model_kwargs).run(**run_kwargs)
+
+    for field in ("ros", "sfc", "hfi"):
+        assert np.allclose(getattr(lookup, field), getattr(exact, field), rtol=1e-3, atol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("surfaces", [False, True])
+def test_fbp_model_runs_m3_m4_with_percent_dead_fir(tmp_path, surfaces):
+    from fbp.constants import FBP_FUEL_MAP
+    from fbp.core.consumption import surface_fuel_consumption, total_fuel_consumption
+    from fbp.core.crowning import crown_fraction_burned
+    from fbp.core.ros import initial_rate_of_spread, buildup_effect, rate_of_spread
+    from fbp.core.tables import ResponseSurfaces
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    fuel_map[::2] = FBP_FUEL_MAP["M3"]
+    fuel_map[1::4] = FBP_FUEL_MAP["M4"]
+    pdf = np.random.default_rng(1).uniform(0, 100, fuel_map.shape)
+    options = {"response_surfaces": ResponseSurfaces.load(cache_dir=str(tmp_path))} if surfaces else {}
+    results = FBPModel(fuel_map, **model_kwargs, **options).run(**run_kwargs, percent_dead_fir=pdf)
+
+    ffmc, bui = run_kwargs["fine_fuel_moisture_content"], run_kwargs["builtup_index"]
+    pc = model_kwargs["percent_conifer"]
+    isi = initial_spread_index(ffmc, results.wsv)
+    rsi = initial_rate_of_spread(fuel_map, isi, np.full(fuel_map.shape, 80.), pc, pdf)
+    ros = rate_of_spread(rsi, buildup_effect(fuel_map, bui))
+    sfc = surface_fuel_consumption(fuel_map, bui, ffmc, pc)
+    cfb = crown_fraction_burned(ros, np.full(fuel_map.shape, 100.), sfc, 2.)
+    tfc = total_fuel_consumption(fuel_map, sfc, cfb, percent_conifer_map=pc, percent_dead_fir_map=pdf)
+
+    m = np.isin(fuel_map, [FBP_FUEL_MAP["M3"], FBP_FUEL_MAP["M4"]])
+    tolerance = dict(rtol=1e-3, atol=1e-6) if surfaces else {}
+    assert np.allclose(results.ros[m], ros[m], **tolerance)
+    assert np.allclose(results.tfc[m], tfc[m], **tolerance)
+
+
+@pytest.mark.parametrize("surfaces", [False, True])
+@pytest.mark.parametrize("sparse", [False, True])
+def test_fbp_model_workspace_reuses_distinct_buffers(tmp_path, surfaces, sparse):
+    from dataclasses import fields
+    from fbp.core.tables import FFMCTable, ResponseSurfaces
+    from fbp.models.fbp import FBPWorkspace
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    options = dict(response_surfaces=ResponseSurfaces.load(cache_dir=str(tmp_path)),
+                   ffmc_table=FFMCTable()) if surfaces else {}
+    model = FBPModel(fuel_map, sparse=sparse, **model_kwargs, **options)
+    exact = model.run(**run_kwargs)
+
+    workspace = FBPWorkspace(exact.ros.shape)
+    first = model.run(**run_kwargs, workspace=workspace)
+    buffers = {f.name: getattr(first, f.name) for f in fields(first)}
+    nbytes = workspace.nbytes
+    second = model.run(**run_kwargs, workspace=workspace)
+    assert workspace.nbytes == nbytes
+
+    names = [f.name for f in fields(exact)]
+    for name in names:
+        assert getattr(second, name) is buffers[name]
+        assert np.array_equal(getattr(second, name), getattr(exact, name), equal_nan=name != "fd")
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            assert not np.shares_memory(getattr(second, a), getattr(second, b)), (a, b)
+    assert not np.shares_memory(exact.sfc, exact.tfc)
+
+    with pytest.raises(ValueError):
+        model.run(**run_kwargs, workspace=FBPWorkspace((3, 3)))
+
+
+def test_fbp_model_sparse_matches_dense():
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    fuel_map[:20] = 0
+    dense = FBPModel(fuel_map, **model_kwargs).run(**run_kwargs)
+
+    model = FBPModel(fuel_map, sparse=True, **model_kwargs)
+    burnable = fuel_map != 0
+    assert model.cells.size == burnable.sum()
+    assert np.array_equal(model.fuel_map, fuel_map)
+
+    packed = model.run(**run_kwargs)
+    assert packed.ros.shape == (model.cells.size,)
+    results = model.unpack(packed)
+
+    for name in ("fuel", "ros", "wsv", "raz", "sfc", "cfb", "tfc", "hfi", "fd"):
+        raster = getattr(results, name)
+        assert raster.shape == fuel_map.shape
+        assert np.array_equal(raster[burnable], getattr(dense, name)[burnable], equal_nan=name != "fd")
+    assert np.all(np.isnan(results.ros[~burnable]))
+
+    # weather already packed once for a time loop
+    packed_kwargs = {k: model.cells.pack(v) for k, v in run_kwargs.items()}
+    assert np.array_equal(model.run(**packed_kwargs).hfi, packed.hfi, equal_nan=True)
+
+    mask = np.zeros(fuel_map.shape, dtype=bool)
+    mask[30:] = True
+    masked = FBPModel(fuel_map, sparse=True, mask=mask, **model_kwargs)
+    assert masked.cells.size == (burnable & mask).sum()
+    with pytest.raises(ValueError, match="sparse=True"):
+        FBPModel(fuel_map, mask=mask, **model_kwargs)
+
+
+def test_fbp_model_runs_c6_with_other_fuels():
+    from fbp.core.ros import c6_rate_of_spread
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    fuel_map[::3] = 6
+    results = FBPModel(fuel_map, **model_kwargs).run(**run_kwargs)
+
+    c6 = fuel_map == 6
+    assert np.all(np.isfinite(results.ros[c6]))
+    assert np.all((results.cfb[c6] >= 0) & (results.cfb[c6] <= 1))
+
+    isi = initial_spread_index(run_kwargs["fine_fuel_moisture_content"], results.wsv)
+    ros, cfb = c6_rate_of_spread(isi[c6], run_kwargs["builtup_index"][c6], 100., results.sfc[c6], 2.)
+    assert np.allclose(results.ros[c6], ros)
+    assert np.allclose(results.cfb[c6], cfb)
+
+
+def test_model_profiler_reports_stages(tmp_path):
+    import json
+    from fbp.profiling import Profiler, JSONLinesReporter
+
+    fuel_map, model_kwargs, run_kwargs = _landscape()
+    path = tmp_path / "profile.jsonl"
+    with JSONLinesReporter(str(path)) as reporter:
+        profiler = Profiler(reporter, trace_memory=True)
+        FBPModel(fuel_map, **model_kwargs).run(**run_kwargs, profiler=profiler)
+
+    stages = [r.stage for r in profiler.records]
+    assert stages[-1] == "run"
+    for name in ("slope_adjusted_wind_vector", "initial_rate_of_spread", "surface_fuel_consumption",
+                 "classify_fire_type"):
+        assert name in stages
+    run = profiler.records[-1]
+    assert run.cells["C2"] == np.sum(fuel_map == 2)
+    assert run.seconds >= sum(r.seconds for r in profiler.records[:-1]) * 0.9
+    assert all(r.allocated_bytes is not None for r in profiler.records)
+    assert run.allocated_bytes >= max(r.allocated_bytes for r in profiler.records[:-1])
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["stage"] for line in lines] == stages
+
+    fwi_profiler = Profiler()
+    FWIModel(45, 46, -75, -76, (4, 4)).run("2024-07-01", 10., 20., 0., 40., 100., 20., 85., profiler=fwi_profiler)
+    assert fwi_profiler.records[-1].cells == {"all": 16}
+    assert fwi_profiler.records[-1].allocated_bytes is None
+    assert "FWIModel.fire_weather_index" in fwi_profiler.summary()
+
+
+def test_fwi_model_from_lat_lon_matches_the_regular_grid():
+    model = FWIModel(45, 47, -75, -77, (3, 4))
+    from_lat_lon = FWIModel.from_lat_lon(model.lat_arr, model.lon_arr)
+    assert from_lat_lon.shape == (3, 4)
+    expected = model.run("2024-07-01", 10., 20., 0., 40., 100., 20., 85.)
+    results = from_lat_lon.run("2024-07-01", 10., 20., 0., 40., 100., 20., 85.)
+    assert np.array_equal(results.fmc, expected.fmc) and np.array_equal(results.fwi_today, expected.fwi_today)
+
+
+def test_fwi_model_run_series_matches_daily_runs():
+    rng = np.random.default_rng(5)
+    dates = ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-04"]
+    weather = [dict(wind_speed=rng.uniform(0, 30, (3, 4)), temperature=rng.uniform(10, 30, (3, 4)),
+                    precipitation=rng.choice([0., 0., 5.], (3, 4)), relative_humidity=rng.uniform(20, 80, (3, 4)))
+               for _ in dates]
+    model = FWIModel(45, 47, -75, -77, (3, 4))
+
+    class Days:
+        def __init__(self):
+            self.fwi = []
+
+        def update(self, results):
+            self.fwi.append(results.fwi_today)
+
+    days = Days()
+    last = model.run_series(dates, weather, 85., 6., 15., accumulators=[days])
+
+    ffmc, dmc, dc = 85., 6., 15.
+    for date, day, fwi in zip(dates, weather, days.fwi):
+        expected = model.run(date, drought_code_yesterday=dc, duff_moisture_code_yesterday=dmc,
+                             fine_fuel_moisture_code_yesterday=ffmc, **day)
+        ffmc, dmc, dc = expected.ffmc_today, expected.dmc_today, expected.dc_today
+        assert np.allclose(fwi, expected.fwi_today)
+    assert np.allclose(last.dc_today, dc)
+
+    by_date = model.run_series(dates, lambda date: weather[date.day - 1])
+    assert np.allclose(by_date.fwi_today, last.fwi_today)
+    with pytest.raises(ValueError, match="No weather"):
+        model.run_series(dates, weather[:2])
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from fbp.io import ResultStore
+from fbp.models.fbp import FBPModel
+from fbp.pipeline import run_fbp_series, run_pipeline
+
+
+def test_run_fbp_series_matches_sequential_runs(tmp_path, random_landscape):
+    rng = np.random.default_rng(5)
+    shape = (32, 24)
+    layers = random_landscape(shape, seed=5)
+    model = FBPModel(layers["fuel"], percent_conifer=layers["percent_conifer"])
+    hours = [{"fine_fuel_moisture_content": rng.uniform(80, 95, shape), "builtup_index": np.full(shape, 60.),
+              "percent_grass_curing": 80., "wind_speed": rng.uniform(0, 40, shape),
+              "folier_moisture_content": 100.} for _ in range(6)]
+
+    with np.errstate(all="ignore"):
+        expected = [model.run(**weather) for weather in hours]
+        with ResultStore.create(str(tmp_path / "fbp"), expected[0], chunks=(4, 16, 16),
+                                variables=["ros", "hfi", "fd"]) as store:
+            stats = run_fbp_series(model, range(6), lambda t: hours[t],
+                                   lambda t, results: store.write(t, results, label=f"h{t}"))
+
+    assert stats.steps == 6
+    store = ResultStore(str(tmp_path / "fbp"))
+    assert store.labels == [f"h{t}" for t in range(6)]
+    for t in range(6):
+        assert np.allclose(store.read("hfi", t), expected[t].hfi, equal_nan=True)
+        assert np.array_equal(store.read("fd", t), expected[t].fd)
+
+
+def test_pipeline_overlaps_stages_with_bounded_queues():
+    delay = 0.02
+    read_ahead, lock = [], threading.Lock()
+    computing = [-1]
+
+    def read(t):
+        time.sleep(delay)
+        with lock:
+            read_ahead.append(t - computing[0])
+        return t
+
+    def compute(t, data):
+        computing[0] = t
+        time.sleep(delay)
+        return data * 10
+
+    written = []
+
+    def write(t, result):
+        time.sleep(delay)
+        written.append((t, result))
+
+    stats = run_pipeline(range(12), read, compute, write, prefetch=1, write_behind=1)
+    assert written == [(t, t * 10) for t in range(12)]
+    # read, compute and write each take 12 * delay: serially 36 * delay
+    assert stats.wall_seconds < 24 * delay
+    assert stats.compute_seconds == pytest.approx(12 * delay, rel=0.5)
+    # one input queued, one held by the reader: never more than 3 steps ahead of the compute
+    assert max(read_ahead) <= 3
+
+
+@pytest.mark.parametrize("stage", ["read", "compute", "write"])
+def test_pipeline_raises_stage_errors(stage):
+    def fail_at(name, t):
+        if name == stage and t == 3:
+            raise RuntimeError(f"{name} failed")
+
+    written = []
+
+    def read(t):
+        fail_at("read", t)
+        return t
+
+    def compute(t, data):
+        fail_at("compute", t)
+        return data
+
+    def write(t, result):
+        fail_at("write", t)
+        written.append(t)
+
+    with pytest.raises(RuntimeError, match=f"{stage} failed"):
+        run_pipeline(range(100), read, compute, write)
+    assert written[:3] == [0, 1, 2] and len(written) < 100
+
+    with pytest.raises(ValueError, match="at least 1"):
+        run_pipeline(range(3), read, compute, write, prefetch=0)
@@ -0,0 +1,203 @@
+import numpy as np
+import pytest
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.preprocessing.fbp_map_builder import FuelMapBuilder, CONIFER_FUEL_CODES
+
+
+def _reference_majority(layer, kernel, codes):
+    h, w = layer.shape
+    out = np.zeros((-(-h // kernel), -(-w // kernel)), dtype=layer.dtype)
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            block = layer[i * kernel:(i + 1) * kernel, j * kernel:(j + 1) * kernel]
+            block = block[np.isin(block, codes)]
+            if block.size:
+                values, counts = np.unique(block, return_counts=True)
+                out[i, j] = values[np.argmax(counts)]
+    return out
+
+
+@pytest.mark.parametrize("shape", [(40, 30), (43, 37)])
+def test_reduce_majority_matches_reference(shape):
+    rng = np.random.default_rng(0)
+    codes = [0] + CONIFER_FUEL_CODES + [FBP_FUEL_MAP["D1"]]
+    layer = rng.choice(codes, size=shape)
+    builder = FuelMapBuilder(layer, kernel=5)
+
+    majority = builder._reduce_majority(layer, CONIFER_FUEL_CODES)
+
+    assert np.array_equal(majority, _reference_majority(layer, 5, CONIFER_FUEL_CODES))
+
+
+def test_block_histogram_layers_match_block_reduce():
+    block_reduce = pytest.importorskip("skimage.measure").block_reduce
+
+    rng = np.random.default_rng(1)
+    vegetation = rng.integers(0, 6, size=(53, 47))
+    mapping = {1: "C2", 2: "D1", 3: "C3", 4: "O1a", 5: "C2"}
+    builder = (FuelMapBuilder(vegetation, kernel=10)
+               .map_vegetation_to_fuel(mapping)
+               .compute_crown_closure()
+               .compute_deciduous()
+               .compute_conifer()
+               .compute_mixedwood()
+               .compute_open_stands())
+
+    fuel = builder.fuel_map
+    crown = np.isin(fuel, [1, 2, 3, 11])
+    conifer = np.isin(fuel, [1, 2, 3])
+    ref_fuel_layer = block_reduce(vegetation != 0, 10, np.mean) >= 0.6
+    ref_forest = block_reduce(crown, 10, np.mean) >= 0.10
+    ref_conifer_ratio = block_reduce(conifer, 10, np.sum) / (block_reduce(crown, 10, np.sum) + 1e-8)
+
+    assert np.array_equal(builder.fuel_layer, ref_fuel_layer)
+    assert np.array_equal(builder.forest_layer, ref_forest)
+    assert np.allclose(builder.conifer_ratio_layer, ref_conifer_ratio)
+
+    fbp_fuel = builder.get_fbp_fuel_layer()
+    ref_conifer_majority = _reference_majority(fuel, 10, [1, 2, 3])
+    assert np.array_equal(fbp_fuel[builder.conifer_layer], ref_conifer_majority[builder.conifer_layer])
+    assert np.all(fbp_fuel[builder.mixedwood_layer] == FBP_FUEL_MAP["M1"])
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.int64, np.float32])
+def test_map_vegetation_to_fuel_lookup(dtype):
+    vegetation = np.array([[0, 1, 2], [3, 250, 1]], dtype=dtype)
+    builder = FuelMapBuilder(vegetation, kernel=1).map_vegetation_to_fuel({1: "C2", 2: "D1", 250: "O1a"})
+
+    expected = np.array([[0, 2, 11], [0, 31, 2]])
+    assert np.array_equal(builder.fuel_map, expected)
+
+
+def test_weighted_crosswalk():
+    # class 7 is a 60/40 conifer/deciduous mix, class 8 pure spruce
+    vegetation = np.array([[7, 7], [8, 0]])
+    builder = (FuelMapBuilder(vegetation, kernel=2)
+               .map_vegetation_to_fuel({7: {"C2": 0.6, "D1": 0.4}, 8: "C2"})
+               .compute_crown_closure()
+               .compute_deciduous()
+               .compute_conifer())
+
+    assert np.array_equal(builder.fuel_map, [[2, 2], [2, 0]])
+    assert np.allclose(builder.crown_closure_layer, 0.75)
+    assert np.allclose(builder.conifer_ratio_layer, 2.2 / 3)
+    assert np.allclose(builder.deciduous_ratio_layer, 0.8 / 3)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_fuel_layer_tiled_matches_in_memory(tmp_path, workers):
+    import rasterio
+    from rasterio.transform import from_origin
+    from fbp.preprocessing.fbp_map_builder import build_fuel_layer_tiled, FUEL_NODATA
+
+    rng = np.random.default_rng(2)
+    vegetation = rng.integers(0, 6, size=(95, 83)).astype(np.uint8)
+    vegetation[:20, :30] = 0    # background only: nodata blocks
+    mapping = {1: "C2", 2: "D1", 3: "C3", 4: "O1a", 5: "C2"}
+    src_path, dst_path = str(tmp_path / "veg.tif"), str(tmp_path / "fuel.tif")
+    with rasterio.open(src_path, "w", driver="GTiff", dtype="uint8", count=1, height=95, width=83,
+                       crs="EPSG:3857", transform=from_origin(0, 950, 10, 10)) as dst:
+        dst.write(vegetation, 1)
+
+    pc_path = str(tmp_path / "pc.tif")
+    build_fuel_layer_tiled(src_path, dst_path, mapping, kernel=5, window_size=32, workers=workers,
+                           percent_conifer_path=pc_path)
+
+    builder = FuelMapBuilder(vegetation, kernel=5)
+    expected = builder.build(mapping)
+    background = np.zeros(expected.shape, dtype=bool)
+    background[:4, :6] = True
+    assert np.array_equal(builder.background_layer, background)
+    with rasterio.open(dst_path) as src:
+        assert src.transform.a == 50
+        assert src.nodata == FUEL_NODATA
+        assert np.array_equal(src.read(1), np.where(background, FUEL_NODATA, expected))
+    with rasterio.open(pc_path) as src:
+        assert np.isnan(src.nodata)
+        pc = src.read(1)
+        assert np.all(np.isnan(pc[background]))
+        assert np.allclose(pc[~background], builder.compute_percent_conifer().percent_conifer_layer[~background])
+
+
+def test_bounded_map_limits_pending_results():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from fbp.utils import bounded_map
+
+    submitted, consumed, ahead = [], [], []
+    lock = threading.Lock()
+
+    def square(x):
+        with lock:
+            submitted.append(x)
+        return x * x
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for result in bounded_map(executor, square, range(20), max_pending=4):
+            consumed.append(result)
+            with lock:
+                ahead.append(len(submitted) - len(consumed))
+    assert consumed == [x * x for x in range(20)]
+    assert max(ahead) <= 3
+
+
+def test_percent_conifer_and_dead_fir_layers():
+    # block 0: 3 conifer + 1 deciduous, block 1: 2 dead fir (conifer) + 2 open
+    vegetation = np.array([[1, 1, 9, 9],
+                           [1, 2, 4, 4]])
+    mapping = {1: "C2", 2: "D1", 4: "O1a", 9: "C2"}
+    builder = FuelMapBuilder(vegetation, kernel=2)
+    builder.build(mapping)
+
+    builder.compute_percent_conifer().compute_percent_dead_fir(vegetation_codes=[9])
+    assert np.allclose(builder.percent_conifer_layer, [[75, 100]])
+    assert np.allclose(builder.percent_dead_fir_layer, [[0, 100]])
+
+    builder.compute_percent_dead_fir(hook=lambda b: np.full(b.fbp_fuel_layer.shape, 5.))
+    assert np.allclose(builder.percent_dead_fir_layer, 5)
+
+
+def test_slope_aspect_of_planes():
+    from fbp.preprocessing.terrain import slope_aspect, upslope_azimuth
+
+    x = np.arange(6) * 10.
+    y = np.arange(5)[:, None] * 10.   # rows go south
+
+    # rising towards the east by 1 m every 10 m: 10% slope facing west
+    slope_percent, aspect = slope_aspect(np.broadcast_to(0.1 * x, (5, 6)), dx=10, dy=10)
+    assert np.allclose(slope_percent, 10)
+    assert np.allclose(aspect, 270)
+    assert np.allclose(upslope_azimuth(aspect), 90)
+
+    # rising towards the north by 1 m every 5 m: 20% slope facing south
+    slope_percent, aspect = slope_aspect(np.broadcast_to(-0.2 * y, (5, 6)), dx=10, dy=10)
+    assert np.allclose(slope_percent, 20)
+    assert np.allclose(aspect, 180)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_terrain_tiled_matches_in_memory(tmp_path, workers):
+    import rasterio
+    from rasterio.transform import from_origin
+    from fbp.preprocessing.terrain import slope_aspect, terrain_tiled, upslope_azimuth
+
+    dem = np.random.default_rng(3).normal(500, 20, size=(37, 29)).astype(np.float32)
+    dem[10:13, 7:9] = dem[:, 0] = -9999   # a void across a tile edge and a filled border
+    src_path = str(tmp_path / "dem.tif")
+    with rasterio.open(src_path, "w", driver="GTiff", dtype="float32", count=1, height=37, width=29,
+                       crs="EPSG:3857", transform=from_origin(0, 370, 30, 30), nodata=-9999) as dst:
+        dst.write(dem, 1)
+
+    terrain_tiled(src_path, str(tmp_path / "slope.tif"), str(tmp_path / "azimuth.tif"),
+                  tile_size=8, workers=workers)
+
+    slope_percent, aspect = slope_aspect(dem, 30, 30, nodata=-9999)
+    hole = np.zeros(dem.shape, dtype=bool)
+    hole[9:14, 6:10] = hole[:, :2] = True
+    assert np.array_equal(np.isnan(slope_percent), hole) and np.all(slope_percent[~hole] < 300)
+    with rasterio.open(tmp_path / "slope.tif") as src:
+        assert np.isnan(src.nodata)
+        assert np.allclose(src.read(1), slope_percent, equal_nan=True)
+    with rasterio.open(tmp_path / "azimuth.tif") as src:
+        assert np.allclose(src.read(1), upslope_azimuth(aspect), equal_nan=True)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from rasterio.transform import from_origin
+
+from fbp.constants import FBP_FUEL_MAP
+from fbp.landscape import Landscape
+from fbp.models.fbp import FBPModel
+from fbp.preprocessing.layers import Layer
+from fbp.sampling import sample_fbp
+from fbp.utils import to_lat_lon, transform_points
+
+SHAPE = (50, 40)
+TRANSFORM = from_origin(500000., 6000000., 100., 100.)
+CRS = "EPSG:32611"
+
+
+def _layer(data, transform=TRANSFORM, nodata=None, crs=CRS):
+    return Layer(data, {"transform": transform, "crs": crs, "nodata": nodata, "count": 1,
+                        "height": data.shape[0], "width": data.shape[1], "dtype": data.dtype})
+
+
+@pytest.fixture
+def inputs(random_landscape):
+    return {**random_landscape(SHAPE, seed=7), "ffmc": np.random.default_rng(8).uniform(80, 95, SHAPE)}
+
+
+def _expected(inputs):
+    model = FBPModel(inputs["fuel"], percent_conifer=inputs["percent_conifer"],
+                     slope_percent=inputs["slope"], slope_azimuth=inputs["azimuth"])
+    with np.errstate(all="ignore"):
+        return model.run(inputs["ffmc"], np.full(SHAPE, 70.), percent_grass_curing=60., percent_dead_fir=0.,
+                         crown_base_height=2., wind_speed=18., wind_azimuth=250., folier_moisture_content=105.)
+
+
+def test_transform_points_is_batched_and_matches_scalar():
+    x, y = np.array([500050., 503950.]), np.array([5999950., 5995050.])
+    lon, lat = transform_points(x, y, CRS, "EPSG:4326")
+    assert lon.shape == (2,) and to_lat_lon(x[1], y[1], CRS) == (pytest.approx(lon[1]), pytest.approx(lat[1]))
+    assert np.array_equal(transform_points(x, y, CRS, CRS)[0], x)
+
+
+def test_layer_index_and_sample(inputs):
+    layer = _layer(inputs["slope"])
+    rows, cols = layer.index([500050., 503999., 499999.], [5999950., 5995001., 5999950.])
+    assert rows.tolist() == [0, 49, -1] and cols.tolist() == [0, 39, -1]
+
+    lon, lat = transform_points([500050.], [5999950.], CRS, "EPSG:4326")
+    assert layer.index(lon, lat, "EPSG:4326") == ([0], [0])
+    values = layer.sample([500050., 499999.], [5999950., 5999950.])
+    assert values[0] == inputs["slope"][0, 0] and np.isnan(values[1])
+
+    fuel = inputs["fuel"].copy()
+    fuel[0, 0] = 255
+    values = _layer(fuel, nodata=255).sample([500050., 500150.], [5999950., 5999950.], fill_value=0)
+    assert values.tolist() == [0, fuel[0, 1]]
+
+
+def test_sample_fbp_matches_full_grid_run(inputs, tmp_path):
+    expected = _expected(inputs)
+    rng = np.random.default_rng(0)
+    rows, cols = rng.integers(0, SHAPE[0], 500), rng.integers(0, SHAPE[1], 500)
+    x, y = TRANSFORM * (cols + 0.5, rows + 0.5)
+    lon, lat = transform_points(x, y, CRS, "EPSG:4326")
+    weather = {"ffmc": _layer(inputs["ffmc"]), "bui": 70., "wind_speed": np.full(500, 18.),
+               "wind_azimuth": 250., "fmc": 105.}
+
+    results = sample_fbp(lon, lat, _layer(inputs["fuel"]), weather, crs="EPSG:4326",
+                         slope=_layer(inputs["slope"]), azimuth=_layer(inputs["azimuth"]),
+                         percent_conifer=_layer(inputs["percent_conifer"]))
+    for name in ("ros", "hfi", "cfb", "sfc"):
+        assert np.allclose(getattr(results, name), getattr(expected, name)[rows, cols], equal_nan=True)
+    assert np.array_equal(results.fd, expected.fd[rows, cols])
+
+    landscape = Landscape.create(str(tmp_path / "landscape"), inputs["fuel"], TRANSFORM, CRS, slope=inputs["slope"],
+                                 azimuth=inputs["azimuth"], percent_conifer=inputs["percent_conifer"])
+    from_landscape = sample_fbp(lon, lat, landscape, weather, crs="EPSG:4326")
+    assert np.allclose(from_landscape.ros, results.ros, equal_nan=True)
+
+    # weather on a coarser grid
+    coarse = _layer(inputs["ffmc"][::2, ::2].copy(), from_origin(500000., 6000000., 200., 200.))
+    assert np.array_equal(coarse.sample(x, y), inputs["ffmc"][rows // 2 * 2, cols // 2 * 2])
+
+    outside = sample_fbp([0.], [0.], _layer(inputs["fuel"]), {**weather, "ffmc": 90, "wind_speed": 10,
+                                                             "fmc": None, "date": "2024-07-01"})
+    assert outside.fuel[0] == FBP_FUEL_MAP["Non-fuel"] and np.isnan(outside.ros[0])
+
+
+def test_sample_fbp_defaults_to_the_fuel_crs(inputs, tmp_path):
+    # FFMC on a geographic grid: the points, in the fuel CRS, are reprojected to it
+    lon, lat = transform_points([500000., 504000.], [6000000., 5995000.], CRS, "EPSG:4326")
+    ffmc = _layer(np.full((10, 10), 92.), from_origin(lon.min(), lat.max(), np.ptp(lon) / 10, np.ptp(lat) / 10),
+                  crs="EPSG:4326")
+    x, y = TRANSFORM * (np.array([3.5, 20.5]), np.array([5.5, 30.5]))
+    weather = {"ffmc": ffmc, "bui": 70., "wind_speed": 18., "wind_azimuth": 250., "date": "2024-07-01"}
+    layers = {"slope": 10., "azimuth": 0., "percent_conifer": 50.}
+
+    fuel = _layer(np.full(SHAPE, FBP_FUEL_MAP["C2"], dtype=np.uint8))
+    expected = sample_fbp(x, y, fuel, weather, crs=CRS, **layers)
+    assert np.all(expected.ros > 0)
+    assert np.array_equal(sample_fbp(x, y, fuel, weather, **layers).ros, expected.ros)
+
+    landscape = Landscape.create(str(tmp_path / "landscape"), fuel.data, TRANSFORM, CRS, **layers)
+    assert np.array_equal(sample_fbp(x, y, landscape, weather).ros, expected.ros)
+
+
+def test_sample_fbp_errors(inputs):
+    with pytest.raises(ValueError, match="shapes"):
+        sample_fbp([1., 2.], [1.], _layer(inputs["fuel"]), {})
+    with pytest.raises(ValueError, match="Unknown layers"):
+        sample_fbp([1.], [1.], _layer(inputs["fuel"]), {}, slop=3)
@@ -0,0 +1,133 @@
+import json
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from fbp.landscape import Landscape
+from fbp.models.fbp import FBPModel
+from fbp.service import QueryBatcher, make_server
+
+WEATHER = {"ffmc": 91., "bui": 70., "wind_speed": 18., "wind_azimuth": 250., "fmc": 105.}
+
+
+@pytest.fixture
+def landscape(tmp_path, random_landscape):
+    layers = random_landscape((40, 30), seed=4)
+    return Landscape.create(str(tmp_path / "landscape"), layers.pop("fuel"),
+                            transform=(100., 0., 500000., 0., -100., 6000000.), crs="EPSG:32611",
+                            crown_base_height=3., **layers)
+
+
+def _expected(landscape, weather=WEATHER):
+    model = FBPModel(np.array(landscape["fuel"]), percent_conifer=np.array(landscape["percent_conifer"]),
+                     slope_percent=np.array(landscape["slope"]), slope_azimuth=np.array(landscape["azimuth"]))
+    full = lambda v: np.full(landscape.shape, v)
+    with np.errstate(all="ignore"):
+        return model.run(full(weather["ffmc"]), full(weather["bui"]), percent_grass_curing=60., percent_dead_fir=0.,
+                         crown_base_height=3., wind_speed=weather["wind_speed"],
+                         wind_azimuth=weather["wind_azimuth"], folier_moisture_content=weather["fmc"])
+
+
+def test_landscape_index_polygon_and_evaluate(landscape):
+    assert isinstance(landscape["fuel"], np.memmap)
+    assert np.all((landscape["latitude"] > 54) & (landscape["latitude"] < 55))
+
+    rows, cols = landscape.index([500050., 502950., 499999., 501234.], [5999950., 5996050., 5999950., 5990000.])
+    assert rows.tolist() == [0, 39, -1, -1] and cols.tolist() == [0, 29, -1, -1]
+
+    # a rectangle covering the centres of rows 2-4 and columns 3-6
+    rows, cols = landscape.cells_in_polygon([[500300, 5999800], [500700, 5999800],
+                                             [500700, 5999500], [500300, 5999500]])
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(r, c) for r in range(2, 5) for c in range(3, 7)]
+    rows, cols = landscape.cells_in_polygon([[500000, 6000000], [503000, 6000000], [500000, 5996000]])
+    assert np.all(cols * 100 + 50 < 3000 - (rows * 100 + 50) * 0.75) and rows.size > 500
+    strips = landscape.cells_in_polygon([[500000, 6000000], [503000, 6000000], [500000, 5996000]], block_cells=7)
+    assert np.array_equal(np.stack(strips), np.stack([rows, cols]))
+    with pytest.raises(ValueError, match="more than 500 cells"):
+        landscape.cells_in_polygon([[500000, 6000000], [503000, 6000000], [500000, 5996000]], max_cells=500)
+
+    expected = _expected(landscape)
+    rows, cols = np.divmod(np.arange(40 * 30), 30)
+    results = landscape.evaluate(rows, cols, WEATHER)
+    for name in ("ros", "hfi", "cfb", "tfc"):
+        assert np.allclose(getattr(results, name), getattr(expected, name).ravel(), equal_nan=True)
+    assert np.array_equal(results.fd, expected.fd.ravel())
+
+
+def test_landscape_weather_errors(landscape):
+    with pytest.raises(ValueError, match="'bui'"):
+        landscape.cell_weather(np.zeros(3, int), np.zeros(3, int), {"ffmc": 90, "wind_speed": 10, "fmc": 100})
+    with pytest.raises(ValueError, match="shape"):
+        landscape.cell_weather(np.zeros(3, int), np.zeros(3, int), {**WEATHER, "ffmc": [90, 91]})
+    fmc = landscape.cell_weather(np.zeros(2, int), np.zeros(2, int),
+                                 {**{k: v for k, v in WEATHER.items() if k != "fmc"}, "date": "2024-07-01"})["fmc"]
+    assert np.all((fmc > 80) & (fmc < 130))
+
+
+def test_batcher_coalesces_concurrent_queries(landscape):
+    expected = _expected(landscape)
+    batcher = QueryBatcher(landscape, max_wait=0.05)
+    rng = np.random.default_rng(1)
+    queries = [(rng.integers(0, 40, 50), rng.integers(0, 30, 50)) for _ in range(16)]
+    try:
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(lambda q: batcher.evaluate(*q, WEATHER), queries))
+    finally:
+        batcher.close()
+
+    assert batcher.batches < len(queries)
+    for (rows, cols), r in zip(queries, results):
+        assert np.allclose(r.ros, expected.ros[rows, cols], equal_nan=True)
+
+
+def test_http_point_and_polygon_queries(landscape):
+    server = make_server(landscape, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    def post(path, body):
+        request = urllib.request.Request(url + path, data=json.dumps(body).encode(), method="POST")
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        with urllib.request.urlopen(url + "/health") as response:
+            assert json.loads(response.read())["shape"] == [40, 30]
+
+        status, body = post("/point", {"x": [500050., 400000.], "y": [5999950., 0.], "weather": WEATHER,
+                                       "variables": ["ros", "fd"]})
+        expected = _expected(landscape)
+        assert status == 200 and body["row"] == [0, -1] and body["ros"][1] is None
+        assert body["fd"][0] == expected.fd[0, 0]
+        assert np.allclose(np.array(body["ros"][:1], dtype=float), expected.ros[0, 0], equal_nan=True)
+
+        status, body = post("/polygon", {"polygon": [[500300, 5999800], [500700, 5999800], [500700, 5999500]],
+                                         "weather": WEATHER})
+        assert status == 200 and len(body["row"]) == len(body["hfi"]) > 0
+
+        status, body = post("/point", {"x": [500050.], "y": [5999950.], "weather": {"ffmc": 90}})
+        assert status == 400 and "bui" in body["error"]
+        assert post("/point", {"y": [1.]})[0] == 400
+        assert post("/nowhere", {})[0] == 404
+
+        server.batcher.max_cells = 3
+        status, body = post("/polygon", {"polygon": [[500300, 5999800], [500700, 5999800], [500700, 5999500]],
+                                         "weather": WEATHER})
+        assert status == 400 and "more than 3 cells" in body["error"]
+
+        def fail(*args):
+            raise MemoryError("out of memory")
+        server.batcher.evaluate = fail
+        status, body = post("/point", {"x": [500050.], "y": [5999950.], "weather": WEATHER})
+        assert status == 500 and body["error"] == "MemoryError: out of memory"
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
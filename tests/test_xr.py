@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+xr = pytest.importorskip("xarray")
+pytest.importorskip("dask")
+
+import fbp.xr
+from fbp.models import FBPModel, FWIModel
+
+
+@pytest.fixture
+def forecast(random_landscape):
+    rng = np.random.default_rng(2)
+    ny, nx, nt = 12, 10, 5
+    coords = {"time": pd.date_range("2024-07-01", periods=nt), "y": np.arange(ny), "x": np.arange(nx)}
+    fuel = xr.DataArray(random_landscape((ny, nx), seed=2)["fuel"], dims=("y", "x"),
+                        coords={"y": coords["y"], "x": coords["x"]})
+
+    def weather(lo, hi):
+        return xr.DataArray(rng.uniform(lo, hi, (nt, ny, nx)), dims=("time", "y", "x"), coords=coords)
+    ds = xr.Dataset({"ffmc": weather(80, 95), "bui": weather(20, 120), "ws": weather(0, 40),
+                     "temp": weather(10, 32), "rh": weather(15, 85), "prec": weather(0, 1)})
+    ds = ds.assign_coords(lat=("y", np.linspace(52, 50, ny)), lon=("x", np.linspace(-117, -115, nx)))
+    return fuel, ds
+
+
+def _expected_fbp(fuel, ds, t):
+    model = FBPModel(fuel.values, percent_conifer=np.full(fuel.shape, 50.))
+    with np.errstate(all="ignore"):
+        return model.run(ds.ffmc[t].values, ds.bui[t].values, percent_grass_curing=60., percent_dead_fir=0.,
+                         crown_base_height=2., wind_speed=ds.ws[t].values, wind_azimuth=270.,
+                         folier_moisture_content=100.)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_fbp_dataarrays(forecast, chunked):
+    fuel, ds = forecast
+    if chunked:
+        fuel, ds = fuel.chunk({"y": 5}), ds.chunk({"time": 2, "y": 5, "x": 4})
+
+    out = fbp.xr.fbp(fuel, ds.ffmc, ds.bui, wind_speed=ds.ws, wind_azimuth=270., variables=["ros", "hfi", "fd"])
+    assert out.ros.dims == ("time", "y", "x") and out.fd.dtype == np.dtype("<U4")
+    assert (out.ros.chunks is not None) == chunked
+    assert np.array_equal(out.time, ds.time)
+
+    out = out.compute()
+    expected = _expected_fbp(forecast[0], forecast[1], 3)
+    assert np.allclose(out.ros[3], expected.ros, equal_nan=True)
+    assert np.allclose(out.hfi[3], expected.hfi, equal_nan=True)
+    assert np.array_equal(out.fd[3], expected.fd)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_fwi_series_dataarrays(forecast, chunked):
+    _, ds = forecast
+    if chunked:
+        ds = ds.chunk({"time": 2, "y": 5, "x": 4})
+
+    out = fbp.xr.fwi_series(ds.temp, ds.rh, ds.ws, ds.prec, variables=["ffmc_today", "fwi_today"])
+    assert out.fwi_today.dims == ("time", "y", "x")
+    assert (out.fwi_today.chunks is not None) == chunked
+    out = out.compute()
+
+    ds = ds.compute()
+    lat, lon = np.meshgrid(ds.lat.values, ds.lon.values, indexing="ij")
+    model = FWIModel.from_lat_lon(lat, lon)
+    weather = [dict(temperature=ds.temp[t].values, relative_humidity=ds.rh[t].values,
+                    wind_speed=ds.ws[t].values, precipitation=ds.prec[t].values) for t in range(5)]
+    last = model.run_series(pd.date_range("2024-07-01", periods=5).to_pydatetime(), weather)
+    assert np.allclose(out.fwi_today[-1], last.fwi_today)
+    assert np.allclose(out.ffmc_today[-1], last.ffmc_today)
+
+
+def test_xr_errors(forecast):
+    fuel, ds = forecast
+    with pytest.raises(ValueError, match="Unknown FBP"):
+        fbp.xr.fbp(fuel, ds.ffmc, ds.bui, variables=["nope"])
+    with pytest.raises(ValueError, match="latitude"):
+        fbp.xr.fwi_series(ds.temp.drop_vars("lat"), ds.rh, ds.ws, ds.prec)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from fbp.models.fbp import FBPModel
+from fbp.zonal import ZonalAccumulator, zonal_statistics
+
+
+@pytest.fixture(scope="module")
+def landscape(random_landscape):
+    rng = np.random.default_rng(3)
+    shape = (120, 90)
+    layers = random_landscape(shape, seed=3)
+    model = FBPModel(layers["fuel"], percent_conifer=layers["percent_conifer"])
+    with np.errstate(all="ignore"):
+        results = model.run(rng.uniform(85, 95, shape), rng.uniform(20, 120, shape), percent_grass_curing=80.,
+                            percent_dead_fir=0., crown_base_height=2., wind_speed=rng.uniform(0, 40, shape),
+                            folier_moisture_content=100.)
+    zones = rng.choice([3, 7, 11, 40, -1], size=shape)
+    zones[:10, :10] = 99    # a zone of Non-fuel only
+    results.ros[:10, :10] = np.nan
+    results.hfi[:10, :10] = np.nan
+    results.fd[:10, :10] = "Null"
+    return zones, results
+
+
+def test_zonal_statistics_match_masking(landscape):
+    zones, results = landscape
+    stats = zonal_statistics(zones, results, variables=("ros", "hfi"), percentiles=(50, 90), tile_rows=17,
+                             nodata=-1)
+    assert stats.zones.tolist() == [3, 7, 11, 40, 99]
+
+    for i, zone in enumerate(stats.zones):
+        mask = zones == zone
+        assert stats.cells[i] == mask.sum()
+        for name in ("ros", "hfi"):
+            values = getattr(results, name)[mask]
+            values = values[np.isfinite(values)]
+            s = stats[name]
+            assert s.count[i] == values.size
+            if values.size == 0:
+                assert np.isnan(s.mean[i]) and np.isnan(s.percentiles[50][i])
+                continue
+            assert s.mean[i] == pytest.approx(values.mean())
+            assert (s.min[i], s.max[i]) == (values.min(), values.max())
+            for q in (50, 90):
+                assert s.percentiles[q][i] == pytest.approx(np.percentile(values, q), rel=0.05)
+
+        fd = results.fd[mask]
+        classified = np.isin(fd, ["S", "I", "C"]).sum()
+        for kind in ("S", "I", "C"):
+            expected = (fd == kind).sum() / classified if classified else np.nan
+            assert np.allclose(stats.fire_type[kind][i], expected, equal_nan=True)
+
+    records = stats.to_records()
+    assert records[0]["zone"] == 3 and "hfi_p90" in records[0] and "fd_C" in records[0]
+
+
+def test_zonal_accumulators_merge_across_tiles(landscape):
+    zones, results = landscape
+    whole = zonal_statistics(zones, results, variables=("ros",), tile_rows=1000)
+
+    halves = []
+    for rows in (slice(0, 50), slice(50, None)):
+        acc = ZonalAccumulator(("ros",))
+        acc.update(zones[rows], type(results)(**{k: v[rows] for k, v in vars(results).items()}))
+        halves.append(acc)
+    merged = halves[1].merge(halves[0]).result()
+
+    assert np.array_equal(merged.zones, whole.zones)
+    assert np.array_equal(merged["ros"].count, whole["ros"].count)
+    assert np.allclose(merged["ros"].mean, whole["ros"].mean, equal_nan=True)
+    assert np.allclose(merged["ros"].percentiles[90], whole["ros"].percentiles[90], equal_nan=True)
+    assert np.allclose(merged.fire_type["I"], whole.fire_type["I"], equal_nan=True)
+
+    with pytest.raises(ValueError, match="same variables"):
+        ZonalAccumulator(("ros",)).merge(ZonalAccumulator(("hfi",)))
+    with pytest.raises(ValueError, match="Zones have shape"):
+        zonal_statistics(zones[:5], results)